@@ -1,16 +1,31 @@
-from langgraph.prebuilt import create_react_agent
-
+from src.agents.agent_manager.manager import AgentSpec, agent_manager
 from src.agents.prompts.sample_agent_prompt import get_prompt_sample_agent
-from src.providers.ai.langchain_model_loader import LangchainModelLoader
-
-loader = LangchainModelLoader()
+from src.agents.tools.sample_tools import SAMPLE_TOOL_SET
+from src.config.settings import settings
 
-openai_basic_model = loader.init_model_openai_basic()
+SAMPLE_AGENT_NAME = "sample_agent"
+SAMPLE_AGENT_MODEL = settings.OPENAI_MODEL_BASIC
+SAMPLE_REASONING_AGENT_NAME = "sample_agent_reasoning"
+SAMPLE_REASONING_AGENT_MODEL = settings.OPENAI_MODEL_REASONING
+SAMPLE_AGENT_TEMPERATURE = 0.0
 
 prompt_sample_agent = get_prompt_sample_agent()
 
-sample_agent = create_react_agent(
-    openai_basic_model,
-    tools=[],
+SAMPLE_AGENT_SPEC = AgentSpec(
+    name=SAMPLE_AGENT_NAME,
+    model="basic",
+    prompt=prompt_sample_agent,
+    tools=SAMPLE_TOOL_SET,
+    temperature=SAMPLE_AGENT_TEMPERATURE,
+)
+SAMPLE_REASONING_AGENT_SPEC = AgentSpec(
+    name=SAMPLE_REASONING_AGENT_NAME,
+    model="reasoning",
     prompt=prompt_sample_agent,
+    tools=SAMPLE_TOOL_SET,
+    temperature=SAMPLE_AGENT_TEMPERATURE,
 )
+
+
+agent_manager.register(SAMPLE_AGENT_SPEC)
+agent_manager.register(SAMPLE_REASONING_AGENT_SPEC)
@@ -0,0 +1,134 @@
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.agents.agent_manager.registry import AgentRegistry, AgentSpec, agent_registry
+from src.config.logs_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AgentManager:
+    """
+    Named agents defined by specs, compiled once and cached.
+
+    Specs are kept in the agent registry under their names; agents are
+    compiled on first use or by warm_up. Compiled graphs are cached per
+    distinct spec: agents registered with the same model, prompt and tools
+    share one graph, and each name gets a copy of it bound to
+    `metadata.agent_name`, which its tool metrics are labelled with.
+    Distinct specs compile in parallel; concurrent first uses of one spec
+    compile it once.
+    """
+
+    def __init__(self, registry: AgentRegistry = agent_registry) -> None:
+        self.registry = registry
+        self._agents: Dict[str, Any] = {}
+        self._graphs: Dict[AgentSpec, Any] = {}
+        self._building: Dict[AgentSpec, threading.Lock] = {}
+        # Bumped whenever cached agents are dropped, so builds started
+        # before that are not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def register(self, spec: AgentSpec) -> None:
+        """Register (or replace) the agent spec under its name."""
+        with self._lock:
+            self.registry.register(spec)
+            self._agents.pop(spec.name, None)
+            self._generation += 1
+
+    def get(self, name: str) -> Any:
+        """Return the compiled agent for name, compiling it on first use."""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        spec = self.registry.get(name)
+        graph, generation = self._compiled(spec)
+        agent = graph.with_config(metadata={"agent_name": name})
+        with self._lock:
+            if generation == self._generation:
+                agent = self._agents.setdefault(name, agent)
+        return agent
+
+    def get_spec(self, name: str) -> AgentSpec:
+        return self.registry.get(name)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """Compile the named agents (all registered agents by default)."""
+        for name in list(names if names is not None else self.list_agents()):
+            self.get(name)
+
+    def reset(self) -> None:
+        """Drop compiled agents, e.g. when tools change or on shutdown."""
+        with self._lock:
+            self._agents.clear()
+            self._graphs.clear()
+            self._generation += 1
+
+    def list_agents(self) -> list[str]:
+        return self.registry.list_agents()
+
+    def compiled_graph_count(self) -> int:
+        return len(self._graphs)
+
+    def build(self, spec: AgentSpec) -> Any:
+        """Compile a fresh graph for spec, bypassing the cache."""
+        # Imported here so that importing this module stays cheap
+        from langgraph.prebuilt import create_react_agent
+
+        from src.agents.memory.message_window import build_message_window
+        from src.agents.tools.mcp_tools import get_mcp_tools
+        from src.agents.tools.registry import tool_registry
+        from src.agents.tools.tool_executor import build_tool_node
+        from src.providers.ai.langchain_model_loader import LangchainModelLoader
+
+        loader = LangchainModelLoader()
+        if spec.model == "reasoning":
+            model = loader.init_model_reasoning(temperature=spec.temperature)
+        else:
+            model = loader.init_model_basic(temperature=spec.temperature)
+
+        tools = tool_registry.get_set(spec.tools) if spec.tools else []
+        if spec.mcp_tools:
+            tools = tools + get_mcp_tools()
+        cache_policies = tool_registry.cache_policies(spec.tools) if spec.tools else {}
+
+        return create_react_agent(
+            model,
+            tools=build_tool_node(
+                tools, agent_name=spec.name, cache_policies=cache_policies
+            ),
+            prompt=spec.prompt,
+            pre_model_hook=build_message_window(),
+        )
+
+    def _compiled(self, spec: AgentSpec) -> Tuple[Any, int]:
+        """The shared graph of spec, and the generation it belongs to."""
+        key = spec.graph_key()
+        with self._lock:
+            graph, generation = self._graphs.get(key), self._generation
+            if graph is None:
+                building = self._building.setdefault(key, threading.Lock())
+        if graph is not None:
+            return graph, generation
+        # Only first uses of this spec wait here; other specs build meanwhile
+        with building:
+            with self._lock:
+                graph, generation = self._graphs.get(key), self._generation
+            if graph is not None:
+                return graph, generation
+            logger.info(f"Compiling agent graph for: {spec.name}")
+            try:
+                graph = self.build(spec)
+            finally:
+                with self._lock:
+                    if graph is not None and generation == self._generation:
+                        self._graphs[key] = graph
+                    self._building.pop(key, None)
+        return graph, generation
+
+
+agent_manager = AgentManager()
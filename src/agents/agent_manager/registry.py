@@ -0,0 +1,55 @@
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from src.agents.routing.model_router import ModelTier
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """
+    Declarative definition of a ReAct agent.
+
+    `model` is the model tier the agent runs on and `tools` the name of a
+    tool set in the tool registry; tools of mounted MCP servers are added
+    unless `mcp_tools` is False.
+    """
+
+    name: str
+    model: ModelTier = "basic"
+    prompt: str = ""
+    tools: Optional[str] = None
+    mcp_tools: bool = True
+    temperature: float = 0.0
+
+    def graph_key(self) -> "AgentSpec":
+        """The spec without its name: agents with equal keys share one graph."""
+        return replace(self, name="")
+
+
+class AgentRegistry:
+    """
+    Registry of agent specs by name.
+
+    Registering a spec is cheap: nothing is built until AgentManager
+    compiles the agent on first use (or via warm_up), so importing agent
+    definitions never pays for LLM client creation or graph compilation.
+    """
+
+    def __init__(self) -> None:
+        self._specs: Dict[str, AgentSpec] = {}
+
+    def register(self, spec: AgentSpec) -> None:
+        """Register (or replace) the spec under its name."""
+        self._specs[spec.name] = spec
+
+    def get(self, name: str) -> AgentSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"Agent '{name}' is not registered")
+        return spec
+
+    def list_agents(self) -> list[str]:
+        return list(self._specs.keys())
+
+
+agent_registry = AgentRegistry()
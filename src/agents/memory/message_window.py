@@ -0,0 +1,42 @@
+from typing import Any, Callable, Dict, Optional
+
+from src.config.settings import settings
+
+
+def build_message_window(max_tokens: Optional[int] = None) -> Callable[[Dict], Dict]:
+    """
+    Build a pre-model hook that keeps a thread's messages within a token budget.
+
+    The oldest turns are dropped first; the window always starts on a human
+    message so tool calls are never separated from their results, and a
+    leading system message is kept. Trimming rewrites the stored state, not
+    just the prompt, so persisted threads stop growing too.
+    """
+    from langchain_core.messages import RemoveMessage
+    from langchain_core.messages.utils import count_tokens_approximately, trim_messages
+    from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+    budget = max_tokens or settings.AGENT_MEMORY_MAX_TOKENS
+
+    def message_window(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        if count_tokens_approximately(messages) <= budget:
+            return {}
+        trimmed = trim_messages(
+            messages,
+            max_tokens=budget,
+            strategy="last",
+            token_counter=count_tokens_approximately,
+            start_on="human",
+            include_system=True,
+            allow_partial=False,
+        )
+        if not trimmed:
+            # The latest turn alone is over budget: keep it whole, not nothing
+            last_human = max(
+                (i for i, m in enumerate(messages) if m.type == "human"), default=0
+            )
+            trimmed = messages[last_human:]
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *trimmed]}
+
+    return message_window
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Callable, Literal, Optional
+
+from opentelemetry import trace
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import ai_model_routing_total
+from src.providers.ai.model_stats import get_model_stats
+
+logger = get_logger(__name__)
+
+ModelTier = Literal["basic", "reasoning"]
+
+# Returns a tier for queries it has an opinion on, None to defer to the rules
+RoutingClassifier = Callable[[str], Optional[ModelTier]]
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    tier: ModelTier
+    model: Optional[str]
+    reason: str
+
+
+class ModelRouter:
+    """
+    Picks the basic or the reasoning model for a request.
+
+    Cheap request features decide first, in order: an explicit hint from the
+    caller, the classifier hook, then query length. A reasoning pick is then
+    checked against the reasoning model's live p95 latency and error rate;
+    while it is degraded, traffic falls back to the basic model. Samples
+    age out after AI_STATS_MAX_AGE_SECONDS, so a fallback does not outlast
+    the burst that caused it. Explicit hints are honoured as long as the
+    reasoning model is configured.
+    """
+
+    def __init__(
+        self,
+        basic_model: Optional[str],
+        reasoning_model: Optional[str],
+        length_threshold: Optional[int] = None,
+        max_p95_seconds: Optional[float] = None,
+        max_error_rate: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        classifier: Optional[RoutingClassifier] = None,
+    ):
+        self.basic_model = basic_model
+        self.reasoning_model = reasoning_model
+        self.length_threshold = (
+            settings.MODEL_ROUTING_LENGTH_THRESHOLD
+            if length_threshold is None
+            else length_threshold
+        )
+        self.max_p95_seconds = (
+            settings.MODEL_ROUTING_MAX_P95_SECONDS
+            if max_p95_seconds is None
+            else max_p95_seconds
+        )
+        self.max_error_rate = (
+            settings.MODEL_ROUTING_MAX_ERROR_RATE
+            if max_error_rate is None
+            else max_error_rate
+        )
+        self.min_samples = (
+            settings.MODEL_ROUTING_MIN_SAMPLES if min_samples is None else min_samples
+        )
+        self.classifier = classifier
+
+    def route(self, query: str, hint: Optional[ModelTier] = None) -> RoutingDecision:
+        """Decide which model serves a query and record the decision."""
+        decision = self._decide(query, hint)
+        ai_model_routing_total.labels(tier=decision.tier, reason=decision.reason).inc()
+
+        span = trace.get_current_span()
+        span.set_attribute("ai.routing.tier", decision.tier)
+        span.set_attribute("ai.routing.reason", decision.reason)
+        if decision.model:
+            span.set_attribute("ai.routing.model", decision.model)
+
+        logger.debug(
+            f"Routed query to {decision.tier} model {decision.model} "
+            f"({decision.reason})"
+        )
+        return decision
+
+    def _decide(self, query: str, hint: Optional[ModelTier]) -> RoutingDecision:
+        if not self.reasoning_model:
+            return self._basic("reasoning_unavailable")
+
+        if hint is not None:
+            return self._pick(hint, "hint")
+
+        if self.classifier is not None:
+            try:
+                tier = self.classifier(query)
+            except Exception as e:
+                logger.warning(f"Routing classifier failed, ignoring it: {e}")
+                tier = None
+            if tier is not None:
+                return self._checked(tier, "classifier")
+
+        if len(query) >= self.length_threshold:
+            return self._checked("reasoning", "length")
+        return self._basic("default")
+
+    def _checked(self, tier: ModelTier, reason: str) -> RoutingDecision:
+        if tier == "reasoning" and self._is_degraded(self.reasoning_model):
+            return self._basic("reasoning_degraded")
+        return self._pick(tier, reason)
+
+    def _is_degraded(self, model: str) -> bool:
+        stats = get_model_stats(model)
+        if stats.sample_count < self.min_samples:
+            return False
+        if stats.error_rate() > self.max_error_rate:
+            return True
+        p95 = stats.percentile(95)
+        return p95 is not None and p95 > self.max_p95_seconds
+
+    def _pick(self, tier: ModelTier, reason: str) -> RoutingDecision:
+        if tier == "reasoning":
+            return RoutingDecision("reasoning", self.reasoning_model, reason)
+        return self._basic(reason)
+
+    def _basic(self, reason: str) -> RoutingDecision:
+        return RoutingDecision("basic", self.basic_model, reason)
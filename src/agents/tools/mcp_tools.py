@@ -0,0 +1,65 @@
+from typing import Any, List
+
+from src.agents.agent_manager.manager import agent_manager
+from src.agents.tools.registry import ToolRegistry, tool_registry
+from src.config.logs_config import get_logger
+from src.providers.mcp.mcp_client import MCPClient
+
+logger = get_logger(__name__)
+
+MCP_TOOL_SET_PREFIX = "mcp:"
+
+
+def mcp_tool_set(server_name: str) -> str:
+    """Name of the tool set holding an MCP server's tools."""
+    return f"{MCP_TOOL_SET_PREFIX}{server_name}"
+
+
+def register_mcp_tools(
+    client: MCPClient, server_name: str, registry: ToolRegistry = tool_registry
+) -> List[str]:
+    """Register an MCP server's cached tools and its `mcp:<server>` tool set."""
+    names = []
+    for tool in client.get_tools([server_name]):
+        registry.register(tool.name, lambda tool=tool: tool)
+        names.append(tool.name)
+    registry.define_set(mcp_tool_set(server_name), names)
+    return names
+
+
+def mount_mcp_servers(
+    client: MCPClient, registry: ToolRegistry = tool_registry
+) -> None:
+    """
+    Expose the started MCP servers' tools to agents through the tool registry.
+
+    When a server's tool listing changes, its tool set is re-registered and
+    compiled agents are dropped, so they are rebuilt with the new schemas on
+    next use.
+    """
+
+    def on_tools_changed(server_name: str) -> None:
+        register_mcp_tools(client, server_name, registry)
+        agent_manager.reset()
+        logger.info(f"MCP server '{server_name}' tools re-registered, agents reset")
+
+    for server_name in client.started_servers():
+        register_mcp_tools(client, server_name, registry)
+    client.add_listener(on_tools_changed)
+
+
+def unmount_mcp_servers(registry: ToolRegistry = tool_registry) -> None:
+    """Remove every MCP tool set, when the MCP client is closed."""
+    for set_name in registry.list_sets():
+        if set_name.startswith(MCP_TOOL_SET_PREFIX):
+            registry.remove_set(set_name)
+
+
+def get_mcp_tools(registry: ToolRegistry = tool_registry) -> List[Any]:
+    """Tools of every mounted MCP server, for agents built with them."""
+    return [
+        tool
+        for set_name in registry.list_sets()
+        if set_name.startswith(MCP_TOOL_SET_PREFIX)
+        for tool in registry.get_set(set_name)
+    ]
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.config.logs_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """
+    Memoize a deterministic tool's results by its arguments.
+
+    `key` maps the call arguments to the cache key (all arguments by
+    default), `ttl` defaults to CACHE_TTL and `max_size` (in-process
+    entries) to CACHE_L1_MAX_SIZE. Only results that are not errors are
+    cached, and they must be JSON-serializable.
+    """
+
+    ttl: Optional[int] = None
+    key: Optional[Callable[[Dict[str, Any]], str]] = None
+    max_size: Optional[int] = None
+
+    def cache_key(self, args: Dict[str, Any]) -> str:
+        if self.key is not None:
+            return self.key(args)
+        raw = json.dumps(args, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ToolRegistry:
+    """
+    Registry of named agent tools and named tool sets.
+
+    Tools are registered as factories and built on first use, like agents in
+    the agent registry, so tool modules can be imported without loading
+    LangChain. A tool set is an ordered list of tool names an agent is
+    built with. A per-tool `timeout` is stored in the tool's metadata,
+    where the tool executor picks it up; tools registered with a `cache`
+    policy have their results memoized by the executor.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._timeouts: Dict[str, Optional[float]] = {}
+        self._cache_policies: Dict[str, ToolCachePolicy] = {}
+        self._tools: Dict[str, Any] = {}
+        self._sets: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        timeout: Optional[float] = None,
+        cache: Optional[ToolCachePolicy] = None,
+    ) -> None:
+        """Register a tool factory; replacing one drops its previously built tool."""
+        with self._lock:
+            self._factories[name] = factory
+            self._timeouts[name] = timeout
+            if cache is not None:
+                self._cache_policies[name] = cache
+            else:
+                self._cache_policies.pop(name, None)
+            self._tools.pop(name, None)
+
+    def define_set(self, name: str, tool_names: Iterable[str]) -> None:
+        """Define (or replace) a named tool set from registered tool names."""
+        tool_names = list(tool_names)
+        unknown = [t for t in tool_names if t not in self._factories]
+        if unknown:
+            raise KeyError(f"Tool set '{name}' uses unregistered tools: {unknown}")
+        with self._lock:
+            self._sets[name] = tool_names
+
+    def remove_set(self, name: str) -> None:
+        """Forget a tool set; its tools stay registered."""
+        with self._lock:
+            self._sets.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the tool for name, building it on first use."""
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is None:
+                if name not in self._factories:
+                    raise KeyError(f"Tool '{name}' is not registered")
+                logger.debug(f"Building tool: {name}")
+                tool = self._factories[name]()
+                timeout = self._timeouts.get(name)
+                if timeout is not None:
+                    tool.metadata = {**(tool.metadata or {}), "timeout": timeout}
+                self._tools[name] = tool
+        return tool
+
+    def get_set(self, name: str) -> List[Any]:
+        """Return the tools of a tool set, in definition order."""
+        if name not in self._sets:
+            raise KeyError(f"Tool set '{name}' is not defined")
+        return [self.get(tool_name) for tool_name in self._sets[name]]
+
+    def cache_policies(self, name: str) -> Dict[str, ToolCachePolicy]:
+        """Cache policies of a tool set's cacheable tools, by tool name."""
+        return {
+            self.get(tool_name).name: self._cache_policies[tool_name]
+            for tool_name in self._sets.get(name, [])
+            if tool_name in self._cache_policies
+        }
+
+    def list_tools(self) -> list[str]:
+        return list(self._factories.keys())
+
+    def list_sets(self) -> list[str]:
+        return list(self._sets.keys())
+
+
+tool_registry = ToolRegistry()
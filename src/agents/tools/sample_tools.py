@@ -0,0 +1,26 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.agents.tools.registry import tool_registry
+
+SAMPLE_TOOL_SET = "sample"
+
+
+def current_time(timezone: str = "UTC") -> str:
+    """Return the current date and time in an IANA timezone such as 'Europe/Paris'."""
+    try:
+        zone = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return f"Unknown timezone: {timezone}"
+    return datetime.now(zone).isoformat(timespec="seconds")
+
+
+def build_current_time_tool():
+    # Imported here so that importing this module stays cheap
+    from langchain_core.tools import StructuredTool
+
+    return StructuredTool.from_function(current_time)
+
+
+tool_registry.register("current_time", build_current_time_tool, timeout=2.0)
+tool_registry.define_set(SAMPLE_TOOL_SET, ["current_time"])
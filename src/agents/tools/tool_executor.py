@@ -0,0 +1,230 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from src.agents.tools.registry import ToolCachePolicy
+from src.api.middlewares.observability import AgentMetricsMiddleware
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.providers.cache.redis_client import get_redis_client
+from src.providers.cache.tiered_cache import TieredCache
+from src.utils.single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_tool_caches: Dict[str, TieredCache] = {}
+_tool_caches_lock = threading.Lock()
+_tool_flight = SingleFlight(name="agent_tool")
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Return the thread pool that runs tools without async support."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AGENT_TOOL_THREADS,
+                thread_name_prefix="agent-tool",
+            )
+        return _executor
+
+
+def shutdown_tool_executor() -> None:
+    """Stop the tool thread pool without waiting for tools still running."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_tool_cache(tool_name: str, policy: ToolCachePolicy) -> TieredCache:
+    """Return the result cache of a cacheable tool, shared by every agent."""
+    with _tool_caches_lock:
+        cache = _tool_caches.get(tool_name)
+        if cache is None:
+            redis = get_redis_client() if settings.CACHE_REDIS_ENABLED else None
+            cache = TieredCache(
+                name=f"tool:{tool_name}",
+                redis=redis,
+                ttl=policy.ttl,
+                max_size=policy.max_size,
+            )
+            _tool_caches[tool_name] = cache
+        return cache
+
+
+def reset_tool_caches() -> None:
+    with _tool_caches_lock:
+        _tool_caches.clear()
+
+
+def offload_sync_tool(tool: Any) -> Any:
+    """
+    Give a function tool without a coroutine one that runs it in the tool
+    thread pool, so a blocking tool never stalls the event loop.
+
+    LangChain would otherwise use the loop's default executor, shared with
+    everything else that offloads work. The caller's context variables
+    (request id, usage tracker, trace context) are carried into the thread.
+    """
+    # Imported here so that importing this module stays cheap
+    from langchain_core.tools import StructuredTool
+
+    if not isinstance(tool, StructuredTool) or tool.coroutine or tool.func is None:
+        return tool
+    func = tool.func
+
+    @functools.wraps(func)
+    async def run_in_tool_thread(*args: Any, **kwargs: Any) -> Any:
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            get_tool_executor(), call
+        )
+
+    return tool.model_copy(update={"coroutine": run_in_tool_thread})
+
+
+class ToolCallGuard:
+    """
+    ToolNode `awrap_tool_call` hook that time-boxes and measures tool calls.
+
+    Each call gets its own timeout: the tool's `timeout` metadata, otherwise
+    the guard's default. A call that runs out of time is cancelled and
+    answered with an error tool message, so the model can react instead of
+    the whole run failing. Every call is recorded through
+    AgentMetricsMiddleware with its duration and outcome, under the
+    `agent_name` of the run's config metadata when set (agents sharing a
+    graph set their own), else the guard's `agent_name`.
+
+    Tools with a cache policy are answered from their result cache when
+    the same arguments were seen before (status "cached"); concurrent calls
+    with the same key share one execution.
+
+    Cancelling a tool running in the thread pool only abandons it: the
+    thread keeps going until the function returns.
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        timeout: Optional[float] = None,
+        cache_policies: Optional[Dict[str, ToolCachePolicy]] = None,
+    ):
+        self.agent_name = agent_name
+        self.timeout = settings.AGENT_TOOL_TIMEOUT if timeout is None else timeout
+        self.cache_policies = cache_policies or {}
+
+    async def __call__(
+        self, request: Any, execute: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        from langchain_core.messages import ToolMessage
+
+        call = request.tool_call
+        name = call["name"]
+        agent_name = self._agent_name_for(request)
+        timeout = self._timeout_for(request.tool)
+        status = "success"
+        start = time.perf_counter()
+        policy = self.cache_policies.get(name)
+        try:
+            if policy is None:
+                result = await asyncio.wait_for(execute(request), timeout)
+            else:
+                cached, result = await asyncio.wait_for(
+                    self._run_cached(request, execute, policy), timeout
+                )
+                if cached:
+                    status = "cached"
+            if getattr(result, "status", None) == "error":
+                status = "error"
+            return result
+        except asyncio.TimeoutError:
+            status = "timeout"
+            logger.warning(f"Tool {name} of {agent_name} timed out after {timeout:g}s")
+            return ToolMessage(
+                content=f"Error: tool '{name}' timed out after {timeout:g}s",
+                name=name,
+                tool_call_id=call["id"],
+                status="error",
+            )
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            AgentMetricsMiddleware.record_tool_usage(
+                agent_name, name, time.perf_counter() - start, status
+            )
+
+    async def _run_cached(
+        self,
+        request: Any,
+        execute: Callable[[Any], Awaitable[Any]],
+        policy: ToolCachePolicy,
+    ) -> tuple[bool, Any]:
+        from langchain_core.messages import ToolMessage
+
+        call = request.tool_call
+        name = call["name"]
+        cache = get_tool_cache(name, policy)
+        key = policy.cache_key(call["args"])
+
+        content = await cache.get(key)
+        if content is not None:
+            return True, ToolMessage(
+                content=content, name=name, tool_call_id=call["id"]
+            )
+
+        async def execute_and_store() -> Any:
+            result = await execute(request)
+            if isinstance(result, ToolMessage) and result.status != "error":
+                await cache.set(key, result.content)
+            return result
+
+        result = await _tool_flight.do((name, key), execute_and_store)
+        # A coalesced caller gets the leader's message, answered to its own call
+        if isinstance(result, ToolMessage) and result.tool_call_id != call["id"]:
+            result = result.model_copy(update={"tool_call_id": call["id"]})
+        return False, result
+
+    def _agent_name_for(self, request: Any) -> str:
+        config = getattr(request.runtime, "config", None) or {}
+        return (config.get("metadata") or {}).get("agent_name", self.agent_name)
+
+    def _timeout_for(self, tool: Any) -> float:
+        metadata = getattr(tool, "metadata", None) or {}
+        return metadata.get("timeout", self.timeout)
+
+
+def build_tool_node(
+    tools: Sequence[Any],
+    agent_name: str,
+    timeout: Optional[float] = None,
+    cache_policies: Optional[Dict[str, ToolCachePolicy]] = None,
+) -> Any:
+    """
+    Build the ToolNode of an agent.
+
+    When the model asks for several tools in one step, ToolNode runs them
+    concurrently on the event loop; each call goes through ToolCallGuard,
+    and tools without a coroutine run in the tool thread pool.
+    `cache_policies` (by tool name, see ToolRegistry.cache_policies) makes
+    those tools' results cached.
+    """
+    from langgraph.prebuilt import ToolNode
+
+    return ToolNode(
+        [offload_sync_tool(tool) for tool in tools],
+        awrap_tool_call=ToolCallGuard(agent_name, timeout, cache_policies),
+    )
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, status
+
+from src.api.endpoints.v1.dependencies import get_agent_job_usecase
+from src.api.endpoints.v1.schemas.base import AppResponse
+from src.api.endpoints.v1.schemas.sample import SampleQueryRequest
+from src.config.logs_config import get_logger
+from src.execution.usecases.agent_job_usecase import AgentJobUseCase
+from src.models.agent_job import AgentJob
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.post(
+    "",
+    response_model=AppResponse[AgentJob],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_agent_job(
+    request: SampleQueryRequest,
+    usecase: AgentJobUseCase = Depends(get_agent_job_usecase),
+):
+    """
+    Queue a sample agent run and return its job id right away.
+
+    Poll `GET /agent/jobs/{job_id}` for the status and, once the job has
+    succeeded or failed, its result or error.
+    """
+    logger.debug(f"Agent job submitted with query: {request.query}")
+    job = await usecase.submit(
+        query=request.query,
+        model_hint=request.model_hint,
+        thread_id=request.thread_id,
+    )
+    return AppResponse(success=True, data=job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=AppResponse[AgentJob],
+    status_code=status.HTTP_200_OK,
+)
+async def get_agent_job(
+    job_id: str, usecase: AgentJobUseCase = Depends(get_agent_job_usecase)
+):
+    """Return the status of an agent job, with its result once finished."""
+    job = await usecase.get(job_id)
+    return AppResponse(success=True, data=job)
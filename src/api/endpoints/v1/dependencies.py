@@ -1,17 +1,146 @@
-from fastapi import Depends
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
-from src.agents.agent_manager.agent import sample_agent
+from fastapi import Depends, Header
+
+from src.agents.agent_manager import agent
+from src.agents.agent_manager.manager import agent_manager
+from src.agents.routing.model_router import ModelRouter
+from src.config.settings import settings
+from src.core.exceptions import NotFoundException
 from src.execution.actions.sample_action import SampleAction
+from src.execution.usecases.agent_job_usecase import AgentJobUseCase
 from src.execution.usecases.sample_usecase import SampleUseCase
+from src.execution.workers.agent_job_worker import AgentJobWorkerPool
+from src.providers.cache.redis_client import get_redis_client
+from src.providers.cache.tiered_cache import TieredCache
+from src.providers.queue.job_queue import JobQueue, get_job_queue
+from src.utils.single_flight import SingleFlight
+
+
+@lru_cache
+def get_agent(name: str) -> Callable[[], Any]:
+    """
+    Dependency resolving the agent registered under name.
+
+    The same callable is returned per name, so it can be used as a key in
+    app.dependency_overrides.
+    """
+
+    def resolve_agent() -> Any:
+        if name not in agent_manager.list_agents():
+            raise NotFoundException(
+                message=f"Agent '{name}' is not registered",
+                error_code="AGENT_NOT_FOUND",
+            )
+        return agent_manager.get(name)
+
+    return resolve_agent
+
+
+get_sample_agent = get_agent(agent.SAMPLE_AGENT_NAME)
+
+
+@lru_cache
+def get_response_cache() -> Optional[TieredCache]:
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    redis = get_redis_client() if settings.CACHE_REDIS_ENABLED else None
+    return TieredCache(name="agent_response", redis=redis)
+
+
+@lru_cache
+def get_agent_single_flight() -> Optional[SingleFlight]:
+    if not settings.AGENT_SINGLE_FLIGHT_ENABLED:
+        return None
+    return SingleFlight(name="sample_agent")
+
 
+@lru_cache
+def get_model_router() -> Optional[ModelRouter]:
+    if not settings.MODEL_ROUTING_ENABLED:
+        return None
+    return ModelRouter(
+        basic_model=agent.SAMPLE_AGENT_MODEL,
+        reasoning_model=agent.SAMPLE_REASONING_AGENT_MODEL,
+    )
 
-def get_sample_agent():
-    return sample_agent
 
+def get_semantic_cache():
+    if not settings.semantic_cache_enabled:
+        return None
+    # Imported here so that importing the API does not load NumPy
+    from src.providers.cache.semantic_cache import get_semantic_cache as get_cache
 
-def get_sample_action(agent=Depends(get_sample_agent)) -> SampleAction:
-    return SampleAction(agent=agent)
+    return get_cache()
+
+
+def get_checkpointer():
+    if not settings.AGENT_MEMORY_ENABLED:
+        return None
+    # Imported here so that importing the API does not load LangGraph
+    from src.database.checkpointer import get_checkpointer as get_saver
+
+    return get_saver()
+
+
+def get_cache_bypass(cache_control: Optional[str] = Header(None)) -> bool:
+    """`Cache-Control: no-cache` (or no-store) skips the response cache lookup."""
+    if not cache_control:
+        return False
+    directives = {d.strip().lower() for d in cache_control.split(",")}
+    return bool(directives & {"no-cache", "no-store"})
+
+
+def get_sample_action(
+    sample_agent=Depends(get_sample_agent),
+    cache=Depends(get_response_cache),
+    semantic_cache=Depends(get_semantic_cache),
+    single_flight=Depends(get_agent_single_flight),
+    model_router=Depends(get_model_router),
+    checkpointer=Depends(get_checkpointer),
+) -> SampleAction:
+    return SampleAction(
+        agent=sample_agent,
+        cache=cache,
+        semantic_cache=semantic_cache,
+        single_flight=single_flight,
+        model_name=agent.SAMPLE_AGENT_MODEL,
+        temperature=agent.SAMPLE_AGENT_TEMPERATURE,
+        system_prompt=agent.prompt_sample_agent,
+        router=model_router,
+        get_reasoning_agent=get_agent(agent.SAMPLE_REASONING_AGENT_NAME),
+        checkpointer=checkpointer,
+        agent_name=agent.SAMPLE_AGENT_NAME,
+    )
 
 
 def get_sample_usecase(action=Depends(get_sample_action)) -> SampleUseCase:
     return SampleUseCase(action=action)
+
+
+def build_sample_usecase() -> SampleUseCase:
+    """The sample usecase wired like get_sample_usecase, for use outside requests."""
+    return get_sample_usecase(
+        get_sample_action(
+            sample_agent=get_sample_agent(),
+            cache=get_response_cache(),
+            semantic_cache=get_semantic_cache(),
+            single_flight=get_agent_single_flight(),
+            model_router=get_model_router(),
+            checkpointer=get_checkpointer(),
+        )
+    )
+
+
+def get_agent_job_usecase(queue: JobQueue = Depends(get_job_queue)) -> AgentJobUseCase:
+    return AgentJobUseCase(queue=queue)
+
+
+@lru_cache
+def get_job_worker_pool() -> Optional[AgentJobWorkerPool]:
+    if settings.JOB_WORKERS <= 0:
+        return None
+    return AgentJobWorkerPool(
+        queue=get_job_queue(), usecase_factory=build_sample_usecase
+    )
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.api.endpoints.v1.schemas.base import AppResponse
 from src.config.logs_config import get_logger
 from src.database.connection import get_db
+from src.providers.ai.circuit_breaker import circuit_breaker_states
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -23,12 +24,16 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
 
+    # An open breaker means requests are served by a fallback provider
+    ai_providers = circuit_breaker_states()
+    degraded = "open" in ai_providers.values()
+
     return AppResponse(
         success=True,
         data={
-            "status": "healthy",
+            "status": "degraded" if degraded else "healthy",
             "version": "v1",
             "service": "FastAPI Agentic Starter",
-            "dependencies": {"database": db_status},
+            "dependencies": {"database": db_status, "ai_providers": ai_providers},
         },
     )
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 # Import v1 endpoints
-from src.api.endpoints.v1 import health, metrics, sample_agent, sample_di
+from src.api.endpoints.v1 import agent_jobs, health, metrics, sample_agent, sample_di
 
 # Create v1 router
 v1_router = APIRouter()
@@ -12,4 +12,5 @@ v1_router.include_router(
     metrics.router, prefix=""
 )  # metrics endpoint already has /metrics path
 v1_router.include_router(sample_agent.router, prefix="/agent")
+v1_router.include_router(agent_jobs.router, prefix="/agent/jobs")
 v1_router.include_router(sample_di.router, prefix="/sample_di")
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, Depends, status
+import json
+from typing import AsyncIterator
 
-from src.api.endpoints.v1.dependencies import get_sample_usecase
-from src.api.endpoints.v1.schemas.base import AppResponse
-from src.api.endpoints.v1.schemas.sample import SampleQueryRequest, SampleQueryResponse
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
+
+from src.api.endpoints.v1.dependencies import get_cache_bypass, get_sample_usecase
+from src.api.endpoints.v1.schemas.base import AppResponse, ErrorDetail
+from src.api.endpoints.v1.schemas.sample import (
+    SampleBatchItem,
+    SampleBatchRequest,
+    SampleBatchResponse,
+    SampleQueryRequest,
+    SampleQueryResponse,
+)
 from src.config.logs_config import get_logger
-from src.execution.usecases.sample_usecase import SampleUseCase
+from src.core.exceptions import AppException
+from src.execution.usecases.sample_usecase import BatchItemResult, SampleUseCase
+from src.models.agent_stream import AgentStreamEvent
+from src.providers.ai.usage_tracker import track_usage
+from src.utils.disconnect import cancel_on_disconnect
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -16,10 +30,140 @@ logger = get_logger(__name__)
     status_code=status.HTTP_200_OK,
 )
 async def sample_agent_endpoint(
-    request: SampleQueryRequest, usecase: SampleUseCase = Depends(get_sample_usecase)
+    request: SampleQueryRequest,
+    http_request: Request,
+    usecase: SampleUseCase = Depends(get_sample_usecase),
+    bypass_cache: bool = Depends(get_cache_bypass),
 ):
-    """Sample agent endpoint for v1 API following Hexagonal flow"""
+    """
+    Sample agent endpoint for v1 API following Hexagonal flow.
+
+    Identical queries are answered from the response cache; send
+    `Cache-Control: no-cache` to force a fresh agent run. Pass a `thread_id`
+    to continue a conversation instead of resending its history. The agent
+    run is cancelled if the client disconnects before it finishes.
+    """
     logger.debug(f"Sample agent execution requested with query: {request.query}")
-    result = await usecase.execute(query=request.query)
+    with track_usage() as usage:
+        result = await cancel_on_disconnect(
+            http_request.receive,
+            usecase.execute(
+                query=request.query,
+                bypass_cache=bypass_cache,
+                model_hint=request.model_hint,
+                thread_id=request.thread_id,
+            ),
+        )
+
+    return AppResponse(
+        success=True,
+        data=SampleQueryResponse(response=result),
+        usage=usage.summary(),
+    )
+
+
+@router.post(
+    "/execute/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def sample_agent_stream_endpoint(
+    request: SampleQueryRequest, usecase: SampleUseCase = Depends(get_sample_usecase)
+):
+    """
+    Stream the sample agent run as Server-Sent Events.
+
+    Emits `token`, `tool_call` and `tool_result` events while the agent runs,
+    terminated by a single `done` (final response) or `error` event.
+    """
+    logger.debug(f"Sample agent stream requested with query: {request.query}")
+
+    return StreamingResponse(
+        _to_sse(
+            usecase.stream(
+                query=request.query,
+                model_hint=request.model_hint,
+                thread_id=request.thread_id,
+            )
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/execute:batch",
+    response_model=AppResponse[SampleBatchResponse],
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def sample_agent_batch_endpoint(
+    request: SampleBatchRequest,
+    http_request: Request,
+    usecase: SampleUseCase = Depends(get_sample_usecase),
+    bypass_cache: bool = Depends(get_cache_bypass),
+):
+    """
+    Execute a batch of queries with bounded concurrency.
+
+    Returns per-query results and errors in input order. With `stream: true`
+    the results are streamed as NDJSON, one line per query as it finishes.
+    """
+    logger.debug(f"Sample agent batch requested with {len(request.queries)} queries")
+
+    if request.stream:
+        items = usecase.iter_batch(
+            request.queries,
+            max_concurrency=request.max_concurrency,
+            bypass_cache=bypass_cache,
+            model_hint=request.model_hint,
+        )
+        return StreamingResponse(_to_ndjson(items), media_type="application/x-ndjson")
+
+    with track_usage() as usage:
+        results = await cancel_on_disconnect(
+            http_request.receive,
+            usecase.execute_batch(
+                request.queries,
+                max_concurrency=request.max_concurrency,
+                bypass_cache=bypass_cache,
+                model_hint=request.model_hint,
+            ),
+        )
+    return AppResponse(
+        success=True,
+        data=SampleBatchResponse(results=[_to_batch_item(r) for r in results]),
+        usage=usage.summary(),
+    )
+
+
+def _to_batch_item(result: BatchItemResult) -> SampleBatchItem:
+    if result.error is None:
+        return SampleBatchItem(
+            index=result.index, success=True, response=result.response
+        )
+
+    if isinstance(result.error, AppException):
+        error = ErrorDetail(
+            code=result.error.error_code,
+            message=result.error.message,
+            details=result.error.details,
+        )
+    else:
+        error = ErrorDetail(
+            code="INTERNAL_SERVER_ERROR", message="An unexpected error occurred"
+        )
+    return SampleBatchItem(index=result.index, success=False, error=error)
+
+
+async def _to_ndjson(items: AsyncIterator[BatchItemResult]) -> AsyncIterator[str]:
+    """Serialize batch results as newline-delimited JSON."""
+    async for item in items:
+        yield _to_batch_item(item).model_dump_json() + "\n"
+
 
-    return AppResponse(success=True, data=SampleQueryResponse(response=result))
+async def _to_sse(events: AsyncIterator[AgentStreamEvent]) -> AsyncIterator[str]:
+    """Serialize agent stream events into the SSE wire format."""
+    async for event in events:
+        yield f"event: {event.event}\ndata: {json.dumps(event.data, default=str)}\n\n"
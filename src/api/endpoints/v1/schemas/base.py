@@ -2,6 +2,8 @@ from typing import Any, Generic, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
+from src.models.token_usage import TokenUsage
+
 T = TypeVar("T")
 
 
@@ -20,3 +22,6 @@ class AppResponse(BaseModel, Generic[T]):
     request_id: Optional[str] = Field(
         None, description="Unique identifier for the request"
     )
+    usage: Optional[TokenUsage] = Field(
+        None, description="LLM token usage of the request, when it called a model"
+    )
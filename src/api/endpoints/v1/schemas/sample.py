@@ -1,9 +1,54 @@
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel, Field
 
+from src.api.endpoints.v1.schemas.base import ErrorDetail
+
 
 class SampleQueryRequest(BaseModel):
     query: str = Field(..., description="The query to send to the agent")
+    model_hint: Optional[Literal["basic", "reasoning"]] = Field(
+        None, description="Ask for the basic or reasoning model instead of routing"
+    )
+    thread_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=128,
+        description="Conversation to continue; earlier turns are kept server-side",
+    )
 
 
 class SampleQueryResponse(BaseModel):
     response: str = Field(..., description="The response from the agent")
+
+
+class SampleBatchRequest(BaseModel):
+    queries: List[str] = Field(
+        ..., min_length=1, description="The queries to send to the agent"
+    )
+    max_concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum agent runs in flight; capped by the server limit",
+    )
+    stream: bool = Field(
+        False, description="Stream results as NDJSON in completion order"
+    )
+    model_hint: Optional[Literal["basic", "reasoning"]] = Field(
+        None, description="Ask for the basic or reasoning model for every query"
+    )
+
+
+class SampleBatchItem(BaseModel):
+    index: int = Field(..., description="Position of the query in the request")
+    success: bool = Field(..., description="Whether this query succeeded")
+    response: Optional[str] = Field(None, description="The response from the agent")
+    error: Optional[ErrorDetail] = Field(
+        None, description="Error details if success is false"
+    )
+
+
+class SampleBatchResponse(BaseModel):
+    results: List[SampleBatchItem] = Field(
+        ..., description="Per-query results in input order"
+    )
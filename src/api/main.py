@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -5,14 +6,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from scalar_fastapi import get_scalar_api_reference
 
+from src.agents.agent_manager.manager import agent_manager
+from src.agents.tools.mcp_tools import mount_mcp_servers, unmount_mcp_servers
+from src.agents.tools.tool_executor import shutdown_tool_executor
+from src.api.endpoints.v1.dependencies import get_job_worker_pool
 from src.api.middlewares.error_handler import ErrorHandlerMiddleware
-from src.api.middlewares.logging import LoggingMiddleware
-from src.api.middlewares.observability import ObservabilityMiddleware
+from src.api.middlewares.request_context import RequestContextMiddleware
 from src.api.middlewares.security import APIKeyMiddleware
 from src.api.router.routers import api_router
 from src.config.logs_config import get_logger
 from src.config.settings import settings
+from src.database.checkpoint_store import run_checkpoint_pruning
 from src.observability import setup_tracing, setup_metrics, instrument_fastapi
+from src.providers.ai.langchain_model_loader import LangchainModelLoader
+from src.providers.cache.redis_client import close_redis_client
+from src.providers.http.http_client import close_http_clients
+from src.providers.mcp.mcp_client import close_mcp_client, get_mcp_client
 
 logger = get_logger(__name__)
 
@@ -35,13 +44,50 @@ async def lifespan(app: FastAPI):
         console_export=settings.DEBUG,
     )
 
-    # Instrument FastAPI app for tracing
-    instrument_fastapi(app)
-
     logger.info("Observability initialized - Tracing and Metrics ready")
+
+    # Open pooled sessions to MCP tool servers and expose their tools to agents
+    mcp_client = get_mcp_client()
+    if mcp_client is not None:
+        await mcp_client.start()
+        mount_mcp_servers(mcp_client)
+
+    # Compile agents listed for warm-up; others are compiled on first use
+    if settings.AGENT_WARMUP:
+        await asyncio.to_thread(agent_manager.warm_up, settings.AGENT_WARMUP)
+        logger.info(f"Agents warmed up: {settings.AGENT_WARMUP}")
+
+    # Prune old conversation checkpoints in the background
+    pruning_task = None
+    if settings.AGENT_MEMORY_ENABLED:
+        pruning_task = asyncio.create_task(run_checkpoint_pruning())
+
+    # Run queued agent jobs on this node
+    job_workers = get_job_worker_pool()
+    if job_workers is not None:
+        job_workers.start()
+
     yield
     # Shutdown
     logger.info("Shutting down FastAPI Agentic Starter")
+    if job_workers is not None:
+        await job_workers.stop()
+    if pruning_task is not None:
+        pruning_task.cancel()
+        from src.database.checkpointer import close_checkpointer
+
+        await close_checkpointer()
+    if settings.semantic_cache_enabled:
+        from src.providers.cache.semantic_cache import close_semantic_cache
+
+        close_semantic_cache()
+    agent_manager.reset()
+    unmount_mcp_servers()
+    await close_mcp_client()
+    shutdown_tool_executor()
+    await LangchainModelLoader().close()
+    await close_http_clients()
+    await close_redis_client()
 
 
 def create_app() -> FastAPI:
@@ -70,10 +116,14 @@ def create_app() -> FastAPI:
     app.include_router(api_router, prefix=settings.API_PREFIX)
 
     # Register Middlewares (order matters - last added is first executed)
-    app.add_middleware(ObservabilityMiddleware)
     app.add_middleware(ErrorHandlerMiddleware)
     app.add_middleware(APIKeyMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    # Auto-instrumented server spans replace the manual ones, never both.
+    # Done here, not in lifespan: the middleware stack is built before startup.
+    if settings.HTTP_TRACING_MODE == "instrumentor":
+        instrument_fastapi(app)
 
     # Health check endpoint
     @app.get("/")
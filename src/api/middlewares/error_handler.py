@@ -1,6 +1,5 @@
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.api.endpoints.v1.schemas.base import AppResponse, ErrorDetail
 from src.config.logs_config import get_logger
@@ -9,18 +8,34 @@ from src.core.exceptions import AppException
 logger = get_logger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = getattr(request.state, "request_id", "unknown")
+class ErrorHandlerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id", "unknown")
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except AppException as exc:
             logger.error(
                 f"AppException: {exc.message} [request_id={request_id}]", exc_info=True
             )
-            return JSONResponse(
+            if response_started:
+                # Too late for an error response; let the server close it
+                raise
+            response = JSONResponse(
                 status_code=exc.status_code,
                 content=AppResponse(
                     success=False,
@@ -30,12 +45,15 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     request_id=request_id,
                 ).model_dump(),
             )
+            await response(scope, receive, send)
         except Exception as exc:
             logger.error(
                 f"Unhandled Exception: {str(exc)} [request_id={request_id}]",
                 exc_info=True,
             )
-            return JSONResponse(
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content=AppResponse(
                     success=False,
@@ -46,3 +64,4 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
                     request_id=request_id,
                 ).model_dump(),
             )
+            await response(scope, receive, send)
@@ -0,0 +1,267 @@
+"""
+Request context middleware for FastAPI.
+
+A single outermost layer that, once per request:
+- Sets the request ID (from X-Request-ID or generated) in the scope state,
+  the logging contextvar and the response headers
+- Starts one monotonic timer, reported as X-Process-Time and in the metrics
+- Opens the server span, or annotates the FastAPIInstrumentor span
+- Records the HTTP Prometheus metrics
+
+The inner middlewares read the request ID from `scope["state"]`.
+"""
+
+import re
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from opentelemetry import trace
+from starlette.datastructures import URL, Headers, MutableHeaders
+from starlette.routing import BaseRoute, Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.logs_config import get_logger, request_id_ctx
+from src.config.settings import settings
+from src.observability.metrics import (
+    http_requests_total,
+    http_request_duration_seconds,
+    http_request_size_bytes,
+    http_response_size_bytes,
+)
+from src.observability.tracing import tracer
+
+logger = get_logger(__name__)
+
+# Version segment right after API_PREFIX, e.g. "/v1"
+_API_VERSION_PATTERN = re.compile(r"^/v\d+(?=/|$)")
+
+UNMATCHED_ENDPOINT = "__unmatched__"
+
+
+class RouteTemplateResolver:
+    """
+    Maps request paths to the template of the route that serves them.
+
+    Built once from `app.routes`: paths of static routes go into a lookup
+    table, routes with path parameters keep their compiled Starlette regex
+    and are tried in routing order. Paths no route matches resolve to
+    UNMATCHED_ENDPOINT, so unknown traffic cannot create new metric labels.
+
+    `exclude_paths` are matched against the templates relative to the
+    versioned API root (`{API_PREFIX}/v1`), or against the whole template for
+    routes outside API_PREFIX.
+    """
+
+    def __init__(self, routes: Iterable[BaseRoute], exclude_paths: Iterable[str] = ()):
+        self._static: Dict[str, str] = {}
+        self._dynamic: List[Tuple[Pattern[str], str]] = []
+        exclude_paths = tuple(exclude_paths)
+        excluded = set()
+
+        for route in routes:
+            path_regex = getattr(route, "path_regex", None)
+            if path_regex is None:
+                continue
+            template = route.path_format
+            if getattr(route, "param_convertors", None) or isinstance(route, Mount):
+                self._dynamic.append((path_regex, template))
+            elif template not in self._static and not self._match_dynamic(template):
+                # A parameterized route registered earlier wins, as in routing
+                self._static[template] = template
+            if self._is_excluded(template, exclude_paths):
+                excluded.add(template)
+
+        self._excluded = frozenset(excluded)
+
+    def resolve(self, path: str) -> str:
+        """The route template for `path`, or UNMATCHED_ENDPOINT."""
+        template = self._static.get(path)
+        if template is None:
+            template = self._match_dynamic(path) or UNMATCHED_ENDPOINT
+        return template
+
+    def is_excluded(self, template: str) -> bool:
+        return template in self._excluded
+
+    def _match_dynamic(self, path: str) -> Optional[str]:
+        for path_regex, template in self._dynamic:
+            if path_regex.match(path):
+                return template
+        return None
+
+    @staticmethod
+    def _is_excluded(template: str, exclude_paths: Tuple[str, ...]) -> bool:
+        api_prefix = settings.API_PREFIX.rstrip("/")
+        if api_prefix and template.startswith(api_prefix + "/"):
+            template = _API_VERSION_PATTERN.sub("", template[len(api_prefix) :])
+        return any(
+            template == excluded or template.startswith(excluded.rstrip("/") + "/")
+            for excluded in exclude_paths
+        )
+
+
+class RequestContextMiddleware:
+    """
+    Middleware that owns the request ID, timing, tracing and HTTP metrics.
+
+    With `manual_span` (HTTP_TRACING_MODE="manual") it starts the server
+    span itself. Otherwise FastAPIInstrumentor owns the span and this
+    middleware only adds the request ID to it, so each request gets one span.
+    Metrics and spans are labelled with the route template, resolved by a
+    RouteTemplateResolver built from the app routes at startup. Excluded
+    paths are logged but not traced or measured.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exclude_paths: Optional[list] = None,
+        manual_span: Optional[bool] = None,
+    ):
+        self.app = app
+        self.exclude_paths = exclude_paths or [
+            "/metrics",
+            "/health",
+            "/docs",
+            "/openapi.json",
+        ]
+        if manual_span is None:
+            manual_span = settings.HTTP_TRACING_MODE == "manual"
+        self.manual_span = manual_span
+        self._resolver: Optional[RouteTemplateResolver] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            # Routes are final once the app starts serving
+            self._resolver = self._build_resolver(scope)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get("X-Request-ID") or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_ctx.set(request_id)
+
+        method, path = scope["method"], scope["path"]
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+        process_time = 0.0
+
+        logger.info(f"Request started: {method} {path} [id={request_id}]")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size, process_time
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+                response_headers["X-Process-Time"] = str(process_time)
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        resolver = self._resolver or self._build_resolver(scope)
+        endpoint = resolver.resolve(self._route_path(scope))
+
+        try:
+            if resolver.is_excluded(endpoint):
+                await self.app(scope, receive, send_wrapper)
+            else:
+                content_length = headers.get("content-length", "0")
+                request_size = int(content_length) if content_length.isdigit() else 0
+                try:
+                    if self.manual_span:
+                        with tracer.start_as_current_span(
+                            f"{method} {endpoint}",
+                            kind=trace.SpanKind.SERVER,
+                            attributes={
+                                "http.method": method,
+                                "http.url": str(URL(scope=scope)),
+                                "http.path": path,
+                                "http.request_id": request_id,
+                                "http.target": endpoint,
+                            },
+                        ) as span:
+                            await self._call_traced(scope, receive, send_wrapper, span)
+                            span.set_attribute("http.status_code", status_code)
+                            span.set_attribute(
+                                "http.duration", time.perf_counter() - start_time
+                            )
+                            span.set_attribute("http.success", 200 <= status_code < 400)
+                    else:
+                        span = trace.get_current_span()
+                        span.set_attribute("http.request_id", request_id)
+                        await self.app(scope, receive, send_wrapper)
+                except Exception:
+                    status_code, response_size = 500, 0
+                    raise
+                finally:
+                    self._record_metrics(
+                        method=method,
+                        endpoint=endpoint,
+                        status_code=status_code,
+                        duration=time.perf_counter() - start_time,
+                        request_size=request_size,
+                        response_size=response_size,
+                    )
+
+            logger.info(
+                f"Request finished: {method} {path} - {status_code} [id={request_id}, time={process_time:.4f}s]"
+            )
+        finally:
+            request_id_ctx.reset(token)
+
+    async def _call_traced(
+        self, scope: Scope, receive: Receive, send: Send, span: trace.Span
+    ) -> None:
+        """Run the app, recording an escaping exception on the span."""
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            span.set_attribute("error", True)
+            span.set_attribute("error.type", type(e).__name__)
+            span.set_attribute("error.message", str(e))
+            span.record_exception(e)
+            raise
+
+    def _build_resolver(self, scope: Scope) -> RouteTemplateResolver:
+        routes = getattr(scope.get("app"), "routes", [])
+        self._resolver = RouteTemplateResolver(routes, self.exclude_paths)
+        return self._resolver
+
+    @staticmethod
+    def _route_path(scope: Scope) -> str:
+        """The request path as the router matches it, without root_path."""
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            return path[len(root_path) :]
+        return path
+
+    def _record_metrics(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float,
+        request_size: int,
+        response_size: int,
+    ):
+        """Record all metrics for the request."""
+        status = str(status_code)
+
+        http_requests_total.labels(
+            method=method, endpoint=endpoint, status_code=status
+        ).inc()
+        http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(
+            duration
+        )
+        http_request_size_bytes.labels(method=method, endpoint=endpoint).observe(
+            request_size
+        )
+        http_response_size_bytes.labels(method=method, endpoint=endpoint).observe(
+            response_size
+        )
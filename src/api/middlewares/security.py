@@ -1,38 +1,49 @@
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.api.endpoints.v1.schemas.base import AppResponse, ErrorDetail
 from src.config.settings import settings
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
+class APIKeyMiddleware:
     """
     Middleware to check for a valid API key in headers.
     Only active if X_API_KEY is configured in settings.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Skip security checks in debug mode for convenience,
         # or if no key is configured.
         api_key = getattr(settings, "X_API_KEY", None)
 
         # Skip for health checks and documentation
-        if request.url.path in ["/docs", "/redoc", "/openapi.json", "/"]:
-            return await call_next(request)
+        if scope["path"] in ["/docs", "/redoc", "/openapi.json", "/"]:
+            await self.app(scope, receive, send)
+            return
 
         if api_key:
-            header_key = request.headers.get("X-API-KEY")
+            header_key = Headers(scope=scope).get("X-API-KEY")
             if header_key != api_key:
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     content=AppResponse(
                         success=False,
                         error=ErrorDetail(
                             code="UNAUTHORIZED", message="Invalid or missing API Key"
                         ),
-                        request_id=getattr(request.state, "request_id", "unknown"),
+                        request_id=scope.get("state", {}).get("request_id", "unknown"),
                     ).model_dump(),
                 )
+                await response(scope, receive, send)
+                return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -18,6 +18,50 @@ class Settings(BaseSettings):
     GOOGLE_MODEL_BASIC: str | None = None
     GOOGLE_MODEL_REASONING: str | None = None
 
+    # AI provider settings
+    AI_MODEL_CACHE_SIZE: int = 16
+    AI_RATE_LIMIT_ENABLED: bool = True
+    AI_MAX_CONCURRENCY_BASIC: int = 32
+    AI_MAX_CONCURRENCY_REASONING: int = 8
+    AI_TOKENS_PER_MINUTE_BASIC: int | None = None  # None disables the token budget
+    AI_TOKENS_PER_MINUTE_REASONING: int | None = None
+    AI_RATE_LIMIT_MAX_RETRIES: int = 3
+    AI_RATE_LIMIT_BASE_BACKOFF: float = 1.0
+    AI_RATE_LIMIT_MAX_BACKOFF: float = 30.0
+    AI_COMPLETION_TOKENS_ESTIMATE: int = 512  # budgeted per call before usage is known
+    AI_STATS_WINDOW_SIZE: int = 200  # recent calls per model kept for live p95/errors
+    AI_STATS_MAX_AGE_SECONDS: float | None = 300.0  # older calls leave the window
+    AI_HEDGING_ENABLED: bool = False
+    AI_HEDGE_PERCENTILE: float = 95.0  # hedge calls slower than this live percentile
+    AI_HEDGE_BUDGET_RATIO: float = 0.05  # at most 5% extra calls
+    AI_HEDGE_MIN_SAMPLES: int = 20
+    AI_HEDGE_MIN_DELAY: float = 0.5
+    AI_FALLBACK_ENABLED: bool = True  # fall back to the next configured provider
+    AI_PROVIDER_ORDER: List[str] = ["openai", "google"]
+    AI_BREAKER_FAILURE_RATE: float = 0.5  # failed or slow share that opens a breaker
+    AI_BREAKER_SLOW_CALL_SECONDS: float = 30.0
+    AI_BREAKER_WINDOW_SIZE: int = 20
+    AI_BREAKER_MIN_CALLS: int = 10
+    AI_BREAKER_OPEN_SECONDS: float = 30.0
+    AI_BREAKER_HALF_OPEN_CALLS: int = 1
+    AI_PROVIDER_MODE: Literal["live", "fake"] = (
+        "live"  # fake: offline model, no API calls
+    )
+    AI_FAKE_RESPONSE_MODE: Literal["echo", "canned", "cassette"] = "echo"
+    AI_FAKE_CANNED_RESPONSE: str = "This is a canned response."
+    AI_FAKE_CASSETTE_PATH: str | None = None  # recorded conversations to replay
+    AI_FAKE_TTFT_SECONDS: float = 0.0  # median time to first token
+    AI_FAKE_TTFT_JITTER: float = 0.0  # log-normal shape of the TTFT; 0 is constant
+    AI_FAKE_TOKEN_DELAY_SECONDS: float = 0.0  # per streamed token
+    AI_FAKE_SEED: int | None = None
+
+    # Model routing settings
+    MODEL_ROUTING_ENABLED: bool = True
+    MODEL_ROUTING_LENGTH_THRESHOLD: int = 2000  # characters
+    MODEL_ROUTING_MAX_P95_SECONDS: float = 30.0
+    MODEL_ROUTING_MAX_ERROR_RATE: float = 0.2
+    MODEL_ROUTING_MIN_SAMPLES: int = 20
+
     # Environment settings
     DEBUG: bool = False
     SECRET_KEY: str = "your-default-secret-key"
@@ -37,9 +81,70 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+    REDIS_RETRIES: int = 1
 
     # Cache settings
     CACHE_TTL: int = 900
+    CACHE_L1_MAX_SIZE: int = 1024
+    CACHE_REDIS_ENABLED: bool = True
+    RESPONSE_CACHE_ENABLED: bool = True
+    # Semantic cache: answers paraphrased queries from similar cached ones
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # minimum cosine similarity for a hit
+    SEMANTIC_CACHE_MAX_SIZE: int = 10000
+    SEMANTIC_CACHE_EVICTION: Literal["lru", "lfu"] = "lru"
+    # hashing is for development and tests only: it is not used in production
+    SEMANTIC_CACHE_EMBEDDER: Literal["hashing", "openai"] = "openai"
+    SEMANTIC_CACHE_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    SEMANTIC_CACHE_DIMENSIONS: int = 256
+    SEMANTIC_CACHE_PATH: str = ""  # .npy file to persist to; empty keeps it in memory
+
+    # Agent execution settings
+    AGENT_WARMUP: List[str] = []  # Agents to build at startup instead of on first use
+    AGENT_SINGLE_FLIGHT_ENABLED: bool = True
+    AGENT_BATCH_MAX_SIZE: int = 32
+    AGENT_BATCH_MAX_CONCURRENCY: int = 4
+    AGENT_TOOL_TIMEOUT: float = 30.0  # per tool call, unless the tool sets its own
+    AGENT_TOOL_THREADS: int = 8  # thread pool for tools without async support
+
+    # Agent job queue settings
+    JOB_QUEUE_BACKEND: Literal["redis", "memory"] = "redis"
+    JOB_QUEUE_NAME: str = "agent_jobs"
+    JOB_WORKERS: int = 0  # workers on this node; 0 runs none (submit-only nodes)
+    JOB_RESULT_TTL: int = 3600  # seconds jobs and results are kept
+    JOB_POLL_TIMEOUT: float = 0.5  # keep below REDIS_SOCKET_TIMEOUT
+    JOB_LEASE_TIMEOUT: float = 60.0  # unrenewed for this long, a taken job is requeued
+    JOB_MEMORY_MAX_JOBS: int = 10000
+
+    # MCP tool server settings
+    # Servers to mount as agent tools, by name, in langchain-mcp-adapters
+    # connection format, e.g. {"math": {"transport": "stdio", "command": "python", "args": ["math_server.py"]}}
+    MCP_SERVERS: Dict[str, Dict[str, Any]] = {}
+    MCP_SESSION_POOL_SIZE: int = 2  # live sessions kept per server
+    MCP_STARTUP_TIMEOUT: float = 30.0  # per server; slower servers are left out
+    MCP_TOOLS_REFRESH_SECONDS: float = (
+        300.0  # re-list tool schemas; 0 relies on change notifications only
+    )
+
+    # Conversation memory settings
+    AGENT_MEMORY_ENABLED: bool = True
+    AGENT_MEMORY_MAX_TOKENS: int = 4000  # message window kept per thread
+    CHECKPOINT_FLUSH_INTERVAL: float = 0.5  # seconds writes are batched for
+    CHECKPOINT_FLUSH_MAX_PENDING: int = 100
+    CHECKPOINT_KEEP_PER_THREAD: int = 10
+    CHECKPOINT_RETENTION_DAYS: int = 30
+    CHECKPOINT_PRUNE_INTERVAL: float = 3600.0
+
+    # Outbound HTTP client settings
+    HTTP_SHARED_POOL_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False  # requires the 'h2' package
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 60.0
+    HTTP_POOL_TIMEOUT: float = 10.0
 
     # Logging settings
     LOG_LEVEL: str = "info"
@@ -61,11 +166,21 @@ class Settings(BaseSettings):
     OTLP_ENDPOINT: str | None = None  # e.g., "http://localhost:4317" for Jaeger/Tempo
     METRICS_ENABLED: bool = True
     TRACING_ENABLED: bool = True
+    # Server span per request: "manual" from RequestContextMiddleware or
+    # "instrumentor" from FastAPIInstrumentor
+    HTTP_TRACING_MODE: Literal["manual", "instrumentor"] = "manual"
 
     @property
     def is_production(self) -> bool:
         return not self.DEBUG
 
+    @property
+    def semantic_cache_enabled(self) -> bool:
+        """SEMANTIC_CACHE_ENABLED, unless it would match with hashing in production."""
+        return self.SEMANTIC_CACHE_ENABLED and not (
+            self.SEMANTIC_CACHE_EMBEDDER == "hashing" and self.is_production
+        )
+
     class Config:
         env_file = BASE_DIR / ".env"
         case_sensitive = True
@@ -77,3 +192,9 @@ settings = Settings()
 if not settings.DEBUG and not settings.OPENAI_API_KEY:
     logger = logging.getLogger(__name__)
     logger.warning("OPENAI_API_KEY is not set in production mode!")
+if settings.SEMANTIC_CACHE_ENABLED and not settings.semantic_cache_enabled:
+    logger = logging.getLogger(__name__)
+    logger.warning(
+        "Semantic cache disabled: the hashing embedder matches near-miss queries "
+        "in production mode, set SEMANTIC_CACHE_EMBEDDER=openai"
+    )
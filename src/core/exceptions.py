@@ -58,3 +58,18 @@ class ValidationException(AppException):
         super().__init__(
             message, status_code=422, error_code=error_code, details=details
         )
+
+
+class ClientDisconnectedException(AppException):
+    """Exception raised when the client went away before the response was ready"""
+
+    def __init__(
+        self,
+        message: str = "Client closed the request",
+        error_code: str = "CLIENT_CLOSED_REQUEST",
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        # 499 is the de facto status for requests closed by the client
+        super().__init__(
+            message, status_code=499, error_code=error_code, details=details
+        )
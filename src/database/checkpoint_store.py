@@ -0,0 +1,150 @@
+"""
+Tables and maintenance for persisted agent conversation checkpoints.
+
+Kept free of LangGraph imports so the app can schedule pruning without
+loading the agent stack; the saver itself lives in src.database.checkpointer.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+    Table,
+    and_,
+    delete,
+    exists,
+    func,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.database.connection import AsyncSessionLocal, Base
+
+logger = get_logger(__name__)
+
+checkpoints_table = Table(
+    "agent_checkpoints",
+    Base.metadata,
+    Column("thread_id", String, primary_key=True),
+    Column("checkpoint_ns", String, primary_key=True, default=""),
+    Column("checkpoint_id", String, primary_key=True),
+    Column("parent_checkpoint_id", String, nullable=True),
+    Column("checkpoint_type", String, nullable=False),
+    Column("checkpoint", LargeBinary, nullable=False),
+    Column("metadata_type", String, nullable=False),
+    Column("metadata", LargeBinary, nullable=False),
+    Column(
+        "created_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True,
+    ),
+)
+
+checkpoint_writes_table = Table(
+    "agent_checkpoint_writes",
+    Base.metadata,
+    Column("thread_id", String, primary_key=True),
+    Column("checkpoint_ns", String, primary_key=True, default=""),
+    Column("checkpoint_id", String, primary_key=True),
+    Column("task_id", String, primary_key=True),
+    Column("idx", Integer, primary_key=True),
+    Column("channel", String, nullable=False),
+    Column("value_type", String, nullable=False),
+    Column("value", LargeBinary, nullable=False),
+    Column("task_path", String, nullable=False, default=""),
+)
+
+
+async def create_checkpoint_tables(
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> None:
+    """Create the checkpoint tables if they do not exist yet."""
+    async with session_factory() as session:
+        connection = await session.connection()
+        await connection.run_sync(
+            Base.metadata.create_all,
+            tables=[checkpoints_table, checkpoint_writes_table],
+        )
+        await session.commit()
+
+
+async def prune_checkpoints(
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+    keep_last: Optional[int] = None,
+    older_than: Optional[timedelta] = None,
+) -> int:
+    """
+    Delete old checkpoints and their pending writes.
+
+    Per thread only the newest `keep_last` checkpoints are kept, and any
+    checkpoint older than `older_than` is removed, which drops abandoned
+    threads entirely. Returns the number of checkpoints deleted.
+    """
+    keep_last = keep_last or settings.CHECKPOINT_KEEP_PER_THREAD
+    older_than = older_than or timedelta(days=settings.CHECKPOINT_RETENTION_DAYS)
+    cutoff = datetime.now(timezone.utc) - older_than
+
+    cp = checkpoints_table
+    writes = checkpoint_writes_table
+    ranked = select(
+        cp.c.thread_id,
+        cp.c.checkpoint_ns,
+        cp.c.checkpoint_id,
+        cp.c.created_at,
+        func.row_number()
+        .over(
+            partition_by=(cp.c.thread_id, cp.c.checkpoint_ns),
+            order_by=cp.c.checkpoint_id.desc(),
+        )
+        .label("position"),
+    ).subquery()
+    stale = select(
+        ranked.c.thread_id, ranked.c.checkpoint_ns, ranked.c.checkpoint_id
+    ).where(or_(ranked.c.position > keep_last, ranked.c.created_at < cutoff))
+
+    async with session_factory() as session:
+        result = await session.execute(
+            delete(cp).where(
+                tuple_(cp.c.thread_id, cp.c.checkpoint_ns, cp.c.checkpoint_id).in_(
+                    stale
+                )
+            )
+        )
+        await session.execute(
+            delete(writes).where(
+                ~exists().where(
+                    and_(
+                        cp.c.thread_id == writes.c.thread_id,
+                        cp.c.checkpoint_ns == writes.c.checkpoint_ns,
+                        cp.c.checkpoint_id == writes.c.checkpoint_id,
+                    )
+                )
+            )
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def run_checkpoint_pruning(interval: Optional[float] = None) -> None:
+    """Prune checkpoints every `interval` seconds until cancelled."""
+    interval = interval or settings.CHECKPOINT_PRUNE_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await prune_checkpoints()
+            if deleted:
+                logger.info(f"Pruned {deleted} agent checkpoint(s)")
+        except Exception as e:
+            logger.warning(f"Agent checkpoint pruning failed: {e}")
@@ -0,0 +1,361 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.database.checkpoint_store import (
+    checkpoint_writes_table,
+    checkpoints_table,
+    create_checkpoint_tables,
+)
+from src.database.connection import AsyncSessionLocal
+
+logger = get_logger(__name__)
+
+CheckpointKey = Tuple[str, str, str]
+WriteKey = Tuple[str, str, str, str, int]
+
+
+class SQLAlchemyCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer persisting threads through the app's async engine.
+
+    Writes are buffered and flushed in one transaction per batch: a flush runs
+    `CHECKPOINT_FLUSH_INTERVAL` seconds after the first buffered write, or as
+    soon as `CHECKPOINT_FLUSH_MAX_PENDING` rows are waiting. Reads of a thread
+    with buffered rows flush first, so a thread sees its own writes in this
+    process; other workers only see flushed rows, which is why SampleAction
+    calls aflush() at the end of every thread run. Buffered rows not yet
+    flushed are lost if the process dies; call aflush() on shutdown.
+
+    Statements are written for Postgres; a session bound to SQLite gets the
+    equivalent SQLite upserts, for tests and local stand-ins.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.flush_interval = (
+            settings.CHECKPOINT_FLUSH_INTERVAL
+            if flush_interval is None
+            else flush_interval
+        )
+        self.max_pending = max_pending or settings.CHECKPOINT_FLUSH_MAX_PENDING
+        self._pending_checkpoints: Dict[CheckpointKey, Dict[str, Any]] = {}
+        self._pending_writes: Dict[WriteKey, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tables_ready = False
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending_checkpoints) + len(self._pending_writes)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        if self._has_pending(thread_id):
+            await self.aflush()
+        await self._ensure_tables()
+
+        cp = checkpoints_table
+        query = select(cp).where(
+            cp.c.thread_id == thread_id, cp.c.checkpoint_ns == checkpoint_ns
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(cp.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(cp.c.checkpoint_id.desc()).limit(1)
+
+        async with self.session_factory() as session:
+            row = (await session.execute(query)).mappings().first()
+            if row is None:
+                return None
+            return await self._to_tuple(session, row)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if self.pending_count:
+            await self.aflush()
+        await self._ensure_tables()
+
+        cp = checkpoints_table
+        query = select(cp).order_by(cp.c.checkpoint_id.desc())
+        if config is not None:
+            configurable = config["configurable"]
+            query = query.where(cp.c.thread_id == configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                query = query.where(cp.c.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(cp.c.checkpoint_id == checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            query = query.where(cp.c.checkpoint_id < before_id)
+        if limit is not None and not filter:
+            query = query.limit(limit)
+
+        async with self.session_factory() as session:
+            rows = (await session.execute(query)).mappings().all()
+            yielded = 0
+            for row in rows:
+                item = await self._to_tuple(session, row)
+                if filter and any(item.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                yield item
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        self._pending_checkpoints[(thread_id, checkpoint_ns, checkpoint["id"])] = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "checkpoint_type": checkpoint_type,
+            "checkpoint": checkpoint_blob,
+            "metadata_type": metadata_type,
+            "metadata": metadata_blob,
+        }
+        await self._schedule_flush()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            key = (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            # Regular writes are idempotent per task, special ones overwrite
+            if idx >= 0 and key in self._pending_writes:
+                continue
+            value_type, value_blob = self.serde.dumps_typed(value)
+            self._pending_writes[key] = {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "idx": idx,
+                "channel": channel,
+                "value_type": value_type,
+                "value": value_blob,
+                "task_path": task_path,
+            }
+        await self._schedule_flush()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        for pending in (self._pending_checkpoints, self._pending_writes):
+            for key in [k for k in pending if k[0] == thread_id]:
+                del pending[key]
+        await self._ensure_tables()
+        async with self.session_factory() as session:
+            for table in (checkpoint_writes_table, checkpoints_table):
+                await session.execute(
+                    table.delete().where(table.c.thread_id == thread_id)
+                )
+            await session.commit()
+
+    async def aflush(self) -> None:
+        """Write every buffered checkpoint and write in a single transaction."""
+        checkpoints = self._pending_checkpoints
+        writes = self._pending_writes
+        if not checkpoints and not writes:
+            return
+        self._pending_checkpoints, self._pending_writes = {}, {}
+
+        try:
+            await self._ensure_tables()
+            async with self.session_factory() as session:
+                dialect_insert = self._dialect_insert(session)
+                if checkpoints:
+                    await session.execute(
+                        self._upsert(checkpoints_table, dialect_insert),
+                        list(checkpoints.values()),
+                    )
+                regular = [w for w in writes.values() if w["idx"] >= 0]
+                special = [w for w in writes.values() if w["idx"] < 0]
+                if regular:
+                    stmt = dialect_insert(
+                        checkpoint_writes_table
+                    ).on_conflict_do_nothing()
+                    await session.execute(stmt, regular)
+                if special:
+                    await session.execute(
+                        self._upsert(checkpoint_writes_table, dialect_insert),
+                        special,
+                    )
+                await session.commit()
+        except Exception:
+            # Keep the rows for the next flush; newer buffered rows win
+            self._pending_checkpoints = {**checkpoints, **self._pending_checkpoints}
+            self._pending_writes = {**writes, **self._pending_writes}
+            raise
+        logger.debug(
+            f"Flushed {len(checkpoints)} checkpoint(s) and {len(writes)} write(s)"
+        )
+
+    async def _schedule_flush(self) -> None:
+        if self.pending_count >= self.max_pending or self.flush_interval <= 0:
+            await self.aflush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.aflush()
+        except Exception as e:
+            logger.error(f"Failed to flush agent checkpoints: {e}")
+
+    async def close(self) -> None:
+        """Stop the delayed flush and write whatever is still buffered."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        try:
+            await self.aflush()
+        except Exception as e:
+            logger.error(
+                f"Dropping {self.pending_count} unflushed agent checkpoint row(s): {e}"
+            )
+
+    def _has_pending(self, thread_id: str) -> bool:
+        return any(k[0] == thread_id for k in self._pending_checkpoints) or any(
+            k[0] == thread_id for k in self._pending_writes
+        )
+
+    async def _ensure_tables(self) -> None:
+        if self._tables_ready:
+            return
+        await create_checkpoint_tables(self.session_factory)
+        self._tables_ready = True
+
+    @staticmethod
+    def _dialect_insert(session):
+        bind = getattr(session, "bind", None)
+        if getattr(getattr(bind, "dialect", None), "name", None) == "sqlite":
+            return sqlite_insert
+        return insert
+
+    @staticmethod
+    def _upsert(table, dialect_insert=insert):
+        """INSERT ... ON CONFLICT (primary key) DO UPDATE for executemany rows."""
+        stmt = dialect_insert(table)
+        keys = [c.name for c in table.primary_key.columns]
+        return stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.columns
+                if c.name not in keys and c.name != "created_at"
+            },
+        )
+
+    async def _to_tuple(self, session, row) -> CheckpointTuple:
+        w = checkpoint_writes_table
+        write_rows = (
+            await session.execute(
+                select(w.c.task_id, w.c.channel, w.c.value_type, w.c.value)
+                .where(
+                    w.c.thread_id == row["thread_id"],
+                    w.c.checkpoint_ns == row["checkpoint_ns"],
+                    w.c.checkpoint_id == row["checkpoint_id"],
+                )
+                .order_by(w.c.task_id, w.c.idx)
+            )
+        ).all()
+
+        def config_for(checkpoint_id: str) -> RunnableConfig:
+            return {
+                "configurable": {
+                    "thread_id": row["thread_id"],
+                    "checkpoint_ns": row["checkpoint_ns"],
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=config_for(row["checkpoint_id"]),
+            checkpoint=self.serde.loads_typed(
+                (row["checkpoint_type"], row["checkpoint"])
+            ),
+            metadata=self.serde.loads_typed((row["metadata_type"], row["metadata"])),
+            parent_config=(
+                config_for(row["parent_checkpoint_id"])
+                if row["parent_checkpoint_id"]
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in write_rows
+            ],
+        )
+
+
+_checkpointer: Optional[SQLAlchemyCheckpointSaver] = None
+
+
+def get_checkpointer() -> SQLAlchemyCheckpointSaver:
+    """Return the process-wide checkpointer, creating it on first use."""
+    global _checkpointer
+    if _checkpointer is None:
+        _checkpointer = SQLAlchemyCheckpointSaver()
+    return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    global _checkpointer
+    if _checkpointer is not None:
+        await _checkpointer.close()
+        _checkpointer = None
@@ -1,17 +1,345 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from src.agents.routing.model_router import ModelRouter, ModelTier
+from src.api.middlewares.observability import AgentMetricsMiddleware
 from src.config.logs_config import get_logger
+from src.core.exceptions import AppException, ValidationException
+from src.models.agent_stream import AgentStreamEvent
+from src.models.token_usage import TokenUsage
+from src.providers.ai.usage_tracker import UsageTracker, current_usage_tracker
+from src.providers.cache.tiered_cache import TieredCache
+from src.utils.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
 
 class SampleAction:
-    def __init__(self, agent):
+    def __init__(
+        self,
+        agent,
+        cache: Optional[TieredCache] = None,
+        semantic_cache: Optional[Any] = None,
+        single_flight: Optional[SingleFlight] = None,
+        model_name: Optional[str] = None,
+        temperature: float = 0.0,
+        system_prompt: str = "",
+        router: Optional[ModelRouter] = None,
+        get_reasoning_agent: Optional[Callable[[], Any]] = None,
+        checkpointer: Optional[Any] = None,
+        agent_name: str = "sample_agent",
+    ):
         self.agent = agent
+        self.cache = cache
+        # A SemanticCache, consulted after an exact-match miss
+        self.semantic_cache = semantic_cache
+        self.single_flight = single_flight
+        self.model_name = model_name
+        self.temperature = temperature
+        self.system_prompt = system_prompt
+        self.router = router
+        # Called lazily: the reasoning agent is only built once traffic needs it
+        self.get_reasoning_agent = get_reasoning_agent
+        self.checkpointer = checkpointer
+        self.agent_name = agent_name
+
+    async def execute(
+        self,
+        query: str,
+        bypass_cache: bool = False,
+        model_hint: Optional[ModelTier] = None,
+        thread_id: Optional[str] = None,
+    ) -> str:
+        """
+        Run the agent for a single query.
+
+        When a router is configured, the query goes to the basic or the
+        reasoning agent as the router decides; model_hint asks for a tier.
+        Responses are served from the response cache when one is configured,
+        then from the semantic cache, which also answers paraphrases of cached
+        queries. With bypass_cache the caches are not read, but the fresh
+        response still replaces the cached one. Concurrent identical queries
+        share a single agent run when single-flight is configured.
+
+        Token usage goes to the current request's tracker. A cached response
+        costs nothing and is counted as one; every caller of a shared run gets
+        that run's usage, counted as shared for all but the one that started it.
+
+        With a thread_id the query continues that conversation: earlier turns
+        come from the checkpointer, and the response is neither cached nor
+        shared since it depends on the thread's history.
 
-    async def execute(self, query: str) -> str:
+        Cancelling the call (e.g. when the client disconnects) cancels the
+        agent run with its in-flight model and tool calls, unless the run is
+        shared with other callers still waiting for it.
+        """
         logger.info(f"Executing SampleAction with query: {query}")
-        result = await self.agent.ainvoke(
-            {"messages": [{"role": "user", "content": query}]}
-        )
+        agent, model_name = self._select_agent(query, model_hint)
+        if thread_id:
+            agent, run_kwargs = self._prepare_run(agent, thread_id)
+            response = await self._invoke(agent, query, run_kwargs)
+            await self._persist_thread()
+            return response
+
+        key = self._cache_key(query, model_name)
+        scope = self._cache_scope(model_name)
+
+        tracker = current_usage_tracker()
+
+        if self.cache and not bypass_cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                logger.debug("SampleAction response served from cache")
+                if tracker is not None:
+                    tracker.add_cached_response()
+                return cached
+
+        if self.semantic_cache is not None and not bypass_cache:
+            cached = await self.semantic_cache.get(query, scope=scope)
+            if cached is not None:
+                logger.debug("SampleAction response served from semantic cache")
+                if self.cache:
+                    await self.cache.set(key, cached)
+                if tracker is not None:
+                    tracker.add_cached_response()
+                return cached
+
+        started = False
+
+        def start():
+            nonlocal started
+            started = True
+            return self._run(agent, query, key, scope)
+
+        if self.single_flight:
+            response, usage = await self.single_flight.do(key, start)
+        else:
+            response, usage = await start()
+        if tracker is not None:
+            tracker.add_run(usage, shared=not started)
+        return response
+
+    async def _run(
+        self, agent, query: str, key: str, scope: str
+    ) -> Tuple[str, TokenUsage]:
+        """Run the agent and cache the response; returns it with the run's usage."""
+        usage = UsageTracker()
+        agent, run_kwargs = self._prepare_run(agent, usage=usage)
+        response = await self._invoke(agent, query, run_kwargs)
+
+        if self.cache:
+            await self.cache.set(key, response)
+        if self.semantic_cache is not None:
+            await self.semantic_cache.set(query, response, scope=scope)
+        return response, usage.summary()
+
+    async def _invoke(self, agent, query: str, run_kwargs: Dict[str, Any]) -> str:
+        """Run the agent and record the run as success, error or cancelled."""
+        status = "success"
+        start = time.perf_counter()
+        try:
+            result = await agent.ainvoke(
+                {"messages": [{"role": "user", "content": query}]}, **run_kwargs
+            )
+        except asyncio.CancelledError:
+            status = "cancelled"
+            logger.info("SampleAction agent run cancelled")
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            AgentMetricsMiddleware.record_execution(
+                self.agent_name, time.perf_counter() - start, status
+            )
         # Extract the last message content
-        last_message = result["messages"][-1]
-        return last_message.content
+        return result["messages"][-1].content
+
+    def _select_agent(
+        self, query: str, model_hint: Optional[ModelTier]
+    ) -> Tuple[Any, Optional[str]]:
+        """Return the agent to run and the model it uses."""
+        if self.router is None or self.get_reasoning_agent is None:
+            return self.agent, self.model_name
+        decision = self.router.route(query, hint=model_hint)
+        if decision.tier == "reasoning":
+            return self.get_reasoning_agent(), decision.model
+        return self.agent, self.model_name
+
+    def _prepare_run(
+        self,
+        agent,
+        thread_id: Optional[str] = None,
+        usage: Optional[UsageTracker] = None,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Return the agent to invoke and its run arguments.
+
+        Every run reports token usage through the usage callback, into `usage`
+        or else the current request's tracker. Thread runs are bound to the
+        checkpointer.
+        """
+        # Imported here so that importing this module stays cheap
+        from src.providers.ai.usage_callback import UsageCallbackHandler
+
+        config: Dict[str, Any] = {"callbacks": [UsageCallbackHandler(usage)]}
+        run_kwargs: Dict[str, Any] = {"config": config}
+        if thread_id:
+            if self.checkpointer is None:
+                raise ValidationException(
+                    message="Conversation threads are not enabled",
+                    error_code="THREADS_DISABLED",
+                )
+            agent = agent.copy(update={"checkpointer": self.checkpointer})
+            config["configurable"] = {"thread_id": thread_id}
+            # Persist once per run instead of after every graph step
+            run_kwargs["durability"] = "exit"
+        return agent, run_kwargs
+
+    async def _persist_thread(self) -> None:
+        """
+        Write the thread's buffered checkpoint before answering.
+
+        The checkpointer batches writes, and only the process holding the
+        buffer would see them; a follow-up turn served by another worker must
+        find this one in the database.
+        """
+        flush = getattr(self.checkpointer, "aflush", None)
+        if flush is not None:
+            await flush()
+
+    def _cache_key(self, query: str, model_name: Optional[str] = None) -> str:
+        """Build the exact-match key: normalized prompt + model config."""
+        normalized_query = " ".join(query.split())
+        payload = json.dumps(
+            [
+                normalized_query,
+                self.system_prompt.strip(),
+                model_name or self.model_name,
+                self.temperature,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_scope(self, model_name: Optional[str] = None) -> str:
+        """Build the semantic cache scope: the model config without the query."""
+        payload = json.dumps(
+            [
+                self.system_prompt.strip(),
+                model_name or self.model_name,
+                self.temperature,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def stream(
+        self,
+        query: str,
+        model_hint: Optional[ModelTier] = None,
+        thread_id: Optional[str] = None,
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Stream the agent run as it progresses.
+
+        Yields token events for model output, tool_call/tool_result events for
+        tool steps, and always finishes with exactly one terminal event:
+        `done` (final response and token usage) on success or `error` on failure.
+        """
+        logger.info(f"Streaming SampleAction with query: {query}")
+        final_response = ""
+        usage = UsageTracker()
+        status = "success"
+        start = time.perf_counter()
+        try:
+            agent, _ = self._select_agent(query, model_hint)
+            agent, run_kwargs = self._prepare_run(agent, thread_id, usage)
+            async for mode, chunk in agent.astream(
+                {"messages": [{"role": "user", "content": query}]},
+                stream_mode=["messages", "updates"],
+                **run_kwargs,
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if metadata.get("langgraph_node") != "agent":
+                        continue
+                    content = message.content
+                    if isinstance(content, str) and content:
+                        yield AgentStreamEvent(event="token", data={"content": content})
+                    continue
+
+                for event in self._events_from_update(chunk):
+                    yield event
+
+                agent_update = chunk.get("agent") or {}
+                for message in agent_update.get("messages", []):
+                    if not getattr(message, "tool_calls", None):
+                        final_response = message.content
+            if thread_id:
+                await self._persist_thread()
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client went away mid-stream; the agent run stops with it
+            status = "cancelled"
+            logger.info("SampleAction stream cancelled")
+            raise
+        except AppException as exc:
+            status = "error"
+            logger.error(f"SampleAction stream failed: {exc.message}", exc_info=True)
+            yield AgentStreamEvent(
+                event="error", data={"code": exc.error_code, "message": exc.message}
+            )
+            return
+        except Exception as exc:
+            status = "error"
+            logger.error(f"SampleAction stream failed: {str(exc)}", exc_info=True)
+            yield AgentStreamEvent(
+                event="error",
+                data={
+                    "code": "INTERNAL_SERVER_ERROR",
+                    "message": "An unexpected error occurred",
+                },
+            )
+            return
+        finally:
+            AgentMetricsMiddleware.record_execution(
+                self.agent_name, time.perf_counter() - start, status
+            )
+
+        yield AgentStreamEvent(
+            event="done",
+            data={"response": final_response, "usage": usage.summary().model_dump()},
+        )
+
+    @staticmethod
+    def _events_from_update(update: dict) -> list[AgentStreamEvent]:
+        """Translate a LangGraph node update into tool step events."""
+        events = []
+        for node_update in update.values():
+            if not isinstance(node_update, dict):
+                continue
+            for message in node_update.get("messages", []):
+                for tool_call in getattr(message, "tool_calls", None) or []:
+                    events.append(
+                        AgentStreamEvent(
+                            event="tool_call",
+                            data={
+                                "id": tool_call.get("id"),
+                                "name": tool_call.get("name"),
+                                "args": tool_call.get("args", {}),
+                            },
+                        )
+                    )
+                if getattr(message, "type", None) == "tool":
+                    events.append(
+                        AgentStreamEvent(
+                            event="tool_result",
+                            data={
+                                "id": message.tool_call_id,
+                                "name": message.name,
+                                "content": message.content,
+                            },
+                        )
+                    )
+        return events
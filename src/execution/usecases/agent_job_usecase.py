@@ -0,0 +1,39 @@
+from typing import Optional
+
+from src.agents.routing.model_router import ModelTier
+from src.config.logs_config import get_logger
+from src.core.exceptions import NotFoundException
+from src.models.agent_job import AgentJob
+from src.observability.metrics import agent_jobs_total
+from src.providers.queue.job_queue import JobQueue
+
+logger = get_logger(__name__)
+
+
+class AgentJobUseCase:
+    """Submits agent runs for background execution and reports their state."""
+
+    def __init__(self, queue: JobQueue):
+        self.queue = queue
+
+    async def submit(
+        self,
+        query: str,
+        model_hint: Optional[ModelTier] = None,
+        thread_id: Optional[str] = None,
+    ) -> AgentJob:
+        job = AgentJob(query=query, model_hint=model_hint, thread_id=thread_id)
+        await self.queue.put(job)
+        agent_jobs_total.labels(status="submitted").inc()
+        logger.info(f"Agent job {job.id} queued")
+        return job
+
+    async def get(self, job_id: str) -> AgentJob:
+        job = await self.queue.get(job_id)
+        if job is None:
+            raise NotFoundException(
+                message="Agent job not found or expired",
+                error_code="JOB_NOT_FOUND",
+                details={"job_id": job_id},
+            )
+        return job
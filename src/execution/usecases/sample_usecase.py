@@ -1,13 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from src.agents.routing.model_router import ModelTier
 from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.core.exceptions import ValidationException
 from src.execution.actions.sample_action import SampleAction
+from src.models.agent_stream import AgentStreamEvent
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class BatchItemResult:
+    """Outcome of one query in a batch; exactly one of response/error is set."""
+
+    index: int
+    response: Optional[str] = None
+    error: Optional[Exception] = None
+
+
 class SampleUseCase:
     def __init__(self, action: SampleAction):
         self.action = action
 
-    async def execute(self, query: str) -> str:
+    async def execute(
+        self,
+        query: str,
+        bypass_cache: bool = False,
+        model_hint: Optional[ModelTier] = None,
+        thread_id: Optional[str] = None,
+    ) -> str:
         logger.info(f"Executing SampleUseCase with query: {query}")
-        return await self.action.execute(query)
+        return await self.action.execute(
+            query,
+            bypass_cache=bypass_cache,
+            model_hint=model_hint,
+            thread_id=thread_id,
+        )
+
+    async def stream(
+        self,
+        query: str,
+        model_hint: Optional[ModelTier] = None,
+        thread_id: Optional[str] = None,
+    ) -> AsyncIterator[AgentStreamEvent]:
+        logger.info(f"Streaming SampleUseCase with query: {query}")
+        async for event in self.action.stream(
+            query, model_hint=model_hint, thread_id=thread_id
+        ):
+            yield event
+
+    async def execute_batch(
+        self,
+        queries: List[str],
+        max_concurrency: Optional[int] = None,
+        bypass_cache: bool = False,
+        model_hint: Optional[ModelTier] = None,
+    ) -> List[BatchItemResult]:
+        """Run a batch of queries and return their results in input order."""
+        results = [
+            item
+            async for item in self.iter_batch(
+                queries, max_concurrency, bypass_cache, model_hint
+            )
+        ]
+        return sorted(results, key=lambda item: item.index)
+
+    def iter_batch(
+        self,
+        queries: List[str],
+        max_concurrency: Optional[int] = None,
+        bypass_cache: bool = False,
+        model_hint: Optional[ModelTier] = None,
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Run a batch of queries with bounded concurrency.
+
+        Results are yielded as they complete, not in submission order. A failing
+        query produces an error result without affecting the rest of the batch.
+        Closing the iterator early cancels the queries still running. The batch
+        size is validated eagerly, before any query starts.
+        """
+        if len(queries) > settings.AGENT_BATCH_MAX_SIZE:
+            raise ValidationException(
+                message=f"Batch size exceeds the limit of {settings.AGENT_BATCH_MAX_SIZE}",
+                error_code="BATCH_TOO_LARGE",
+                details={"size": len(queries), "limit": settings.AGENT_BATCH_MAX_SIZE},
+            )
+
+        concurrency = min(
+            max_concurrency or settings.AGENT_BATCH_MAX_CONCURRENCY,
+            settings.AGENT_BATCH_MAX_CONCURRENCY,
+        )
+        logger.info(
+            f"Executing SampleUseCase batch of {len(queries)} queries with concurrency {concurrency}"
+        )
+        return self._run_batch(queries, concurrency, bypass_cache, model_hint)
+
+    async def _run_batch(
+        self,
+        queries: List[str],
+        concurrency: int,
+        bypass_cache: bool,
+        model_hint: Optional[ModelTier],
+    ) -> AsyncIterator[BatchItemResult]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, query: str) -> BatchItemResult:
+            async with semaphore:
+                try:
+                    response = await self.action.execute(
+                        query, bypass_cache=bypass_cache, model_hint=model_hint
+                    )
+                    return BatchItemResult(index=index, response=response)
+                except Exception as exc:
+                    logger.warning(f"Batch item {index} failed: {str(exc)}")
+                    return BatchItemResult(index=index, error=exc)
+
+        tasks = [
+            asyncio.create_task(run(index, query))
+            for index, query in enumerate(queries)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,173 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.core.exceptions import AppException
+from src.execution.usecases.sample_usecase import SampleUseCase
+from src.models.agent_job import AgentJob, AgentJobError
+from src.observability.metrics import agent_job_wait_seconds, agent_jobs_total
+from src.providers.ai.usage_tracker import track_usage
+from src.providers.queue.job_queue import JobQueue
+
+logger = get_logger(__name__)
+
+
+class AgentJobWorkerPool:
+    """
+    Async workers that take agent jobs off the queue and run SampleUseCase.
+
+    Each worker runs one job at a time, so `concurrency` bounds the agent
+    runs in flight on this node. Job state (running, then succeeded or
+    failed with the result, error and token usage) is written back to the
+    queue's store, where the poll endpoint reads it, and the job is then
+    acked. Jobs interrupted by shutdown are put back on the queue. While a
+    job runs its lease is renewed every third of `lease_timeout`, and the
+    pool puts back jobs whose lease ran out, e.g. because the node running
+    them crashed. Queue outages are retried with a capped backoff.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        usecase_factory: Callable[[], SampleUseCase],
+        concurrency: Optional[int] = None,
+        poll_timeout: Optional[float] = None,
+        max_backoff: float = 10.0,
+        lease_timeout: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.usecase_factory = usecase_factory
+        self.concurrency = settings.JOB_WORKERS if concurrency is None else concurrency
+        self.poll_timeout = (
+            settings.JOB_POLL_TIMEOUT if poll_timeout is None else poll_timeout
+        )
+        self.max_backoff = max_backoff
+        self.lease_timeout = (
+            settings.JOB_LEASE_TIMEOUT if lease_timeout is None else lease_timeout
+        )
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"agent-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._requeue_stale(), name="agent-job-reaper")
+        )
+        logger.info(
+            f"Started {self.concurrency} agent job worker(s) on the "
+            f"{self.queue.backend} queue"
+        )
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if tasks:
+            logger.info("Agent job workers stopped")
+
+    async def _work(self) -> None:
+        failures = 0
+        while True:
+            try:
+                job = await self.queue.take(self.poll_timeout)
+                if job is not None:
+                    await self.run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = min(self.max_backoff, 0.5 * 2**failures)
+                log = logger.warning if failures == 0 else logger.debug
+                log(f"Agent job queue unavailable, retrying in {delay:.1f}s: {e}")
+                failures += 1
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+
+    async def run(self, job: AgentJob) -> AgentJob:
+        """Run one job to completion and store its outcome."""
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        agent_job_wait_seconds.observe(
+            (job.started_at - job.created_at).total_seconds()
+        )
+        heartbeat = asyncio.create_task(self._renew_lease(job.id))
+        with track_usage() as usage:
+            try:
+                await self.queue.save(job)
+                result = await self.usecase_factory().execute(
+                    query=job.query,
+                    bypass_cache=False,
+                    model_hint=job.model_hint,
+                    thread_id=job.thread_id,
+                )
+                job.status, job.result = "succeeded", result
+            except asyncio.CancelledError:
+                await self._requeue(job)
+                raise
+            except AppException as e:
+                job.status = "failed"
+                job.error = AgentJobError(code=e.error_code, message=e.message)
+            except Exception as e:
+                logger.error(f"Agent job {job.id} failed: {str(e)}", exc_info=True)
+                job.status = "failed"
+                job.error = AgentJobError(
+                    code="INTERNAL_SERVER_ERROR",
+                    message="An unexpected error occurred",
+                )
+            finally:
+                heartbeat.cancel()
+
+        job.finished_at = datetime.now(timezone.utc)
+        job.usage = usage.summary()
+        try:
+            await self.queue.save(job)
+            await self.queue.ack(job.id)
+        except Exception as e:
+            # Still claimed, so requeue_stale puts it back once the lease runs out
+            logger.error(f"Failed to store the outcome of agent job {job.id}: {e}")
+        agent_jobs_total.labels(status=job.status).inc()
+        logger.info(f"Agent job {job.id} {job.status}")
+        return job
+
+    async def _requeue(self, job: AgentJob) -> None:
+        job.status, job.started_at = "queued", None
+        try:
+            if await self.queue.release(job):
+                agent_jobs_total.labels(status="requeued").inc()
+                logger.info(f"Agent job {job.id} put back on the queue")
+        except Exception as e:
+            # Still claimed, so requeue_stale puts it back once the lease runs out
+            logger.error(f"Failed to requeue agent job {job.id}: {str(e)}")
+
+    async def _renew_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_timeout / 3)
+            try:
+                await self.queue.touch(job_id)
+            except Exception as e:
+                logger.warning(f"Failed to renew the lease of agent job {job_id}: {e}")
+
+    async def _requeue_stale(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_timeout / 2)
+            try:
+                requeued = await self.queue.requeue_stale()
+            except Exception as e:
+                logger.debug(f"Failed to requeue stale agent jobs: {e}")
+                continue
+            if requeued:
+                agent_jobs_total.labels(status="requeued").inc(requeued)
+                logger.warning(
+                    f"Put {requeued} agent job(s) with an expired lease back on the queue"
+                )
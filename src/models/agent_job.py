@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from typing import Literal, Optional
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from src.models.token_usage import TokenUsage
+
+AgentJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AgentJobError(BaseModel):
+    code: str = Field(..., description="Machine-readable error code")
+    message: str = Field(..., description="Human-readable error message")
+
+
+class AgentJob(BaseModel):
+    """
+    An agent run submitted for background execution.
+
+    - queued: waiting for a worker
+    - running: picked up by a worker
+    - succeeded: finished, `result` holds the response
+    - failed: finished, `error` says why
+    """
+
+    id: str = Field(default_factory=lambda: uuid4().hex, description="Job id")
+    status: AgentJobStatus = Field("queued", description="Current job status")
+    query: str = Field(..., description="The query sent to the agent")
+    model_hint: Optional[Literal["basic", "reasoning"]] = Field(
+        None, description="Model tier requested for the run"
+    )
+    thread_id: Optional[str] = Field(None, description="Conversation to continue")
+    created_at: datetime = Field(default_factory=_now, description="Submission time")
+    started_at: Optional[datetime] = Field(None, description="When a worker took it")
+    finished_at: Optional[datetime] = Field(None, description="When the run ended")
+    result: Optional[str] = Field(None, description="The response from the agent")
+    error: Optional[AgentJobError] = Field(None, description="Why the run failed")
+    usage: Optional[TokenUsage] = Field(None, description="LLM token usage of the run")
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
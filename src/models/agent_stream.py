@@ -0,0 +1,24 @@
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, Field
+
+AgentStreamEventType = Literal["token", "tool_call", "tool_result", "done", "error"]
+
+
+class AgentStreamEvent(BaseModel):
+    """
+    A single event emitted while an agent run is streaming.
+
+    - token: partial content produced by the model
+    - tool_call: the model requested a tool invocation
+    - tool_result: a tool finished and returned its output
+    - done: terminal event carrying the final response
+    - error: terminal event emitted when the run fails
+    """
+
+    event: AgentStreamEventType = Field(..., description="Type of the stream event")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Event payload")
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event in ("done", "error")
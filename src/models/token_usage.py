@@ -0,0 +1,39 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class TokenCounts(BaseModel):
+    """Token and latency totals for a set of model calls."""
+
+    prompt_tokens: int = Field(0, description="Input tokens, cached ones included")
+    completion_tokens: int = Field(0, description="Output tokens")
+    cached_prompt_tokens: int = Field(
+        0, description="Input tokens served from the provider's prompt cache"
+    )
+    total_tokens: int = Field(0, description="Prompt plus completion tokens")
+    llm_calls: int = Field(0, description="Number of model calls")
+    llm_duration_seconds: float = Field(
+        0.0, description="Summed wall time of the model calls"
+    )
+
+
+class TokenUsage(TokenCounts):
+    """
+    Token usage of one request, overall and per model.
+
+    Queries answered from a cache cost no tokens and only count in
+    `cached_responses`. A query that joined another request's identical
+    in-flight run counts in `shared_runs` and reports that run's usage, which
+    the other request reports too.
+    """
+
+    by_model: Dict[str, TokenCounts] = Field(
+        default_factory=dict, description="Totals per model name"
+    )
+    cached_responses: int = Field(
+        0, description="Queries answered from the response or semantic cache"
+    )
+    shared_runs: int = Field(
+        0, description="Queries that shared an identical in-flight agent run"
+    )
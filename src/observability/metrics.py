@@ -115,7 +115,7 @@ ai_request_duration_seconds = Histogram(
 ai_tokens_total = Counter(
     "ai_tokens_total",
     "Total tokens used",
-    ["model", "type"],  # type: prompt, completion
+    ["model", "type"],  # type: prompt, completion, cached_prompt
     registry=registry,
 )
 
@@ -123,6 +123,77 @@ ai_errors_total = Counter(
     "ai_errors_total", "Total AI errors", ["model", "error_type"], registry=registry
 )
 
+ai_limiter_queue_wait_seconds = Histogram(
+    "ai_limiter_queue_wait_seconds",
+    "Time AI/LLM requests waited in the per-model limiter",
+    ["model"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+
+ai_limiter_concurrency_limit = Gauge(
+    "ai_limiter_concurrency_limit",
+    "Current adaptive concurrency limit per model",
+    ["model"],
+    registry=registry,
+)
+
+ai_limiter_tokens_per_minute_limit = Gauge(
+    "ai_limiter_tokens_per_minute_limit",
+    "Current adaptive tokens-per-minute budget per model",
+    ["model"],
+    registry=registry,
+)
+
+ai_limiter_in_flight = Gauge(
+    "ai_limiter_in_flight",
+    "AI/LLM requests currently holding a limiter slot",
+    ["model"],
+    registry=registry,
+)
+
+ai_rate_limited_total = Counter(
+    "ai_rate_limited_total",
+    "Total rate-limit (429) responses from AI providers",
+    ["model"],
+    registry=registry,
+)
+
+ai_hedges_fired_total = Counter(
+    "ai_hedges_fired_total",
+    "Total hedged (duplicate) AI/LLM requests sent for slow calls",
+    ["model"],
+    registry=registry,
+)
+
+ai_hedges_won_total = Counter(
+    "ai_hedges_won_total",
+    "Total hedged AI/LLM requests that answered before the original",
+    ["model"],
+    registry=registry,
+)
+
+ai_model_routing_total = Counter(
+    "ai_model_routing_total",
+    "Total model routing decisions",
+    ["tier", "reason"],  # tier: basic, reasoning
+    registry=registry,
+)
+
+ai_circuit_breaker_state = Gauge(
+    "ai_circuit_breaker_state",
+    "AI provider circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["provider"],
+    registry=registry,
+)
+
+ai_provider_fallbacks_total = Counter(
+    "ai_provider_fallbacks_total",
+    "Total calls passed on to the next provider of a fallback chain",
+    ["provider", "reason"],  # provider skipped or failed; reason: open, error
+    registry=registry,
+)
+
 # Business metrics
 usecase_executions_total = Counter(
     "usecase_executions_total",
@@ -156,6 +227,28 @@ cache_operation_duration_seconds = Histogram(
     registry=registry,
 )
 
+semantic_cache_entries = Gauge(
+    "semantic_cache_entries",
+    "Entries held by the semantic cache",
+    ["cache_name"],
+    registry=registry,
+)
+
+semantic_cache_evictions_total = Counter(
+    "semantic_cache_evictions_total",
+    "Entries evicted from the full semantic cache",
+    ["cache_name"],
+    registry=registry,
+)
+
+semantic_cache_similarity = Histogram(
+    "semantic_cache_similarity",
+    "Best cosine similarity found by semantic cache lookups",
+    ["cache_name"],
+    buckets=[0.5, 0.7, 0.8, 0.85, 0.9, 0.92, 0.95, 0.98, 1.0],
+    registry=registry,
+)
+
 # Agent metrics
 agent_executions_total = Counter(
     "agent_executions_total",
@@ -179,6 +272,89 @@ agent_tools_used_total = Counter(
     registry=registry,
 )
 
+agent_tool_duration_seconds = Histogram(
+    "agent_tool_duration_seconds",
+    "Agent tool call duration",
+    ["agent_name", "tool_name", "status"],  # status: success, error, timeout, cancelled
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+
+# MCP tool server metrics
+mcp_requests_total = Counter(
+    "mcp_requests_total",
+    "Total requests to MCP tool servers",
+    ["server", "operation", "status"],  # operation: list_tools, call_tool
+    registry=registry,
+)
+
+mcp_request_duration_seconds = Histogram(
+    "mcp_request_duration_seconds",
+    "MCP tool server request duration",
+    ["server", "operation"],
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+
+mcp_sessions_open = Gauge(
+    "mcp_sessions_open",
+    "Live pooled sessions per MCP tool server",
+    ["server"],
+    registry=registry,
+)
+
+# Agent job queue metrics
+agent_job_queue_depth = Gauge(
+    "agent_job_queue_depth",
+    "Agent jobs waiting in the queue for a worker",
+    ["backend"],  # backend: redis, memory
+    registry=registry,
+)
+
+agent_job_wait_seconds = Histogram(
+    "agent_job_wait_seconds",
+    "Time agent jobs waited in the queue before a worker took them",
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0],
+    registry=registry,
+)
+
+agent_jobs_total = Counter(
+    "agent_jobs_total",
+    "Total agent jobs",
+    ["status"],  # status: submitted, succeeded, failed, requeued
+    registry=registry,
+)
+
+# Outbound HTTP client pool metrics
+http_client_pool_connections = Gauge(
+    "http_client_pool_connections",
+    "Connections held by an outbound HTTP client pool",
+    ["client", "state"],  # state: active, idle
+    registry=registry,
+)
+
+http_client_pool_max_connections = Gauge(
+    "http_client_pool_max_connections",
+    "Configured connection limit of an outbound HTTP client pool",
+    ["client"],
+    registry=registry,
+)
+
+http_client_requests_in_flight = Gauge(
+    "http_client_requests_in_flight",
+    "Outbound HTTP requests waiting for a response",
+    ["client"],
+    registry=registry,
+)
+
+# Request coalescing metrics
+singleflight_coalesced_total = Counter(
+    "singleflight_coalesced_total",
+    "Total callers that joined an in-flight identical call instead of running it",
+    ["name"],
+    registry=registry,
+)
+
 
 def setup_metrics(
     service_name: str = "fastapi-agentic-starter", service_version: str = "1.0.0"
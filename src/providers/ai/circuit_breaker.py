@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Literal, Optional
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import ai_circuit_breaker_state
+
+logger = get_logger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+# Gauge values, ordered by severity
+_STATE_VALUES: Dict[str, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when every provider of a fallback chain is unavailable."""
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker over a window of recent calls.
+
+    Closed: calls go through, and once the window holds `min_calls` calls,
+    a share of failed or slow (over `slow_call_seconds`) calls at or above
+    `failure_rate` opens the breaker. Open: calls are refused for
+    `open_seconds`, so callers fail over immediately instead of waiting
+    for timeouts. Half-open: up to `half_open_calls` probes are let through;
+    one success closes the breaker, one failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        window_size: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        half_open_calls: Optional[int] = None,
+    ):
+        self.name = name
+        self.failure_rate = (
+            settings.AI_BREAKER_FAILURE_RATE if failure_rate is None else failure_rate
+        )
+        self.slow_call_seconds = (
+            settings.AI_BREAKER_SLOW_CALL_SECONDS
+            if slow_call_seconds is None
+            else slow_call_seconds
+        )
+        self.min_calls = (
+            settings.AI_BREAKER_MIN_CALLS if min_calls is None else min_calls
+        )
+        self.open_seconds = (
+            settings.AI_BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+        )
+        self.half_open_calls = (
+            settings.AI_BREAKER_HALF_OPEN_CALLS
+            if half_open_calls is None
+            else half_open_calls
+        )
+        self._outcomes: Deque[bool] = deque(
+            maxlen=(
+                settings.AI_BREAKER_WINDOW_SIZE if window_size is None else window_size
+            )
+        )
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._set_gauge()
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may be sent to this provider now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return True
+            if self._state == "half_open" and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self, duration: float = 0.0) -> None:
+        if duration > self.slow_call_seconds:
+            self._record(False, f"slow call ({duration:.2f}s)")
+        else:
+            self._record(True)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        self._record(False, type(error).__name__ if error else "failure")
+
+    def record_cancelled(self) -> None:
+        """Give back a half-open probe whose call was cancelled."""
+        with self._lock:
+            if self._state == "half_open":
+                self._probes = max(0, self._probes - 1)
+
+    def _record(self, ok: bool, reason: str = "") -> None:
+        with self._lock:
+            if self._state == "half_open":
+                self._probes = max(0, self._probes - 1)
+                if ok:
+                    self._transition("closed")
+                else:
+                    self._transition("open", reason)
+                return
+            if self._state == "open":
+                # Late result of a call sent before the breaker opened
+                return
+            self._outcomes.append(ok)
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(1 for outcome in self._outcomes if not outcome)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._transition("open", reason)
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state == "open"
+            and time.monotonic() - self._opened_at >= self.open_seconds
+        ):
+            self._transition("half_open")
+
+    def _transition(self, state: BreakerState, reason: str = "") -> None:
+        previous, self._state = self._state, state
+        if state == "open":
+            self._opened_at = time.monotonic()
+            self._probes = 0
+        self._outcomes.clear()
+        self._set_gauge()
+        log = logger.warning if state == "open" else logger.info
+        suffix = f" after {reason}" if reason else ""
+        log(f"Circuit breaker for {self.name}: {previous} -> {state}{suffix}")
+
+    def _set_gauge(self) -> None:
+        ai_circuit_breaker_state.labels(provider=self.name).set(
+            _STATE_VALUES[self._state]
+        )
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide breaker of a provider."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def circuit_breaker_states() -> Dict[str, BreakerState]:
+    """Current state of every provider breaker, for health reporting."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,354 @@
+"""
+Offline chat model for load tests, benchmarks and local development.
+
+Selected with AI_PROVIDER_MODE=fake. It answers without any network call:
+
+- echo: repeats the last user message
+- canned: always answers AI_FAKE_CANNED_RESPONSE
+- cassette: replays conversations recorded from a real provider, tool calls
+  and token usage included (see CassetteRecorder)
+
+Latency is modelled for both invoke and streaming: a time to first token
+drawn from a log-normal distribution (median AI_FAKE_TTFT_SECONDS, shape
+AI_FAKE_TTFT_JITTER, 0 for a constant delay) followed by a fixed delay per
+streamed token. Seeded with AI_FAKE_SEED, delays repeat run to run.
+
+Cassette format (JSON):
+    {"conversations": [
+        {"input": "What time is it in Paris?",
+         "responses": [
+            {"content": "", "tool_calls": [{"name": "current_time",
+              "args": {"timezone": "Europe/Paris"}, "id": "call_1"}],
+             "usage_metadata": {"input_tokens": 80, "output_tokens": 12,
+                                "total_tokens": 92}},
+            {"content": "It is 10:04 in Paris.", "usage_metadata": {...}}]}]}
+
+A conversation is picked by the last user message (one without "input"
+matches any message) and its n-th response answers the n-th model call
+after that message, so replay is stateless and safe under concurrency.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    BaseCallbackHandler,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+)
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+    LLMResult,
+)
+from pydantic import ConfigDict, Field
+
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class LatencyModel:
+    """Samples time-to-first-token and per-token delays."""
+
+    def __init__(
+        self,
+        ttft: float = 0.0,
+        jitter: float = 0.0,
+        token_delay: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.ttft = ttft
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ttft(self) -> float:
+        if self.ttft <= 0:
+            return 0.0
+        if self.jitter <= 0:
+            return self.ttft
+        with self._lock:
+            return self._random.lognormvariate(math.log(self.ttft), self.jitter)
+
+    def total(self, tokens: int) -> float:
+        """Delay of a whole, non-streamed response of the given length."""
+        return self.sample_ttft() + self.token_delay * max(tokens - 1, 0)
+
+
+class Cassette:
+    """Recorded conversations, looked up by the last user message."""
+
+    def __init__(self, conversations: Optional[List[Dict[str, Any]]] = None):
+        self.conversations: List[Dict[str, Any]] = conversations or []
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("conversations", []))
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"conversations": self.conversations}, f, indent=2)
+
+    def response_for(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """The recorded response answering this conversation state."""
+        text, step = _conversation_state(messages)
+        conversation = next(
+            (c for c in self.conversations if c.get("input") == text), None
+        ) or next((c for c in self.conversations if "input" not in c), None)
+        if conversation is None:
+            raise ValueError(f"No cassette conversation for input: {text!r}")
+        responses = conversation.get("responses") or []
+        if step >= len(responses):
+            raise ValueError(
+                f"Cassette conversation for {text!r} has no response {step + 1}"
+            )
+        return responses[step]
+
+    def record(self, messages: List[BaseMessage], message: BaseMessage) -> None:
+        text, step = _conversation_state(messages)
+        conversation = next(
+            (c for c in self.conversations if c.get("input") == text), None
+        )
+        if conversation is None:
+            conversation = {"input": text, "responses": []}
+            self.conversations.append(conversation)
+        responses = conversation["responses"]
+        del responses[step:]
+        responses.append(_message_to_dict(message))
+
+
+@lru_cache(maxsize=8)
+def load_cassette(path: str) -> Cassette:
+    return Cassette.load(path)
+
+
+class CassetteRecorder(BaseCallbackHandler):
+    """
+    Records the chat model calls it observes into a cassette.
+
+    Attach it to live runs (`config={"callbacks": [recorder]}`), then
+    `save()` the cassette and replay it with AI_FAKE_RESPONSE_MODE=cassette.
+    """
+
+    def __init__(self, cassette: Optional[Cassette] = None):
+        self.cassette = cassette or Cassette()
+        self._inputs: Dict[UUID, List[BaseMessage]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        self._inputs[run_id] = messages[0]
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        messages = self._inputs.pop(run_id, None)
+        generation = response.generations[0][0] if response.generations else None
+        message = getattr(generation, "message", None)
+        if messages is None or message is None:
+            return
+        with self._lock:
+            self.cassette.record(messages, message)
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            self.cassette.save(path)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers offline, with modelled latency."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "fake"
+    mode: Literal["echo", "canned", "cassette"] = "echo"
+    canned_response: str = "This is a canned response."
+    cassette: Optional[Cassette] = None
+    latency: LatencyModel = Field(default_factory=LatencyModel)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "mode": self.mode}
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = "fake"
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> Any:
+        # Tool calls come from the cassette; the tool schemas are not needed
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages)
+        time.sleep(self.latency.total(len(_tokens(message.content))))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages)
+        await asyncio.sleep(self.latency.total(len(_tokens(message.content))))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        time.sleep(self.latency.sample_ttft())
+        for i, chunk in enumerate(_chunks(message)):
+            if i:
+                time.sleep(self.latency.token_delay)
+            if run_manager and chunk.message.content:
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        await asyncio.sleep(self.latency.sample_ttft())
+        for i, chunk in enumerate(_chunks(message)):
+            if i:
+                await asyncio.sleep(self.latency.token_delay)
+            if run_manager and chunk.message.content:
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        if self.mode == "cassette":
+            if self.cassette is None:
+                raise ValueError("Cassette mode needs a cassette")
+            recorded = self.cassette.response_for(messages)
+            message = AIMessage(
+                content=recorded.get("content", ""),
+                tool_calls=[
+                    {**call, "id": call.get("id") or f"call_{uuid.uuid4().hex[:12]}"}
+                    for call in recorded.get("tool_calls") or []
+                ],
+                usage_metadata=recorded.get("usage_metadata"),
+            )
+        else:
+            text = (
+                self.canned_response
+                if self.mode == "canned"
+                else _conversation_state(messages)[0]
+            )
+            message = AIMessage(content=text)
+        if message.usage_metadata is None:
+            input_tokens = sum(len(_tokens(m.content)) for m in messages)
+            output_tokens = len(_tokens(message.content))
+            message.usage_metadata = {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            }
+        message.response_metadata = {"model_name": self.model_name}
+        return message
+
+
+def _conversation_state(messages: List[BaseMessage]) -> tuple[str, int]:
+    """The last user message and how many model turns have followed it."""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            turns = sum(1 for m in messages[index + 1 :] if m.type == "ai")
+            return _text(messages[index].content), turns
+    return "", sum(1 for m in messages if m.type == "ai")
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+def _tokens(content: Any) -> List[str]:
+    return _TOKEN_PATTERN.findall(_text(content))
+
+
+def _chunks(message: AIMessage) -> Iterator[ChatGenerationChunk]:
+    """Stream a message token by token; tool calls and usage come last."""
+    tokens = _tokens(message.content)
+    for token in tokens:
+        yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+    yield ChatGenerationChunk(
+        message=AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {
+                    "name": call["name"],
+                    "args": json.dumps(call["args"]),
+                    "id": call["id"],
+                    "index": i,
+                }
+                for i, call in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+            response_metadata=message.response_metadata,
+            chunk_position="last",
+        )
+    )
+
+
+def _message_to_dict(message: BaseMessage) -> Dict[str, Any]:
+    recorded: Dict[str, Any] = {"content": _text(message.content)}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        recorded["tool_calls"] = [
+            {"name": call["name"], "args": call["args"], "id": call["id"]}
+            for call in tool_calls
+        ]
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        recorded["usage_metadata"] = dict(usage)
+    return recorded
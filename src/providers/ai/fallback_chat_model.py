@@ -0,0 +1,252 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+from src.config.logs_config import get_logger
+from src.observability.metrics import ai_provider_fallbacks_total
+from src.providers.ai.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_circuit_breaker,
+)
+
+logger = get_logger(__name__)
+
+# Exception types (matched by name anywhere in the MRO, so SDKs need not be
+# imported) meaning the provider could not serve the call
+_RETRYABLE_ERROR_TYPES = frozenset(
+    {
+        "TimeoutError",
+        "ConnectionError",
+        "APITimeoutError",
+        "APIConnectionError",
+        "RateLimitError",
+        "InternalServerError",
+        "TransportError",
+        "ServerError",
+        "ServiceUnavailable",
+        "ResourceExhausted",
+        "DeadlineExceeded",
+    }
+)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for source in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "code"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    Whether another provider might serve a call that failed with `exc`.
+
+    Timeouts, connection errors, rate limits (429) and server errors (5xx)
+    are; client errors such as a bad request, failed auth, an unknown model
+    or an oversized context would fail the same way anywhere.
+    """
+    status = _status_code(exc)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return any(cls.__name__ in _RETRYABLE_ERROR_TYPES for cls in type(exc).__mro__)
+
+
+class FallbackChatModel(BaseChatModel):
+    """
+    Chat model that tries equivalent models of several providers in order.
+
+    Each provider has a circuit breaker fed by the outcome and latency of
+    its calls. A provider whose breaker is open is skipped without a call,
+    so requests fail over to the next provider at once instead of waiting
+    for the degraded one to time out. A call failing with a retryable error
+    (see is_retryable_error) falls through to the next provider too; any
+    other error is the request's fault and is raised at once, without
+    counting against the provider. Streams only fall back before their
+    first chunk.
+    Tools are bound on every candidate separately, since providers encode
+    tool schemas differently.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    candidates: List[BaseChatModel]
+    providers: List[str]
+    # Per-candidate call kwargs set by bind_tools
+    candidate_kwargs: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fallback"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"providers": self.providers}
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any):
+        return self.candidates[0]._get_ls_params(stop=stop, **kwargs)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "FallbackChatModel":
+        bound = [
+            getattr(model.bind_tools(tools, **kwargs), "kwargs", {})
+            for model in self.candidates
+        ]
+        return self.model_copy(update={"candidate_kwargs": bound})
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        last_error: Optional[Exception] = None
+        for index, model, breaker in self._available():
+            start = time.perf_counter()
+            try:
+                result = model._generate(
+                    messages, stop, run_manager, **self._kwargs(index, kwargs)
+                )
+            except Exception as e:
+                if not self._failed(index, breaker, e, start):
+                    raise
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - start)
+            return result
+        raise self._exhausted(last_error)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        last_error: Optional[Exception] = None
+        for index, model, breaker in self._available():
+            emitted = False
+            start = time.perf_counter()
+            try:
+                for chunk in model._stream(
+                    messages, stop, run_manager, **self._kwargs(index, kwargs)
+                ):
+                    emitted = True
+                    yield chunk
+            except Exception as e:
+                if not self._failed(index, breaker, e, start) or emitted:
+                    raise
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - start)
+            return
+        raise self._exhausted(last_error)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        last_error: Optional[Exception] = None
+        for index, model, breaker in self._available():
+            start = time.perf_counter()
+            try:
+                result = await model._agenerate(
+                    messages, stop, run_manager, **self._kwargs(index, kwargs)
+                )
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+            except Exception as e:
+                if not self._failed(index, breaker, e, start):
+                    raise
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - start)
+            return result
+        raise self._exhausted(last_error)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        last_error: Optional[Exception] = None
+        for index, model, breaker in self._available():
+            emitted = False
+            start = time.perf_counter()
+            try:
+                async for chunk in model._astream(
+                    messages, stop, run_manager, **self._kwargs(index, kwargs)
+                ):
+                    emitted = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                breaker.record_cancelled()
+                raise
+            except Exception as e:
+                # Once tokens reached the caller the stream cannot be replayed
+                if not self._failed(index, breaker, e, start) or emitted:
+                    raise
+                last_error = e
+                continue
+            breaker.record_success(time.perf_counter() - start)
+            return
+        raise self._exhausted(last_error)
+
+    def _available(self) -> Iterator[tuple[int, BaseChatModel, CircuitBreaker]]:
+        """Yield the candidates whose breaker lets a call through, in order."""
+        for index, (model, provider) in enumerate(zip(self.candidates, self.providers)):
+            breaker = get_circuit_breaker(provider)
+            if breaker.allow_request():
+                yield index, model, breaker
+            elif index < len(self.candidates) - 1:
+                ai_provider_fallbacks_total.labels(
+                    provider=provider, reason="open"
+                ).inc()
+
+    def _kwargs(self, index: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.candidate_kwargs:
+            return kwargs
+        return {**self.candidate_kwargs[index], **kwargs}
+
+    def _failed(
+        self, index: int, breaker: CircuitBreaker, error: Exception, start: float
+    ) -> bool:
+        """Record a failed call; return whether the next provider may retry it."""
+        if not is_retryable_error(error):
+            # The provider answered: the call counts as served, not failed
+            breaker.record_success(time.perf_counter() - start)
+            return False
+        breaker.record_failure(error)
+        if index < len(self.candidates) - 1:
+            ai_provider_fallbacks_total.labels(
+                provider=self.providers[index], reason="error"
+            ).inc()
+            logger.warning(
+                f"{self.providers[index]} call failed ({type(error).__name__}: "
+                f"{error}), falling back to the next provider"
+            )
+        return True
+
+    def _exhausted(self, last_error: Optional[Exception]) -> Exception:
+        if last_error is not None:
+            return last_error
+        return CircuitOpenError(
+            f"All providers are unavailable: {', '.join(self.providers)}"
+        )
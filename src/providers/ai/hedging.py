@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import ai_hedges_fired_total, ai_hedges_won_total
+from src.providers.ai.model_stats import get_model_stats
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgeBudget:
+    """
+    Caps hedges to a fraction of primary calls.
+
+    Every primary call earns `ratio` of a token, every hedge spends a whole
+    one, so over time at most `ratio` extra calls are made. `burst` bounds
+    how many unused tokens can pile up during quiet periods.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def on_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class HedgePolicy:
+    """
+    Decides when a slow model call gets a second, identical request.
+
+    The delay is the model's live latency percentile (p95 by default) over
+    its recent calls, so only calls slower than nearly all of their peers
+    are hedged. Without enough samples no hedge is sent.
+    """
+
+    def __init__(
+        self,
+        budget: HedgeBudget,
+        percentile: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        min_delay: Optional[float] = None,
+    ):
+        self.budget = budget
+        self.percentile = percentile or settings.AI_HEDGE_PERCENTILE
+        self.min_samples = min_samples or settings.AI_HEDGE_MIN_SAMPLES
+        self.min_delay = settings.AI_HEDGE_MIN_DELAY if min_delay is None else min_delay
+
+    def delay_for(self, model: str) -> Optional[float]:
+        stats = get_model_stats(model)
+        if stats.sample_count < self.min_samples:
+            return None
+        delay = stats.percentile(self.percentile)
+        if delay is None:
+            return None
+        return max(delay, self.min_delay)
+
+    async def run(
+        self,
+        model: str,
+        call: Callable[[], Awaitable[T]],
+        started: Optional[asyncio.Event] = None,
+        can_hedge: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Run `call`, hedging it once if it outlives the model's delay.
+
+        With `started`, the delay counts from the moment the call sets it,
+        e.g. once it holds a rate limiter slot, since time spent queueing is
+        not the provider's latency. `can_hedge` is asked right before a hedge
+        would be sent and can veto it.
+        """
+        self.budget.on_request()
+        delay = self.delay_for(model)
+        primary = asyncio.ensure_future(call())
+        if delay is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            if started is not None:
+                waiter = asyncio.ensure_future(started.wait())
+                try:
+                    await asyncio.wait(
+                        {primary, waiter}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    waiter.cancel()
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or (can_hedge is not None and not can_hedge()):
+                return await primary
+            if not self.budget.try_spend():
+                return await primary
+
+            hedge = asyncio.ensure_future(call())
+            tasks.add(hedge)
+            ai_hedges_fired_total.labels(model=model).inc()
+            logger.debug(f"Hedging {model} call after {delay:.2f}s")
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((t for t in done if not t.exception()), None)
+                if winner is not None:
+                    if winner is hedge:
+                        ai_hedges_won_total.labels(model=model).inc()
+                    return winner.result()
+            # Both failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+_policy: Optional[HedgePolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """Return the process-wide policy; all models share one hedge budget."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = HedgePolicy(HedgeBudget(settings.AI_HEDGE_BUDGET_RATIO))
+        return _policy
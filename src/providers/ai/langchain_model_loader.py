@@ -1,12 +1,33 @@
+import inspect
 import os
-from typing import Any, ClassVar, Dict, Optional
-
-from langchain.chat_models import init_chat_model
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, ClassVar, Dict, Hashable, List, Optional, Tuple
 
+from src.config.logs_config import get_logger
 from src.config.settings import settings
+from src.providers.http.http_client import get_async_http_client
+
+logger = get_logger(__name__)
+
+ModelCacheKey = Tuple[str, Optional[str], Hashable]
 
 
 class LangchainModelLoader:
+    """
+    Builds LangChain chat models and reuses them per configuration.
+
+    Models are cached by (provider, model, normalized config), so callers asking
+    for the same configuration share one client instance and its HTTP
+    connection pool, while different temperatures or kwargs get their own.
+    init_model_basic/init_model_reasoning chain the configured providers in
+    AI_PROVIDER_ORDER behind per-provider circuit breakers, or return the
+    offline fake model when AI_PROVIDER_MODE is "fake".
+    The cache is bounded; least recently used entries are evicted. Evicted
+    models are not closed since agents may still hold them, only close()
+    releases clients, on shutdown.
+    """
+
     _instance: ClassVar[Optional["LangchainModelLoader"]] = None
 
     def __new__(cls) -> "LangchainModelLoader":
@@ -19,35 +40,345 @@ class LangchainModelLoader:
         if self._initialized:
             return
         self.models: Dict[str, Any] = {}
+        self.max_cached_models = settings.AI_MODEL_CACHE_SIZE
+        self._model_cache: "OrderedDict[ModelCacheKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
         self._setup_api_keys()
         self._initialized = True
 
     def _setup_api_keys(self) -> None:
         if settings.OPENAI_API_KEY:
             os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
+        if settings.GOOGLE_API_KEY:
+            os.environ["GOOGLE_API_KEY"] = settings.GOOGLE_API_KEY
 
     def _get_openai_config(self, **kwargs: Any) -> Dict[str, Any]:
-        config = {"temperature": kwargs.pop("temperature", 0.0)}
+        config = {"temperature": float(kwargs.pop("temperature", 0.0))}
         config["api_key"] = kwargs.pop("api_key", settings.OPENAI_API_KEY)
+        # ManagedChatModel is the only layer that retries, so every 429 reaches
+        # the adaptive limiter and retries do not multiply
+        config["max_retries"] = kwargs.pop("max_retries", 0)
+        if settings.HTTP_SHARED_POOL_ENABLED:
+            config["http_async_client"] = kwargs.pop(
+                "http_async_client", get_async_http_client("llm")
+            )
+        config.update(kwargs)
+        return config
+
+    def _get_google_config(self, **kwargs: Any) -> Dict[str, Any]:
+        config = {"temperature": float(kwargs.pop("temperature", 0.0))}
+        config["api_key"] = kwargs.pop("api_key", settings.GOOGLE_API_KEY)
+        config["max_retries"] = kwargs.pop("max_retries", 0)
         config.update(kwargs)
         return config
 
     def init_model_openai_basic(self, temperature: float = 0.0, **kwargs: Any) -> Any:
         config = self._get_openai_config(temperature=temperature, **kwargs)
-        model = init_chat_model(model=settings.OPENAI_MODEL_BASIC, **config)
-        self.models["openai_basic"] = model
-        return model
+        return self._get_or_create(
+            "openai_basic",
+            "openai",
+            settings.OPENAI_MODEL_BASIC,
+            config,
+            max_concurrency=settings.AI_MAX_CONCURRENCY_BASIC,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE_BASIC,
+        )
 
     def init_model_openai_reasoning(
         self, temperature: float = 0.0, **kwargs: Any
     ) -> Any:
         config = self._get_openai_config(temperature=temperature, **kwargs)
-        model = init_chat_model(model=settings.OPENAI_MODEL_REASONING, **config)
-        self.models["openai_reasoning"] = model
-        return model
+        return self._get_or_create(
+            "openai_reasoning",
+            "openai",
+            settings.OPENAI_MODEL_REASONING,
+            config,
+            max_concurrency=settings.AI_MAX_CONCURRENCY_REASONING,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE_REASONING,
+        )
+
+    def init_model_google_basic(self, temperature: float = 0.0, **kwargs: Any) -> Any:
+        config = self._get_google_config(temperature=temperature, **kwargs)
+        return self._get_or_create(
+            "google_basic",
+            "google_genai",
+            settings.GOOGLE_MODEL_BASIC,
+            config,
+            max_concurrency=settings.AI_MAX_CONCURRENCY_BASIC,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE_BASIC,
+        )
+
+    def init_model_google_reasoning(
+        self, temperature: float = 0.0, **kwargs: Any
+    ) -> Any:
+        config = self._get_google_config(temperature=temperature, **kwargs)
+        return self._get_or_create(
+            "google_reasoning",
+            "google_genai",
+            settings.GOOGLE_MODEL_REASONING,
+            config,
+            max_concurrency=settings.AI_MAX_CONCURRENCY_REASONING,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE_REASONING,
+        )
+
+    def init_model_fake(self, tier: str, temperature: float = 0.0) -> Any:
+        """Offline model answering per AI_FAKE_RESPONSE_MODE, for load tests."""
+        config = {
+            "mode": settings.AI_FAKE_RESPONSE_MODE,
+            "canned_response": settings.AI_FAKE_CANNED_RESPONSE,
+            "cassette_path": settings.AI_FAKE_CASSETTE_PATH,
+            "ttft": settings.AI_FAKE_TTFT_SECONDS,
+            "jitter": settings.AI_FAKE_TTFT_JITTER,
+            "token_delay": settings.AI_FAKE_TOKEN_DELAY_SECONDS,
+            "seed": settings.AI_FAKE_SEED,
+            "temperature": float(temperature),
+        }
+        model_name = f"fake-{tier}"
+
+        def build() -> Any:
+            from src.providers.ai.fake_chat_model import (
+                FakeChatModel,
+                LatencyModel,
+                load_cassette,
+            )
+
+            path = config["cassette_path"]
+            return FakeChatModel(
+                model_name=model_name,
+                mode=config["mode"],
+                canned_response=config["canned_response"],
+                cassette=load_cassette(path) if path else None,
+                latency=LatencyModel(
+                    config["ttft"],
+                    config["jitter"],
+                    config["token_delay"],
+                    config["seed"],
+                ),
+            )
+
+        reasoning = tier == "reasoning"
+        return self._get_or_create(
+            f"fake_{tier}",
+            "fake",
+            model_name,
+            config,
+            max_concurrency=(
+                settings.AI_MAX_CONCURRENCY_REASONING
+                if reasoning
+                else settings.AI_MAX_CONCURRENCY_BASIC
+            ),
+            tokens_per_minute=(
+                settings.AI_TOKENS_PER_MINUTE_REASONING
+                if reasoning
+                else settings.AI_TOKENS_PER_MINUTE_BASIC
+            ),
+            build=build,
+        )
+
+    def init_model_basic(self, temperature: float = 0.0, **kwargs: Any) -> Any:
+        """Basic model of the first configured provider, the others as fallback."""
+        if settings.AI_PROVIDER_MODE == "fake":
+            return self.init_model_fake("basic", temperature=temperature)
+        return self._init_chain(
+            "basic",
+            {
+                "openai": (settings.OPENAI_MODEL_BASIC, self.init_model_openai_basic),
+                "google": (settings.GOOGLE_MODEL_BASIC, self.init_model_google_basic),
+            },
+            temperature=temperature,
+            **kwargs,
+        )
+
+    def init_model_reasoning(self, temperature: float = 0.0, **kwargs: Any) -> Any:
+        """Reasoning model of the first configured provider, the others as fallback."""
+        if settings.AI_PROVIDER_MODE == "fake":
+            return self.init_model_fake("reasoning", temperature=temperature)
+        return self._init_chain(
+            "reasoning",
+            {
+                "openai": (
+                    settings.OPENAI_MODEL_REASONING,
+                    self.init_model_openai_reasoning,
+                ),
+                "google": (
+                    settings.GOOGLE_MODEL_REASONING,
+                    self.init_model_google_reasoning,
+                ),
+            },
+            temperature=temperature,
+            **kwargs,
+        )
 
     def get_model(self, model_name: str) -> Optional[Any]:
         return self.models.get(model_name)
 
     def list_available_models(self) -> list[str]:
         return list(self.models.keys())
+
+    def cached_model_count(self) -> int:
+        return len(self._model_cache)
+
+    async def close(self) -> None:
+        """Release the HTTP clients of every cached model and clear the cache."""
+        with self._lock:
+            models = list(self._model_cache.values())
+            self._model_cache.clear()
+            self.models.clear()
+
+        for model in models:
+            await self._close_model(model)
+        if models:
+            logger.info(f"Closed {len(models)} cached chat model(s)")
+
+    def _init_chain(
+        self,
+        tier: str,
+        builders: Dict[str, Tuple[Optional[str], Callable[..., Any]]],
+        **kwargs: Any,
+    ) -> Any:
+        candidates: List[Tuple[str, Any]] = []
+        for provider in settings.AI_PROVIDER_ORDER:
+            if provider not in builders:
+                logger.warning(f"Unknown AI provider in AI_PROVIDER_ORDER: {provider}")
+                continue
+            model_name, build = builders[provider]
+            if not model_name:
+                logger.debug(f"No {tier} model configured for {provider}")
+                continue
+            try:
+                candidates.append((provider, build(**kwargs)))
+            except ImportError as e:
+                # Provider integrations other than OpenAI are optional extras
+                logger.warning(
+                    f"AI provider {provider} is listed in AI_PROVIDER_ORDER but "
+                    f"cannot be loaded, skipping its {tier} model ({e}); "
+                    f"install it with `uv sync --extra {provider}`"
+                )
+                continue
+            if not settings.AI_FALLBACK_ENABLED:
+                break
+
+        if not candidates:
+            # Nothing configured: keep the unconfigured OpenAI model, which
+            # reports the missing settings when it is first called
+            return builders["openai"][1](**kwargs)
+        if len(candidates) == 1:
+            return candidates[0][1]
+
+        from src.providers.ai.fallback_chat_model import FallbackChatModel
+
+        model = FallbackChatModel(
+            candidates=[model for _, model in candidates],
+            providers=[provider for provider, _ in candidates],
+        )
+        with self._lock:
+            self.models[tier] = model
+        return model
+
+    def _get_or_create(
+        self,
+        alias: str,
+        provider: str,
+        model_name: Optional[str],
+        config: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        build: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        key = (provider, model_name, self._normalize_config(config))
+
+        with self._lock:
+            model = self._model_cache.get(key)
+            if model is not None:
+                self._model_cache.move_to_end(key)
+            else:
+                if build is not None:
+                    model = build()
+                else:
+                    from langchain.chat_models import init_chat_model
+
+                    model = init_chat_model(
+                        model=model_name, model_provider=provider, **config
+                    )
+                model = self._managed(
+                    model, provider, model_name, max_concurrency, tokens_per_minute
+                )
+                self._model_cache[key] = model
+                while len(self._model_cache) > self.max_cached_models:
+                    evicted_key, _ = self._model_cache.popitem(last=False)
+                    logger.debug(f"Evicted cached chat model: {evicted_key[:2]}")
+            self.models[alias] = model
+        return model
+
+    @staticmethod
+    def _managed(
+        model: Any,
+        provider: str,
+        model_name: Optional[str],
+        max_concurrency: Optional[int],
+        tokens_per_minute: Optional[int],
+    ) -> Any:
+        """Wrap a chat model so its calls are limited and tracked per model."""
+        from langchain_core.language_models.chat_models import BaseChatModel
+
+        # Unconfigured models (no model name) cannot be called, nothing to manage
+        if not model_name or not isinstance(model, BaseChatModel):
+            return model
+
+        from src.providers.ai.hedging import get_hedge_policy
+        from src.providers.ai.managed_chat_model import ManagedChatModel
+        from src.providers.ai.rate_limiter import get_rate_limiter
+
+        limiter = None
+        if max_concurrency and settings.AI_RATE_LIMIT_ENABLED:
+            limiter = get_rate_limiter(model_name, max_concurrency, tokens_per_minute)
+        return ManagedChatModel(
+            inner=model,
+            model_name=model_name,
+            provider=provider,
+            limiter=limiter,
+            hedge=get_hedge_policy() if settings.AI_HEDGING_ENABLED else None,
+            max_retries=settings.AI_RATE_LIMIT_MAX_RETRIES,
+        )
+
+    @classmethod
+    def _normalize_config(cls, value: Any) -> Hashable:
+        """Turn a config value into a stable, hashable cache key component."""
+        if isinstance(value, dict):
+            return tuple(
+                sorted((str(k), cls._normalize_config(v)) for k, v in value.items())
+            )
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._normalize_config(v) for v in value)
+        if isinstance(value, (set, frozenset)):
+            return frozenset(cls._normalize_config(v) for v in value)
+        try:
+            hash(value)
+        except TypeError:
+            return repr(value)
+        return value
+
+    @staticmethod
+    async def _close_model(model: Any) -> None:
+        # Rate-limited models wrap the provider client
+        model = getattr(model, "__dict__", {}).get("inner", model)
+        # Only look at declared fields: unconfigured models (no model name)
+        # resolve unknown attributes lazily and would fail to build here.
+        fields = getattr(type(model), "model_fields", {})
+        for attr, supplied in (
+            ("root_async_client", "http_async_client"),
+            ("root_client", "http_client"),
+        ):
+            if attr not in fields:
+                continue
+            if getattr(model, supplied, None) is not None:
+                # Shared pools are owned and closed by the HTTP provider
+                continue
+            close = getattr(getattr(model, attr), "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Failed to close {attr} of {type(model).__name__}: {e}")
@@ -0,0 +1,250 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.providers.ai.hedging import HedgePolicy
+from src.providers.ai.model_stats import get_model_stats
+from src.providers.ai.rate_limiter import AdaptiveRateLimiter
+
+logger = get_logger(__name__)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Whether a provider exception is a rate-limit (HTTP 429) response."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "ResourceExhausted")
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read the Retry-After hint from a provider exception, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ManagedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that routes every provider call through the model's
+    adaptive limiter.
+
+    The wrapped model does the actual work; this layer waits for a limiter
+    slot and token budget, retries rate-limit responses after the limiter's
+    backoff and feeds the outcome back so the limits adapt. Every attempt is
+    also recorded in the model's live stats window. With a hedge policy,
+    non-streaming calls that outlive the model's live p95, measured from
+    the moment they hold a limiter slot, get a second identical request and
+    the first answer wins; no hedge is sent while callers queue for the
+    limiter, as it would only wait behind them. Tool binding is
+    delegated to the wrapped model and re-bound on the wrapper, so agents
+    keep seeing a regular chat model.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    model_name: str
+    provider: str
+    limiter: Optional[AdaptiveRateLimiter] = None
+    hedge: Optional[HedgePolicy] = None
+    max_retries: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return f"managed-{self.inner._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "provider": self.provider}
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any):
+        # Report the wrapped provider and model to tracing and callbacks
+        return self.inner._get_ls_params(stop=stop, **kwargs)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Any:
+        bound = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**getattr(bound, "kwargs", {}))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Sync calls bypass the limiter, which only coordinates async callers
+        return self.inner._generate(messages, stop, run_manager, **kwargs)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self.inner._stream(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        attempt = 0
+        while True:
+            try:
+                if self.hedge is not None:
+                    started = asyncio.Event()
+                    return await self.hedge.run(
+                        self.model_name,
+                        lambda: self._agenerate_once(
+                            messages, stop, run_manager, started=started, **kwargs
+                        ),
+                        started=started,
+                        can_hedge=self._limiter_idle,
+                    )
+                return await self._agenerate_once(messages, stop, run_manager, **kwargs)
+            except Exception as e:
+                if not await self._backoff_if_rate_limited(e, attempt):
+                    raise
+                attempt += 1
+
+    async def _agenerate_once(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        started: Optional[asyncio.Event] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimate = self._estimate_tokens(messages)
+        await self._acquire(estimate)
+        if started is not None:
+            started.set()
+        used = None
+        start = time.perf_counter()
+        try:
+            result = await self.inner._agenerate(messages, stop, run_manager, **kwargs)
+            used = self._tokens_used(result.generations[0].message)
+        except Exception:
+            self._record(start, success=False)
+            raise
+        finally:
+            self._release(estimate, used)
+        self._record(start)
+        self._on_success()
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        attempt = 0
+        while True:
+            estimate = self._estimate_tokens(messages)
+            await self._acquire(estimate)
+            used = None
+            emitted = False
+            start = time.perf_counter()
+            try:
+                async for chunk in self.inner._astream(
+                    messages, stop, run_manager, **kwargs
+                ):
+                    emitted = True
+                    used = self._tokens_used(chunk.message, used)
+                    yield chunk
+            except Exception as e:
+                self._record(start, success=False)
+                # Once tokens reached the caller the stream cannot be replayed
+                if emitted or not await self._backoff_if_rate_limited(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            finally:
+                self._release(estimate, used)
+            self._record(start)
+            self._on_success()
+            return
+
+    async def _acquire(self, estimate: int) -> None:
+        if self.limiter is not None:
+            await self.limiter.acquire(estimate)
+
+    def _limiter_idle(self) -> bool:
+        return self.limiter is None or self.limiter.queued == 0
+
+    def _release(self, estimate: int, used: Optional[int]) -> None:
+        if self.limiter is not None:
+            self.limiter.release(estimate, used)
+
+    def _record(self, start: float, success: bool = True) -> None:
+        get_model_stats(self.model_name).record(time.perf_counter() - start, success)
+
+    def _on_success(self) -> None:
+        if self.limiter is not None:
+            self.limiter.on_success()
+
+    async def _backoff_if_rate_limited(self, exc: Exception, attempt: int) -> bool:
+        if not is_rate_limit_error(exc):
+            return False
+        retry_after = retry_after_seconds(exc)
+        if self.limiter is not None:
+            # The limiter holds back every caller, this one included, until
+            # the backoff has passed
+            delay = self.limiter.on_rate_limited(retry_after)
+        else:
+            delay = retry_after or settings.AI_RATE_LIMIT_BASE_BACKOFF
+        if attempt >= self.max_retries:
+            return False
+        logger.info(
+            f"Retrying {self.model_name} after rate limit "
+            f"(attempt {attempt + 1}/{self.max_retries}) in {delay:.2f}s"
+        )
+        if self.limiter is None:
+            await asyncio.sleep(delay)
+        return True
+
+    def _estimate_tokens(self, messages: List[BaseMessage]) -> int:
+        if self.limiter is None or self.limiter.tokens_per_minute is None:
+            return 0
+        return (
+            count_tokens_approximately(messages)
+            + settings.AI_COMPLETION_TOKENS_ESTIMATE
+        )
+
+    @staticmethod
+    def _tokens_used(message: BaseMessage, previous: Optional[int] = None):
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return previous
+        return (previous or 0) + usage.get("total_tokens", 0)
@@ -0,0 +1,87 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from src.config.settings import settings
+
+
+class ModelStats:
+    """
+    Rolling window of recent call outcomes for one model.
+
+    Prometheus histograms are cumulative and bucketed, which is fine for
+    dashboards but too coarse for in-process decisions. This keeps the last
+    `window_size` calls so percentiles and error rates track current
+    behaviour. With `max_age`, calls older than that many seconds drop out
+    too, so a model that stops receiving traffic (because it was judged
+    degraded) is judged afresh once its bad samples have aged out.
+    """
+
+    def __init__(
+        self,
+        window_size: int,
+        max_age: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._samples: Deque[Tuple[float, float, bool]] = deque(maxlen=window_size)
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, success: bool = True) -> None:
+        with self._lock:
+            self._samples.append((self._clock(), duration, success))
+
+    @property
+    def sample_count(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (0-100) of successful calls, None without data."""
+        with self._lock:
+            self._expire()
+            durations = sorted(d for _, d, ok in self._samples if ok)
+        if not durations:
+            return None
+        index = max(0, math.ceil(q / 100.0 * len(durations)) - 1)
+        return durations[index]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            self._expire()
+            if not self._samples:
+                return 0.0
+            failures = sum(1 for _, _, ok in self._samples if not ok)
+            return failures / len(self._samples)
+
+    def _expire(self) -> None:
+        if self.max_age is None:
+            return
+        cutoff = self._clock() - self.max_age
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+
+_stats: Dict[str, ModelStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_model_stats(model: str) -> ModelStats:
+    """Return the process-wide stats window for a model."""
+    with _stats_lock:
+        stats = _stats.get(model)
+        if stats is None:
+            stats = ModelStats(
+                settings.AI_STATS_WINDOW_SIZE, settings.AI_STATS_MAX_AGE_SECONDS
+            )
+            _stats[model] = stats
+        return stats
+
+
+def reset_model_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,240 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import (
+    ai_limiter_concurrency_limit,
+    ai_limiter_in_flight,
+    ai_limiter_queue_wait_seconds,
+    ai_limiter_tokens_per_minute_limit,
+    ai_rate_limited_total,
+)
+
+logger = get_logger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """
+    Concurrency cap plus tokens-per-minute budget for a single model.
+
+    Both limits adapt AIMD-style: every successful call grows them additively
+    (the concurrency limit by roughly one slot per window of calls), every
+    rate-limit response multiplies them down and pauses new calls until the
+    provider's Retry-After has passed. Neither limit ever exceeds the
+    configured maximum.
+
+    Waiters are plain futures created on the caller's loop, so one limiter
+    can be shared by every event loop that talks to the model.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int,
+        tokens_per_minute: Optional[int] = None,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        tokens_increase_ratio: float = 0.01,
+    ):
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_tokens_per_minute = tokens_per_minute or None
+        self.decrease_factor = decrease_factor
+        self.tokens_increase_ratio = tokens_increase_ratio
+
+        self.concurrency_limit = float(self.max_concurrency)
+        self.tokens_per_minute = (
+            float(self.max_tokens_per_minute) if self.max_tokens_per_minute else None
+        )
+        self.in_flight = 0
+
+        self._tokens = self.tokens_per_minute or 0.0
+        self._tokens_updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._lock = threading.Lock()
+        self._export_limits()
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for a concurrency slot and token budget; return the time waited."""
+        start = time.monotonic()
+        await self._acquire_slot()
+        try:
+            await self._wait_until_allowed(tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+        waited = time.monotonic() - start
+        ai_limiter_queue_wait_seconds.labels(model=self.model).observe(waited)
+        return waited
+
+    def release(self, estimated_tokens: int = 0, used_tokens: Optional[int] = None):
+        """Free the slot and settle the token estimate against actual usage."""
+        if used_tokens is not None and self.tokens_per_minute is not None:
+            with self._lock:
+                self._refill()
+                self._tokens -= used_tokens - estimated_tokens
+        self._release_slot()
+
+    def on_success(self) -> None:
+        """Additive increase after a call that was not rate limited."""
+        with self._lock:
+            self.concurrency_limit = min(
+                float(self.max_concurrency),
+                self.concurrency_limit + 1.0 / self.concurrency_limit,
+            )
+            if self.tokens_per_minute is not None:
+                self.tokens_per_minute = min(
+                    float(self.max_tokens_per_minute),
+                    self.tokens_per_minute
+                    + self.max_tokens_per_minute * self.tokens_increase_ratio,
+                )
+        self._export_limits()
+        self._wake_waiters()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """Multiplicative decrease after a 429; return the backoff to apply."""
+        with self._lock:
+            self.concurrency_limit = max(
+                float(self.min_concurrency),
+                self.concurrency_limit * self.decrease_factor,
+            )
+            if self.tokens_per_minute is not None:
+                self.tokens_per_minute = max(
+                    1.0, self.tokens_per_minute * self.decrease_factor
+                )
+                self._tokens = min(self._tokens, 0.0)
+            backoff = self._backoff(retry_after)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + backoff)
+        ai_rate_limited_total.labels(model=self.model).inc()
+        self._export_limits()
+        logger.warning(
+            f"Rate limited by provider for model {self.model}: "
+            f"concurrency limit now {int(self.concurrency_limit)}, "
+            f"backing off {backoff:.2f}s"
+        )
+        return backoff
+
+    @property
+    def effective_concurrency(self) -> int:
+        return max(self.min_concurrency, int(self.concurrency_limit))
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for a concurrency slot."""
+        return len(self._waiters)
+
+    async def _acquire_slot(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self.in_flight < self.effective_concurrency:
+                self.in_flight += 1
+                ai_limiter_in_flight.labels(model=self.model).set(self.in_flight)
+                return
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            if not queued and not waiter.cancelled():
+                # The slot was handed over just before cancellation: give it back
+                self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            ai_limiter_in_flight.labels(model=self.model).set(self.in_flight)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        with self._lock:
+            while self._waiters and self.in_flight < self.effective_concurrency:
+                waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue
+                self.in_flight += 1
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+            ai_limiter_in_flight.labels(model=self.model).set(self.in_flight)
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # Cancelled while the wake-up was in transit
+            self._release_slot()
+        else:
+            waiter.set_result(None)
+
+    async def _wait_until_allowed(self, tokens: int) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._blocked_until - now
+                if delay <= 0 and self.tokens_per_minute is not None and tokens:
+                    self._refill()
+                    # A request larger than the whole budget waits for a full bucket
+                    needed = min(float(tokens), self.tokens_per_minute)
+                    if self._tokens >= needed:
+                        self._tokens -= tokens
+                        return
+                    delay = (needed - self._tokens) / (self.tokens_per_minute / 60.0)
+                elif delay <= 0:
+                    return
+            await asyncio.sleep(delay)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._tokens_updated
+        self._tokens_updated = now
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+    @staticmethod
+    def _backoff(retry_after: Optional[float]) -> float:
+        if retry_after is not None and retry_after > 0:
+            return min(retry_after, settings.AI_RATE_LIMIT_MAX_BACKOFF)
+        base = settings.AI_RATE_LIMIT_BASE_BACKOFF
+        return min(base + random.uniform(0, base), settings.AI_RATE_LIMIT_MAX_BACKOFF)
+
+    def _export_limits(self) -> None:
+        ai_limiter_concurrency_limit.labels(model=self.model).set(
+            self.effective_concurrency
+        )
+        if self.tokens_per_minute is not None:
+            ai_limiter_tokens_per_minute_limit.labels(model=self.model).set(
+                self.tokens_per_minute
+            )
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    model: str, max_concurrency: int, tokens_per_minute: Optional[int] = None
+) -> AdaptiveRateLimiter:
+    """Return the limiter shared by every client of a model, creating it once."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                model, max_concurrency, tokens_per_minute=tokens_per_minute
+            )
+            _limiters[model] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
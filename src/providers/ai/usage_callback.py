@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from src.api.middlewares.observability import AIMetricsMiddleware
+from src.config.logs_config import get_logger
+from src.providers.ai.usage_tracker import UsageTracker, current_usage_tracker
+
+logger = get_logger(__name__)
+
+
+class UsageCallbackHandler(AsyncCallbackHandler):
+    """
+    Records every chat model call of an agent run.
+
+    Each call's latency and its prompt, completion and cached-prompt tokens
+    are recorded through AIMetricsMiddleware and added to the usage tracker:
+    the one given explicitly, otherwise the tracker of the current request.
+    """
+
+    def __init__(self, tracker: Optional[UsageTracker] = None):
+        self.tracker = tracker
+        self._calls: Dict[UUID, Tuple[float, str, str]] = {}
+
+    async def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        invocation_params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        params = invocation_params or {}
+        model = (
+            metadata.get("ls_model_name")
+            or params.get("model_name")
+            or params.get("model")
+            or "unknown"
+        )
+        provider = metadata.get("ls_provider") or "unknown"
+        self._calls[run_id] = (time.perf_counter(), model, provider)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        call = self._calls.pop(run_id, None)
+        if call is None:
+            return
+        started, model, provider = call
+        duration = time.perf_counter() - started
+        prompt, completion, cached = self._token_counts(response)
+
+        AIMetricsMiddleware.record_request(
+            model=model,
+            provider=provider,
+            duration=duration,
+            tokens_prompt=prompt,
+            tokens_completion=completion,
+            tokens_cached_prompt=cached,
+        )
+        tracker = self.tracker or current_usage_tracker()
+        if tracker is not None:
+            tracker.add(model, prompt, completion, cached, duration)
+
+    async def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        call = self._calls.pop(run_id, None)
+        if call is None:
+            return
+        AIMetricsMiddleware.record_error(model=call[1], error_type=type(error).__name__)
+
+    @staticmethod
+    def _token_counts(response: LLMResult) -> Tuple[int, int, int]:
+        """Read (prompt, completion, cached prompt) tokens from a model result."""
+        prompt = completion = cached = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(
+                    getattr(generation, "message", None), "usage_metadata", None
+                )
+                if not usage:
+                    continue
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                details = usage.get("input_token_details") or {}
+                cached += details.get("cache_read", 0) or 0
+        if prompt or completion:
+            return prompt, completion, cached
+
+        # Providers without usage_metadata report OpenAI-style llm_output
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        details = token_usage.get("prompt_tokens_details") or {}
+        return (
+            token_usage.get("prompt_tokens", 0) or 0,
+            token_usage.get("completion_tokens", 0) or 0,
+            details.get("cached_tokens", 0) or 0,
+        )
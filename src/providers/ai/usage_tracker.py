@@ -0,0 +1,93 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from src.models.token_usage import TokenCounts, TokenUsage
+
+
+class UsageTracker:
+    """Accumulates token usage across the model calls of one request."""
+
+    def __init__(self) -> None:
+        self._by_model: Dict[str, TokenCounts] = {}
+        self._cached_responses = 0
+        self._shared_runs = 0
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_prompt_tokens: int = 0,
+        duration: float = 0.0,
+    ) -> None:
+        with self._lock:
+            counts = self._by_model.setdefault(model, TokenCounts())
+            counts.prompt_tokens += prompt_tokens
+            counts.completion_tokens += completion_tokens
+            counts.cached_prompt_tokens += cached_prompt_tokens
+            counts.total_tokens += prompt_tokens + completion_tokens
+            counts.llm_calls += 1
+            counts.llm_duration_seconds += duration
+
+    def add_run(self, usage: TokenUsage, shared: bool = False) -> None:
+        """Add the usage of an agent run tracked separately, e.g. a shared one."""
+        with self._lock:
+            for model, run_counts in usage.by_model.items():
+                counts = self._by_model.setdefault(model, TokenCounts())
+                for field in TokenCounts.model_fields:
+                    setattr(
+                        counts,
+                        field,
+                        getattr(counts, field) + getattr(run_counts, field),
+                    )
+            if shared:
+                self._shared_runs += 1
+
+    def add_cached_response(self) -> None:
+        with self._lock:
+            self._cached_responses += 1
+
+    def summary(self) -> TokenUsage:
+        with self._lock:
+            by_model = {m: c.model_copy() for m, c in self._by_model.items()}
+            usage = TokenUsage(
+                by_model=by_model,
+                cached_responses=self._cached_responses,
+                shared_runs=self._shared_runs,
+            )
+        for counts in by_model.values():
+            usage.prompt_tokens += counts.prompt_tokens
+            usage.completion_tokens += counts.completion_tokens
+            usage.cached_prompt_tokens += counts.cached_prompt_tokens
+            usage.total_tokens += counts.total_tokens
+            usage.llm_calls += counts.llm_calls
+            usage.llm_duration_seconds += counts.llm_duration_seconds
+        return usage
+
+
+_current_tracker: ContextVar[Optional[UsageTracker]] = ContextVar(
+    "usage_tracker", default=None
+)
+
+
+def current_usage_tracker() -> Optional[UsageTracker]:
+    return _current_tracker.get()
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageTracker]:
+    """
+    Collect the token usage of every model call made inside the block.
+
+    Tasks started inside the block inherit the tracker, so concurrent agent
+    runs of one request (batches) add up into the same totals.
+    """
+    tracker = UsageTracker()
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+
+logger = get_logger(__name__)
+
+_redis_client: Optional[Redis] = None
+
+
+def get_redis_client() -> Redis:
+    """
+    Get the process-wide async Redis client.
+
+    The client is created lazily and connects on first use, so importing
+    this module never opens a connection.
+    """
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD or None,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            # Keep retries short: callers (caches, queues) degrade on failure
+            # rather than stall the request behind a long backoff.
+            retry=Retry(ExponentialBackoff(cap=0.5), settings.REDIS_RETRIES),
+        )
+        logger.info(
+            f"Redis client configured: {settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
+        )
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the process-wide Redis client and its connection pool."""
+    global _redis_client
+
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+        logger.info("Redis client closed")
@@ -0,0 +1,412 @@
+"""
+Semantic response cache: answers paraphrased queries with earlier responses.
+
+Queries are embedded (see Embedder) and compared with the cached query
+embeddings by cosine similarity; the closest entry at or above the threshold
+answers the query. Embeddings are unit vectors in one preallocated NumPy
+matrix, so a lookup is a single matrix-vector product over the whole cache.
+Entries are partitioned by scope (e.g. prompt and model config), so an
+answer is only reused under the configuration that produced it.
+
+When the cache is full, the least recently used (lru) or least frequently
+used (lfu) entry is replaced. With a path, embeddings live in a memory-mapped
+`.npy` file and the entries in a JSON file next to it, written on close, so
+the cache survives restarts.
+
+Hits and misses are recorded in cache_hits_total / cache_misses_total, the
+best similarity of each lookup in semantic_cache_similarity. When the
+embedder fails (e.g. an embeddings API outage), a lookup is a miss and a
+store is skipped, so callers fall back to running the agent.
+
+Usage:
+    cache = SemanticCache(name="agent_semantic", embedder=HashingEmbedder())
+
+    response = await cache.get(query, scope=model_key)
+    if response is None:
+        response = await run_agent(query)
+        await cache.set(query, response, scope=model_key)
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Protocol, Tuple
+
+import numpy as np
+
+from src.api.middlewares.observability import CacheMetricsMiddleware
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import (
+    semantic_cache_entries,
+    semantic_cache_evictions_total,
+    semantic_cache_similarity,
+)
+from src.providers.cache.memory_cache import LRUCache
+from src.providers.http.http_client import get_async_http_client
+
+logger = get_logger(__name__)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class Embedder(Protocol):
+    """Turns text into a fixed-size embedding vector."""
+
+    dimensions: int
+
+    async def embed(self, text: str) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder, for tests and deployments without an
+    embedding model.
+
+    Words and character trigrams are hashed into a fixed number of signed
+    buckets, so texts that share most of their words score close to 1.
+    It catches rephrasings that keep the wording (case, punctuation, word
+    order, small edits), not synonyms. It equally matches near misses that
+    differ in one meaningful word ("ascending" / "descending"), so the API
+    does not use it in production (see Settings.semantic_cache_enabled).
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    async def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in self._features(text):
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value >> 63 else -1.0
+            vector[value % self.dimensions] += sign * weight
+        return vector
+
+    @staticmethod
+    def _features(text: str) -> List[Tuple[str, float]]:
+        features = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            features.append((f"w:{word}", 1.0))
+            padded = f" {word} "
+            features.extend(
+                (f"c:{padded[i : i + 3]}", 0.5) for i in range(len(padded) - 2)
+            )
+        return features
+
+
+class LangChainEmbedder:
+    """Adapts a LangChain Embeddings model (e.g. OpenAIEmbeddings)."""
+
+    def __init__(self, embeddings: Any, dimensions: int):
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+
+    async def embed(self, text: str) -> np.ndarray:
+        return np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+
+
+def build_embedder() -> Embedder:
+    """The embedder selected by SEMANTIC_CACHE_EMBEDDER."""
+    if settings.SEMANTIC_CACHE_EMBEDDER == "openai":
+        # Imported here so that importing this module stays cheap
+        from langchain_openai import OpenAIEmbeddings
+
+        config: Dict[str, Any] = {}
+        if settings.HTTP_SHARED_POOL_ENABLED:
+            # Reuse the pooled connections of the chat models
+            config["http_async_client"] = get_async_http_client("llm")
+        embeddings = OpenAIEmbeddings(
+            model=settings.SEMANTIC_CACHE_EMBEDDING_MODEL,
+            dimensions=settings.SEMANTIC_CACHE_DIMENSIONS,
+            **config,
+        )
+        return LangChainEmbedder(embeddings, settings.SEMANTIC_CACHE_DIMENSIONS)
+    return HashingEmbedder(settings.SEMANTIC_CACHE_DIMENSIONS)
+
+
+class SemanticCache:
+    """
+    Similarity-matched cache of responses by query embedding.
+
+    Not thread-safe; intended to be used from the event loop only. Values
+    must be JSON-serializable when the cache is persisted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        embedder: Embedder,
+        threshold: float = 0.92,
+        max_size: int = 10_000,
+        eviction: Literal["lru", "lfu"] = "lru",
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+    ):
+        self.name = name
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        self.eviction = eviction
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.dimensions = embedder.dimensions
+
+        self._vectors = self._open_vectors()
+        self._valid = np.zeros(max_size, dtype=bool)
+        self._scopes = np.full(max_size, -1, dtype=np.int32)
+        self._created = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._uses = np.zeros(max_size, dtype=np.int64)
+        self._values: List[Any] = [None] * max_size
+        self._scope_ids: Dict[str, int] = {}
+        # Slots at or above this index have never been used
+        self._high = 0
+        self._hits = 0
+        self._misses = 0
+        # Recent query embeddings, so get() followed by set() embeds once
+        self._embeddings = LRUCache(max_size=1024)
+
+        if self.path is not None:
+            self._load_entries()
+        self._update_size()
+
+    async def get(self, query: str, scope: str = "") -> Optional[Any]:
+        """Return the response of the most similar cached query, if close enough."""
+        vector = await self._embed(query)
+        slot = None if vector is None else self._search(vector, scope, record=True)
+        if slot is None:
+            self._misses += 1
+            CacheMetricsMiddleware.record_miss(self.name)
+            return None
+
+        self._last_used[slot] = time.time()
+        self._uses[slot] += 1
+        self._hits += 1
+        CacheMetricsMiddleware.record_hit(self.name)
+        return self._values[slot]
+
+    async def set(self, query: str, value: Any, scope: str = "") -> None:
+        """Store a response; a near-identical cached query is replaced in place."""
+        vector = await self._embed(query)
+        if vector is None:
+            return
+        slot = self._search(vector, scope)
+        if slot is None:
+            slot = self._free_slot()
+
+        now = time.time()
+        self._vectors[slot] = vector
+        self._valid[slot] = True
+        self._scopes[slot] = self._scope_id(scope)
+        self._created[slot] = now
+        self._last_used[slot] = now
+        self._uses[slot] = 0
+        self._values[slot] = value
+        self._update_size()
+
+    def clear(self) -> None:
+        self._valid[:] = False
+        self._values = [None] * self.max_size
+        self._high = 0
+        self._update_size()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+        }
+
+    def flush(self) -> None:
+        """Write the entries to disk; a no-op for in-memory caches."""
+        if self.path is None:
+            return
+        self._vectors.flush()
+        scope_names = {sid: scope for scope, sid in self._scope_ids.items()}
+        entries = [
+            {
+                "slot": int(slot),
+                "scope": scope_names[int(self._scopes[slot])],
+                "value": self._values[slot],
+                "created": float(self._created[slot]),
+                "last_used": float(self._last_used[slot]),
+                "uses": int(self._uses[slot]),
+            }
+            for slot in np.flatnonzero(self._valid)
+        ]
+        meta_path = self._meta_path()
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dimensions": self.dimensions, "entries": entries}, f)
+        os.replace(tmp_path, meta_path)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._valid))
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        text = " ".join(query.split())
+        vector = self._embeddings.get(text)
+        if vector is None:
+            try:
+                embedding = await self.embedder.embed(text)
+            except Exception as e:
+                logger.warning(
+                    f"Embedder unavailable for semantic cache '{self.name}', "
+                    f"skipping it: {str(e)}"
+                )
+                return None
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+            self._embeddings.set(text, vector)
+        return vector
+
+    def _search(
+        self, vector: np.ndarray, scope: str, record: bool = False
+    ) -> Optional[int]:
+        """Slot of the most similar live entry in scope, if above the threshold."""
+        n = self._high
+        sid = self._scope_ids.get(scope)
+        if n == 0 or sid is None:
+            return None
+
+        if self.ttl:
+            expired = self._valid[:n] & (self._created[:n] + self.ttl <= time.time())
+            if expired.any():
+                self._valid[:n] &= ~expired
+                self._update_size()
+
+        candidates = self._valid[:n] & (self._scopes[:n] == sid)
+        if not candidates.any():
+            return None
+        scores = np.where(candidates, self._vectors[:n] @ vector, -np.inf)
+        slot = int(np.argmax(scores))
+        if record:
+            semantic_cache_similarity.labels(cache_name=self.name).observe(
+                max(float(scores[slot]), 0.0)
+            )
+        return slot if scores[slot] >= self.threshold else None
+
+    def _free_slot(self) -> int:
+        if self._high < self.max_size:
+            self._high += 1
+            return self._high - 1
+
+        free = np.flatnonzero(~self._valid)
+        if free.size:
+            return int(free[0])
+
+        if self.eviction == "lfu":
+            # Least used first, least recently used among equals
+            slot = int(np.lexsort((self._last_used, self._uses))[0])
+        else:
+            slot = int(np.argmin(self._last_used))
+        semantic_cache_evictions_total.labels(cache_name=self.name).inc()
+        return slot
+
+    def _scope_id(self, scope: str) -> int:
+        sid = self._scope_ids.get(scope)
+        if sid is None:
+            sid = len(self._scope_ids)
+            self._scope_ids[scope] = sid
+        return sid
+
+    def _update_size(self) -> None:
+        semantic_cache_entries.labels(cache_name=self.name).set(len(self))
+
+    def _meta_path(self) -> Path:
+        return self.path.with_suffix(".json")
+
+    def _open_vectors(self) -> np.ndarray:
+        shape = (self.max_size, self.dimensions)
+        if self.path is None:
+            return np.zeros(shape, dtype=np.float32)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            try:
+                vectors = np.lib.format.open_memmap(self.path, mode="r+")
+                if vectors.shape == shape and vectors.dtype == np.float32:
+                    return vectors
+                logger.warning(
+                    f"Semantic cache '{self.name}' file {self.path} has shape "
+                    f"{vectors.shape}, expected {shape}; starting empty"
+                )
+                del vectors
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    f"Could not open semantic cache file {self.path}, "
+                    f"starting empty: {str(e)}"
+                )
+        self._meta_path().unlink(missing_ok=True)
+        return np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=np.float32, shape=shape
+        )
+
+    def _load_entries(self) -> None:
+        meta_path = self._meta_path()
+        if not meta_path.exists():
+            return
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {meta_path}, starting empty: {str(e)}")
+            return
+        if meta.get("dimensions") != self.dimensions:
+            return
+
+        for entry in meta.get("entries", []):
+            slot = entry["slot"]
+            if slot >= self.max_size:
+                continue
+            self._valid[slot] = True
+            self._scopes[slot] = self._scope_id(entry["scope"])
+            self._created[slot] = entry["created"]
+            self._last_used[slot] = entry["last_used"]
+            self._uses[slot] = entry["uses"]
+            self._values[slot] = entry["value"]
+            self._high = max(self._high, slot + 1)
+        logger.info(
+            f"Semantic cache '{self.name}' loaded {len(self)} entries from {self.path}"
+        )
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """The process-wide semantic response cache, configured from settings."""
+    global _semantic_cache
+
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            name="agent_semantic",
+            embedder=build_embedder(),
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            max_size=settings.SEMANTIC_CACHE_MAX_SIZE,
+            eviction=settings.SEMANTIC_CACHE_EVICTION,
+            ttl=settings.CACHE_TTL,
+            path=settings.SEMANTIC_CACHE_PATH or None,
+        )
+    return _semantic_cache
+
+
+def close_semantic_cache() -> None:
+    """Persist the semantic cache (when it has a path) and forget it."""
+    global _semantic_cache
+
+    if _semantic_cache is not None:
+        _semantic_cache.close()
+        _semantic_cache = None
+        logger.info("Semantic cache closed")
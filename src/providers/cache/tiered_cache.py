@@ -0,0 +1,110 @@
+"""
+Two-tier cache: an in-process LRU (L1) in front of Redis (L2).
+
+Values must be JSON-serializable. Redis failures never fail the caller: the
+cache degrades to L1-only and retries Redis after a short cool-down.
+
+Usage:
+    cache = TieredCache(name="agent_response", redis=get_redis_client())
+
+    value = await cache.get(key)
+    if value is None:
+        value = await compute()
+        await cache.set(key, value)
+"""
+
+import json
+from time import monotonic
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+from src.api.middlewares.observability import CacheMetricsMiddleware
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import cache_operation_duration_seconds, timed_metric
+from src.providers.cache.memory_cache import LRUCache
+
+logger = get_logger(__name__)
+
+
+class TieredCache:
+    def __init__(
+        self,
+        name: str,
+        redis: Optional[Redis] = None,
+        ttl: Optional[int] = None,
+        max_size: Optional[int] = None,
+        redis_retry_interval: float = 30.0,
+    ):
+        self.name = name
+        self.redis = redis
+        self.ttl = settings.CACHE_TTL if ttl is None else ttl
+        self.l1 = LRUCache(
+            max_size=max_size or settings.CACHE_L1_MAX_SIZE, ttl=self.ttl
+        )
+        self.redis_retry_interval = redis_retry_interval
+        self._redis_unavailable_until = 0.0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a key in L1, then Redis. Records a hit or miss."""
+        value = self.l1.get(key)
+        if value is not None:
+            CacheMetricsMiddleware.record_hit(self.name)
+            return value
+
+        raw = await self._redis_get(key)
+        if raw is not None:
+            value = json.loads(raw)
+            self.l1.set(key, value)
+            CacheMetricsMiddleware.record_hit(self.name)
+            return value
+
+        CacheMetricsMiddleware.record_miss(self.name)
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value in both tiers."""
+        ttl = self.ttl if ttl is None else ttl
+        self.l1.set(key, value, ttl=ttl)
+        await self._redis_set(key, json.dumps(value), ttl)
+
+    async def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        if self._redis_available():
+            try:
+                await self.redis.delete(self._redis_key(key))
+            except Exception as e:
+                self._mark_redis_unavailable(e)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    def _redis_available(self) -> bool:
+        return self.redis is not None and monotonic() >= self._redis_unavailable_until
+
+    def _mark_redis_unavailable(self, error: Exception) -> None:
+        self._redis_unavailable_until = monotonic() + self.redis_retry_interval
+        logger.warning(
+            f"Redis unavailable for cache '{self.name}', using L1 only for "
+            f"{self.redis_retry_interval:.0f}s: {str(error)}"
+        )
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        if not self._redis_available():
+            return None
+        try:
+            with timed_metric(cache_operation_duration_seconds, {"operation": "get"}):
+                return await self.redis.get(self._redis_key(key))
+        except Exception as e:
+            self._mark_redis_unavailable(e)
+            return None
+
+    async def _redis_set(self, key: str, raw: str, ttl: int) -> None:
+        if not self._redis_available():
+            return
+        try:
+            with timed_metric(cache_operation_duration_seconds, {"operation": "set"}):
+                await self.redis.set(self._redis_key(key), raw, ex=ttl or None)
+        except Exception as e:
+            self._mark_redis_unavailable(e)
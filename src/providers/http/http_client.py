@@ -0,0 +1,115 @@
+"""
+Process-wide outbound HTTP connection pools.
+
+One `httpx.AsyncClient` is kept per named purpose (e.g. "llm" for model
+providers, "tools" for agent tools) so that connections and TLS sessions are
+reused across requests instead of being re-established by every client.
+Pool limits, keep-alive, HTTP/2 and timeouts come from `Settings`.
+
+Usage:
+    from src.providers.http.http_client import get_async_http_client
+
+    client = get_async_http_client("tools")
+    response = await client.get("https://api.example.com/items")
+"""
+
+import importlib.util
+from typing import Dict
+
+import httpx
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import (
+    http_client_pool_connections,
+    http_client_pool_max_connections,
+    http_client_requests_in_flight,
+)
+
+logger = get_logger(__name__)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that exports pool utilization for a named client."""
+
+    def __init__(self, name: str, transport: httpx.AsyncHTTPTransport):
+        self.name = name
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        in_flight = http_client_requests_in_flight.labels(client=self.name)
+        in_flight.inc()
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            in_flight.dec()
+            self._record_pool_stats()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+        self._record_pool_stats()
+
+    def _record_pool_stats(self) -> None:
+        pool = getattr(self._transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return
+        idle = sum(1 for connection in connections if connection.is_idle())
+        http_client_pool_connections.labels(client=self.name, state="idle").set(idle)
+        http_client_pool_connections.labels(client=self.name, state="active").set(
+            len(connections) - idle
+        )
+
+
+def _http2_enabled() -> bool:
+    if not settings.HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_READ_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        pool=settings.HTTP_POOL_TIMEOUT,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=_http2_enabled())
+
+    http_client_pool_max_connections.labels(client=name).set(
+        settings.HTTP_MAX_CONNECTIONS
+    )
+    logger.info(
+        f"HTTP client pool '{name}' created: max_connections={settings.HTTP_MAX_CONNECTIONS}, "
+        f"keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}/{settings.HTTP_KEEPALIVE_EXPIRY}s"
+    )
+    return httpx.AsyncClient(
+        transport=_InstrumentedTransport(name, transport), timeout=timeout
+    )
+
+
+def get_async_http_client(name: str = "default") -> httpx.AsyncClient:
+    """Get the shared async HTTP client for a purpose, creating it on first use."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _build_client(name)
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared HTTP client; called on application shutdown."""
+    clients = list(_clients.items())
+    _clients.clear()
+    for name, client in clients:
+        await client.aclose()
+        logger.info(f"HTTP client pool '{name}' closed")
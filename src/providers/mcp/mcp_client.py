@@ -0,0 +1,430 @@
+"""
+Pooled client sessions to MCP (Model Context Protocol) tool servers.
+
+Each server configured in `Settings.MCP_SERVERS` keeps a small pool of live
+sessions for the life of the process, so agent runs reuse an initialized
+session instead of starting a server (stdio) or handshaking (HTTP) per call.
+The server's tool listing is cached as LangChain tools and re-listed when the
+server announces a change (`notifications/tools/list_changed`) or, as a
+fallback, every MCP_TOOLS_REFRESH_SECONDS. Requests are recorded per server
+and operation in `mcp_requests_total` / `mcp_request_duration_seconds`.
+
+Usage:
+    client = get_mcp_client()
+    if client is not None:
+        await client.start()
+        tools = client.get_tools()
+        ...
+        await client.close()
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.observability.metrics import (
+    mcp_request_duration_seconds,
+    mcp_requests_total,
+    mcp_sessions_open,
+)
+
+logger = get_logger(__name__)
+
+TOOLS_CHANGED_NOTIFICATION = "notifications/tools/list_changed"
+
+
+class _PooledSession:
+    __slots__ = ("session", "stop")
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.stop = asyncio.Event()
+
+
+class MCPServer:
+    """
+    One MCP tool server: a pool of live sessions and its cached tool listing.
+
+    Sessions are opened and closed by a holder task each, since the MCP
+    transports must be exited by the task that entered them. A session that
+    fails at the transport level, or whose transport shuts down while it is
+    pooled, is dropped and replaced in the background; errors reported by
+    the server (McpError) leave the session in the pool.
+
+    `call_tool` matches ClientSession.call_tool, so the LangChain tools built
+    by langchain-mcp-adapters use the pool instead of opening a session per
+    call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connection: Dict[str, Any],
+        pool_size: int = 2,
+        on_tools_changed: Optional[Callable[[str], Any]] = None,
+        max_backoff: float = 30.0,
+    ):
+        self.name = name
+        self.connection = dict(connection)
+        self.pool_size = max(1, pool_size)
+        self.on_tools_changed = on_tools_changed
+        self.max_backoff = max_backoff
+        self._idle: Optional[asyncio.Queue] = None
+        self._holders: set[asyncio.Task] = set()
+        self._sessions: set[_PooledSession] = set()
+        self._background: set[asyncio.Task] = set()
+        self._open_sessions = 0
+        self._tools: Optional[List[Any]] = None
+        self._tools_digest: Optional[str] = None
+        self._refresh_lock = asyncio.Lock()
+        self._closed = True
+
+    async def start(self) -> None:
+        """Open the session pool and load the tool listing."""
+        self._idle = asyncio.Queue()
+        self._closed = False
+        try:
+            sessions = await asyncio.gather(
+                *(self._open_session() for _ in range(self.pool_size)),
+                return_exceptions=True,
+            )
+            errors = [s for s in sessions if isinstance(s, BaseException)]
+            if len(errors) == len(sessions):
+                raise errors[0]
+            for session in sessions:
+                if not isinstance(session, BaseException):
+                    self._idle.put_nowait(session)
+            await self.refresh_tools()
+        except BaseException:
+            # Also reached when a startup timeout cancels the handshake: stop
+            # the holders now rather than wait on a server that never answered
+            await self.close(timeout=0)
+            raise
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Close every session, cancelling those that do not close in time."""
+        self._closed = True
+        self._idle = None
+        background = list(self._background)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        for pooled in list(self._sessions):
+            pooled.stop.set()
+        holders = list(self._holders)
+        if holders:
+            _, pending = await asyncio.wait(holders, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_tools(self) -> List[Any]:
+        """The server's tools as LangChain tools, from the cached listing."""
+        return list(self._tools or [])
+
+    async def refresh_tools(self) -> bool:
+        """Re-list the server's tools; returns whether the listing changed."""
+        async with self._refresh_lock:
+            listing = await self._list_tools()
+            digest = hashlib.sha256(
+                json.dumps(
+                    [tool.model_dump(mode="json") for tool in listing], sort_keys=True
+                ).encode()
+            ).hexdigest()
+            if digest == self._tools_digest:
+                return False
+
+            # Imported here so that importing this module stays cheap
+            from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+
+            changed = self._tools_digest is not None
+            self._tools = [
+                convert_mcp_tool_to_langchain_tool(
+                    self, tool, server_name=self.name, tool_name_prefix=True
+                )
+                for tool in listing
+            ]
+            self._tools_digest = digest
+            logger.info(
+                f"MCP server '{self.name}' tools: {[t.name for t in self._tools]}"
+            )
+        if changed and self.on_tools_changed is not None:
+            self.on_tools_changed(self.name)
+        return changed
+
+    async def call_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Call a tool on a pooled session (ClientSession.call_tool signature)."""
+        return await self._request(
+            "call_tool", lambda session: session.call_tool(name, arguments, **kwargs)
+        )
+
+    async def _list_tools(self) -> List[Any]:
+        async def list_all(session: Any) -> List[Any]:
+            tools, cursor = [], None
+            while True:
+                page = await session.list_tools(cursor=cursor)
+                tools.extend(page.tools or [])
+                cursor = page.nextCursor
+                if not cursor:
+                    return tools
+
+        return await self._request("list_tools", list_all)
+
+    async def _request(self, operation: str, fn: Callable[[Any], Any]) -> Any:
+        # Imported here so that importing this module stays cheap
+        from mcp.shared.exceptions import McpError
+        from mcp.types import CONNECTION_CLOSED
+
+        if self._idle is None:
+            raise RuntimeError(f"MCP server '{self.name}' is not started")
+
+        status = "success"
+        start = time.perf_counter()
+        pooled = await self._idle.get()
+        while pooled.stop.is_set():
+            # Its session ended while idle; a replacement is on its way
+            pooled = await self._idle.get()
+        healthy = True
+        try:
+            result = await fn(pooled.session)
+            if getattr(result, "isError", False):
+                status = "error"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status = "error"
+            if not isinstance(e, McpError) or e.error.code == CONNECTION_CLOSED:
+                healthy = False
+                logger.warning(
+                    f"MCP server '{self.name}' session failed during {operation}, "
+                    f"replacing it: {str(e)}"
+                )
+            raise
+        finally:
+            if not healthy:
+                self._retire(pooled)
+            elif self._idle is not None and not pooled.stop.is_set():
+                self._idle.put_nowait(pooled)
+            labels = {"server": self.name, "operation": operation}
+            mcp_requests_total.labels(**labels, status=status).inc()
+            mcp_request_duration_seconds.labels(**labels).observe(
+                time.perf_counter() - start
+            )
+
+    async def _open_session(self) -> _PooledSession:
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._hold_session(ready))
+        self._holders.add(task)
+        task.add_done_callback(self._holders.discard)
+        return await ready
+
+    async def _hold_session(self, ready: asyncio.Future) -> None:
+        # Imported here so that importing this module stays cheap
+        from langchain_mcp_adapters.sessions import create_session
+
+        connection = {
+            **self.connection,
+            "session_kwargs": {
+                **(self.connection.get("session_kwargs") or {}),
+                "message_handler": self._on_message,
+            },
+        }
+        pooled: Optional[_PooledSession] = None
+        try:
+            async with create_session(connection) as session:
+                await session.initialize()
+                pooled = _PooledSession(session)
+                self._sessions.add(pooled)
+                self._set_open_sessions(+1)
+                ready.set_result(pooled)
+                try:
+                    await pooled.stop.wait()
+                finally:
+                    self._sessions.discard(pooled)
+                    self._set_open_sessions(-1)
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP server '{self.name}' session closed: {str(e)}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+            elif pooled is not None:
+                # No-op when the pool stopped it; otherwise the transport
+                # ended on its own and the pool must not hand it out again
+                self._retire(pooled)
+
+    def _retire(self, pooled: _PooledSession) -> None:
+        """Stop a pooled session and open a replacement, once per session."""
+        if pooled.stop.is_set():
+            return
+        pooled.stop.set()
+        if not self._closed:
+            self._spawn(self._replace_session())
+
+    async def _replace_session(self) -> None:
+        backoff = 0.5
+        while not self._closed:
+            try:
+                pooled = await self._open_session()
+            except Exception as e:
+                logger.warning(
+                    f"Could not reopen MCP server '{self.name}' session, "
+                    f"retrying in {backoff:.1f}s: {str(e)}"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            if self._idle is None:
+                pooled.stop.set()
+            else:
+                self._idle.put_nowait(pooled)
+            return
+
+    async def _on_message(self, message: Any) -> None:
+        method = getattr(getattr(message, "root", None), "method", None)
+        if method == TOOLS_CHANGED_NOTIFICATION:
+            logger.info(f"MCP server '{self.name}' tools changed")
+            self._spawn(self.refresh_tools())
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _set_open_sessions(self, delta: int) -> None:
+        self._open_sessions += delta
+        mcp_sessions_open.labels(server=self.name).set(self._open_sessions)
+
+
+class MCPClient:
+    """
+    The MCP tool servers mounted by this process.
+
+    A server that cannot be started, or does not finish starting within
+    `startup_timeout` seconds, is logged and left out, so a missing or hung
+    tool server never keeps the API from starting. Listeners registered
+    with `add_listener` are called with the server name whenever a server's
+    tool listing changes.
+    """
+
+    def __init__(
+        self,
+        servers: Dict[str, Dict[str, Any]],
+        pool_size: int = 2,
+        refresh_interval: float = 300.0,
+        startup_timeout: float = 30.0,
+    ):
+        self.servers: Dict[str, MCPServer] = {
+            name: MCPServer(name, connection, pool_size, self._notify)
+            for name, connection in servers.items()
+        }
+        self.refresh_interval = refresh_interval
+        self.startup_timeout = startup_timeout
+        self._listeners: List[Callable[[str], Any]] = []
+        self._started: Dict[str, MCPServer] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(server.start(), self.startup_timeout)
+                for server in self.servers.values()
+            ),
+            return_exceptions=True,
+        )
+        for server, result in zip(self.servers.values(), results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.error(
+                    f"MCP server '{server.name}' did not start within "
+                    f"{self.startup_timeout:g}s"
+                )
+            elif isinstance(result, BaseException):
+                logger.error(
+                    f"MCP server '{server.name}' failed to start: {str(result)}"
+                )
+            else:
+                self._started[server.name] = server
+        if self.refresh_interval > 0 and self._started:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+        await asyncio.gather(
+            *(server.close() for server in self._started.values()),
+            return_exceptions=True,
+        )
+        self._started.clear()
+
+    def started_servers(self) -> List[str]:
+        return list(self._started)
+
+    def get_tools(self, server_names: Optional[List[str]] = None) -> List[Any]:
+        """Cached tools of the started servers (all of them by default)."""
+        names = self._started if server_names is None else server_names
+        return [
+            tool
+            for name in names
+            if name in self._started
+            for tool in self._started[name].get_tools()
+        ]
+
+    def add_listener(self, listener: Callable[[str], Any]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, server_name: str) -> None:
+        for listener in self._listeners:
+            try:
+                listener(server_name)
+            except Exception as e:
+                logger.error(f"MCP tools listener failed: {str(e)}")
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            for server in list(self._started.values()):
+                try:
+                    await server.refresh_tools()
+                except Exception as e:
+                    logger.warning(
+                        f"Could not refresh MCP server '{server.name}' tools: {str(e)}"
+                    )
+
+
+_mcp_client: Optional[MCPClient] = None
+
+
+def get_mcp_client() -> Optional[MCPClient]:
+    """The process-wide MCP client, or None when no servers are configured."""
+    global _mcp_client
+
+    if _mcp_client is None and settings.MCP_SERVERS:
+        _mcp_client = MCPClient(
+            settings.MCP_SERVERS,
+            pool_size=settings.MCP_SESSION_POOL_SIZE,
+            refresh_interval=settings.MCP_TOOLS_REFRESH_SECONDS,
+            startup_timeout=settings.MCP_STARTUP_TIMEOUT,
+        )
+    return _mcp_client
+
+
+async def close_mcp_client() -> None:
+    """Close every MCP server session and forget the client."""
+    global _mcp_client
+
+    if _mcp_client is not None:
+        await _mcp_client.close()
+        _mcp_client = None
+        logger.info("MCP client closed")
@@ -0,0 +1,299 @@
+"""
+Agent job queues: job records stored with a TTL plus a FIFO of job ids.
+
+Two backends share one interface:
+
+- RedisJobQueue: records under `<name>:job:<id>`, ids in the `<name>:queue`
+  list, so any node's workers can take any node's jobs. Taking a job moves
+  its id to `<name>:processing` (BLMOVE) and leases it in `<name>:leases`
+  until the worker acks it; ids whose lease runs out (the worker crashed or
+  lost Redis) are put back on the queue by `requeue_stale`.
+- InMemoryJobQueue: process-local, for tests and single-node runs.
+
+Usage:
+    queue = get_job_queue()
+
+    await queue.put(AgentJob(query="..."))  # submit
+    job = await queue.take(timeout=0.5)     # worker side
+    await queue.ack(job.id)                 # worker is done with it
+    job = await queue.get(job_id)           # poll
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Optional
+
+from redis.asyncio import Redis
+
+from src.config.logs_config import get_logger
+from src.config.settings import settings
+from src.models.agent_job import AgentJob
+from src.observability.metrics import agent_job_queue_depth
+from src.providers.cache.memory_cache import LRUCache
+from src.providers.cache.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+
+class JobQueue(ABC):
+    backend: str
+
+    @abstractmethod
+    async def put(self, job: AgentJob) -> None:
+        """Store a job and append it to the queue."""
+
+    @abstractmethod
+    async def take(self, timeout: float) -> Optional[AgentJob]:
+        """Pop the oldest queued job, waiting up to `timeout` seconds for one."""
+
+    @abstractmethod
+    async def ack(self, job_id: str) -> None:
+        """Drop a taken job's claim once the worker has stored its outcome."""
+
+    @abstractmethod
+    async def release(self, job: AgentJob) -> bool:
+        """
+        Store a taken job and put it back at the head of the queue.
+
+        Returns False if the job was no longer claimed (acked, or already
+        requeued by `requeue_stale`), in which case it is not queued again.
+        """
+
+    async def touch(self, job_id: str) -> None:
+        """Extend a taken job's lease while its worker is still running it."""
+
+    async def requeue_stale(self) -> int:
+        """Put back taken jobs whose lease ran out; returns how many."""
+        return 0
+
+    @abstractmethod
+    async def save(self, job: AgentJob) -> None:
+        """Store the job's current state, refreshing its TTL."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[AgentJob]:
+        """Load a job, None if unknown or expired."""
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+
+    def _set_depth(self, depth: int) -> None:
+        agent_job_queue_depth.labels(backend=self.backend).set(depth)
+
+
+# Moves a claimed id from the processing list back to the head of the queue,
+# unless another worker acked or requeued it first or, when ARGV[2] is set,
+# its lease was renewed past ARGV[2] (its worker is still alive).
+_REQUEUE_SCRIPT = """
+if ARGV[2] ~= '' then
+    local lease = redis.call('ZSCORE', KEYS[3], ARGV[1])
+    if lease and tonumber(lease) > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class RedisJobQueue(JobQueue):
+    backend = "redis"
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: Optional[str] = None,
+        ttl: Optional[int] = None,
+        lease_timeout: Optional[float] = None,
+    ):
+        self.redis = redis
+        self.name = name or settings.JOB_QUEUE_NAME
+        self.ttl = ttl or settings.JOB_RESULT_TTL
+        self.lease_timeout = lease_timeout or settings.JOB_LEASE_TIMEOUT
+        self._queue_key = f"{self.name}:queue"
+        self._processing_key = f"{self.name}:processing"
+        self._leases_key = f"{self.name}:leases"
+        self._requeue = redis.register_script(_REQUEUE_SCRIPT)
+
+    async def put(self, job: AgentJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+            pipe.lpush(self._queue_key, job.id)
+            _, depth = await pipe.execute()
+        self._set_depth(depth)
+
+    async def take(self, timeout: float) -> Optional[AgentJob]:
+        job_id = await self.redis.blmove(
+            self._queue_key, self._processing_key, timeout, "RIGHT", "LEFT"
+        )
+        if job_id is None:
+            return None
+        try:
+            await self.touch(job_id)
+            self._set_depth(await self.redis.llen(self._queue_key))
+            job = await self.get(job_id)
+        except asyncio.CancelledError:
+            # Stopped between the move and handing the job over: give it back
+            await self._requeue_id(job_id)
+            raise
+        if job is None:
+            logger.warning(f"Agent job {job_id} expired before a worker took it")
+        elif job.finished_at is not None:
+            # Requeued after its outcome was stored but before the ack
+            logger.debug(f"Agent job {job_id} already finished, dropping it")
+            job = None
+        if job is None:
+            await self.ack(job_id)
+        return job
+
+    async def ack(self, job_id: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self._processing_key, 1, job_id)
+            pipe.zrem(self._leases_key, job_id)
+            await pipe.execute()
+
+    async def release(self, job: AgentJob) -> bool:
+        await self.save(job)
+        return await self._requeue_id(job.id)
+
+    async def touch(self, job_id: str) -> None:
+        await self.redis.zadd(
+            self._leases_key, {job_id: time.time() + self.lease_timeout}
+        )
+
+    async def requeue_stale(self) -> int:
+        job_ids = await self.redis.lrange(self._processing_key, 0, -1)
+        if not job_ids:
+            return 0
+        now = time.time()
+        leases = await self.redis.zmscore(self._leases_key, job_ids)
+        requeued = 0
+        for job_id, lease in zip(job_ids, leases):
+            if lease is None:
+                # Moved by a take that never got to lease it (cancelled or
+                # crashed right after BLMOVE): give it one lease to show up
+                await self.redis.zadd(
+                    self._leases_key, {job_id: now + self.lease_timeout}, nx=True
+                )
+            elif lease <= now and await self._requeue_id(job_id, stale_before=now):
+                requeued += 1
+        if requeued:
+            self._set_depth(await self.redis.llen(self._queue_key))
+        return requeued
+
+    async def save(self, job: AgentJob) -> None:
+        await self.redis.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+
+    async def get(self, job_id: str) -> Optional[AgentJob]:
+        raw = await self.redis.get(self._job_key(job_id))
+        return AgentJob.model_validate_json(raw) if raw is not None else None
+
+    async def depth(self) -> int:
+        return await self.redis.llen(self._queue_key)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.name}:job:{job_id}"
+
+    async def _requeue_id(
+        self, job_id: str, stale_before: Optional[float] = None
+    ) -> bool:
+        keys = [self._processing_key, self._queue_key, self._leases_key]
+        args = [job_id, "" if stale_before is None else stale_before]
+        return bool(await self._requeue(keys=keys, args=args))
+
+
+class InMemoryJobQueue(JobQueue):
+    """Process-local queue; jobs are lost on restart. Event loop use only."""
+
+    backend = "memory"
+
+    def __init__(self, ttl: Optional[int] = None, max_jobs: Optional[int] = None):
+        self.jobs = LRUCache(
+            max_size=max_jobs or settings.JOB_MEMORY_MAX_JOBS,
+            ttl=ttl or settings.JOB_RESULT_TTL,
+        )
+        self._ids: Deque[str] = deque()
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def put(self, job: AgentJob) -> None:
+        await self.save(job)
+        self._enqueue(job.id, front=False)
+
+    async def take(self, timeout: float) -> Optional[AgentJob]:
+        if self._ids:
+            job_id = self._ids.popleft()
+            self._set_depth(len(self._ids))
+        else:
+            job_id = await self._wait_for_job(timeout)
+            if job_id is None:
+                return None
+        return await self.get(job_id)
+
+    async def ack(self, job_id: str) -> None:
+        # Taken jobs live in this process; there is no claim to drop
+        pass
+
+    async def release(self, job: AgentJob) -> bool:
+        await self.save(job)
+        self._enqueue(job.id, front=True)
+        return True
+
+    async def save(self, job: AgentJob) -> None:
+        self.jobs.set(job.id, job.model_copy(deep=True))
+
+    async def get(self, job_id: str) -> Optional[AgentJob]:
+        job = self.jobs.get(job_id)
+        return job.model_copy(deep=True) if job is not None else None
+
+    async def depth(self) -> int:
+        return len(self._ids)
+
+    def _enqueue(self, job_id: str, front: bool) -> None:
+        # Hand the job straight to an idle worker if one is waiting
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(job_id)
+                return
+        if front:
+            self._ids.appendleft(job_id)
+        else:
+            self._ids.append(job_id)
+        self._set_depth(len(self._ids))
+
+    async def _wait_for_job(self, timeout: float) -> Optional[str]:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # A job was handed over just as the wait timed out
+                return waiter.result()
+            return None
+        except asyncio.CancelledError:
+            if waiter.done():
+                # Handed a job while being cancelled: give it back
+                self._ids.appendleft(waiter.result())
+                self._set_depth(len(self._ids))
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue of the configured backend."""
+    if settings.JOB_QUEUE_BACKEND == "memory":
+        return InMemoryJobQueue()
+    return RedisJobQueue(get_redis_client())
@@ -0,0 +1,535 @@
+"""
+Load and latency benchmark for the agent API.
+
+Drives the app built by `create_app()` with an offline fake LLM and sweeps
+concurrency levels for `/agent/execute`, `/health` and `/metrics`. The
+target is either the app in-process over ASGI (no network, no server) or a
+real uvicorn server, started here from `create_benchmark_app` or already
+running at --url.
+
+Reported per endpoint and concurrency level: RPS, p50/p95/p99 latency, CPU
+time per request and, in-process, the peak memory allocated while serving
+one request (measured in a separate sequential pass, since tracemalloc
+slows everything down). In-process CPU includes the load generator; for a
+spawned uvicorn server it is the server process alone.
+
+Results are written as JSON and compared against a baseline (by default
+the committed `baseline.json`): a level whose RPS drops or whose p95 rises
+by more than --tolerance is reported as a regression.
+
+Usage:
+    python -m src.tests.performance.benchmark --target asgi
+    python -m src.tests.performance.benchmark --target uvicorn --concurrency 1,16,64
+    python -m src.tests.performance.benchmark --url http://localhost:3000 \\
+        --output results.json --fail-on-regression
+
+Fake LLM latency can be set with BENCH_FAKE_TTFT / BENCH_FAKE_TOKEN_DELAY
+(seconds); the database stand-in with --database-url (SQLite needs the
+aiosqlite driver from the dev dependency group).
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import httpx
+
+from src.config.settings import settings
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    unique_body: bool = False
+
+    def request_kwargs(self, i: int) -> Dict[str, Any]:
+        if not self.unique_body:
+            return {}
+        # A distinct query per request so the response cache never answers
+        return {"json": {"query": f"benchmark query {i}"}}
+
+
+ENDPOINTS = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint("agent_execute", "POST", "/v1/agent/execute", unique_body=True),
+        Endpoint("health", "GET", "/v1/health"),
+        Endpoint("metrics", "GET", "/v1/metrics"),
+    )
+}
+
+
+@dataclass
+class LevelResult:
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    cpu_ms_per_request: Optional[float]
+    alloc_peak_kib_per_request: Optional[float] = None
+
+
+def benchmark_settings() -> Dict[str, Any]:
+    """Settings that make the app self-contained: fake LLM, no Redis, no checkpointer."""
+    return {
+        "AI_PROVIDER_MODE": "fake",
+        "AI_FAKE_RESPONSE_MODE": "echo",
+        "AI_FAKE_TTFT_SECONDS": float(os.getenv("BENCH_FAKE_TTFT", "0")),
+        "AI_FAKE_TOKEN_DELAY_SECONDS": float(os.getenv("BENCH_FAKE_TOKEN_DELAY", "0")),
+        "AI_FAKE_SEED": 0,
+        "CACHE_REDIS_ENABLED": False,
+        "AGENT_MEMORY_ENABLED": False,
+        "JOB_QUEUE_BACKEND": "memory",
+        "MCP_SERVERS": {},
+    }
+
+
+def configure_benchmark_settings() -> None:
+    for name, value in benchmark_settings().items():
+        setattr(settings, name, value)
+
+
+def _override_database(app: Any, database_url: str) -> None:
+    """Serve `get_db` from a local stand-in database."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from src.database.connection import get_db
+
+    if database_url.startswith("sqlite+aiosqlite") and not importlib.util.find_spec(
+        "aiosqlite"
+    ):
+        # Falling back to the configured database would measure failed
+        # connection attempts instead of the endpoint
+        raise RuntimeError(
+            "The SQLite stand-in database needs aiosqlite: uv sync --group dev"
+        )
+
+    engine = create_async_engine(database_url)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def get_local_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_local_db
+
+    # aiosqlite connections live on non-daemon threads; dispose of the pool on
+    # shutdown or the process cannot exit
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan_with_engine(app: Any) -> AsyncIterator[Any]:
+        try:
+            async with lifespan(app) as state:
+                yield state
+        finally:
+            await engine.dispose()
+
+    app.router.lifespan_context = lifespan_with_engine
+
+
+def create_benchmark_app(database_url: Optional[str] = None) -> Any:
+    """App factory for uvicorn (`--factory`) with the benchmark settings."""
+    configure_benchmark_settings()
+    from src.api.main import create_app
+
+    app = create_app()
+    _override_database(
+        app,
+        database_url or os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL),
+    )
+    return app
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    endpoint: Endpoint,
+    concurrency: int,
+    requests: int,
+    cpu_seconds: Any,
+) -> LevelResult:
+    """Send `requests` requests with `concurrency` callers in flight."""
+    latencies: List[float] = []
+    errors = 0
+    ids = count()
+
+    async def caller() -> None:
+        nonlocal errors
+        while (i := next(ids)) < requests:
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    endpoint.method, endpoint.path, **endpoint.request_kwargs(i)
+                )
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    cpu_before = cpu_seconds()
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu_after = cpu_seconds()
+
+    latencies.sort()
+    cpu = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu = round((cpu_after - cpu_before) / requests * 1000, 3)
+    return LevelResult(
+        endpoint=endpoint.name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        rps=round(requests / elapsed, 1),
+        p50_ms=round(percentile(latencies, 50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        cpu_ms_per_request=cpu,
+    )
+
+
+async def measure_allocations(
+    client: httpx.AsyncClient, endpoint: Endpoint, requests: int
+) -> float:
+    """Mean peak traced memory (KiB) of serving one request, sequentially."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(requests):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            await client.request(
+                endpoint.method, endpoint.path, **endpoint.request_kwargs(-i - 1)
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+    return round(sum(peaks) / len(peaks) / 1024, 1)
+
+
+async def _sweep(
+    client: httpx.AsyncClient,
+    endpoints: Sequence[str],
+    levels: Sequence[int],
+    requests: int,
+    cpu_seconds: Any,
+    allocation_requests: int = 0,
+) -> List[LevelResult]:
+    results = []
+    for name in endpoints:
+        endpoint = ENDPOINTS[name]
+        # Warm up lazy paths (agent build, first-use imports) before timing
+        for i in range(min(10, requests)):
+            await client.request(
+                endpoint.method, endpoint.path, **endpoint.request_kwargs(-i - 1000)
+            )
+        alloc = None
+        if allocation_requests:
+            alloc = await measure_allocations(client, endpoint, allocation_requests)
+        for concurrency in levels:
+            result = await run_level(
+                client, endpoint, concurrency, requests, cpu_seconds
+            )
+            result.alloc_peak_kib_per_request = alloc
+            results.append(result)
+    return results
+
+
+def _headers() -> Dict[str, str]:
+    return {"X-API-Key": settings.X_API_KEY or "test-api-key"}
+
+
+@asynccontextmanager
+async def asgi_client(database_url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """A client talking to the app in-process, with its lifespan running."""
+    app = create_benchmark_app(database_url)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=f"http://benchmark{settings.API_PREFIX}",
+            headers=_headers(),
+        ) as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU of a process (Linux /proc); None elsewhere."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+@asynccontextmanager
+async def uvicorn_server(
+    database_url: str, startup_timeout: float = 30.0
+) -> AsyncIterator[tuple[str, int]]:
+    """Start `create_benchmark_app` under uvicorn; yields (base url, pid)."""
+    port = _free_port()
+    env = {**os.environ, "BENCH_DATABASE_URL": database_url}
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.tests.performance.benchmark:create_benchmark_app",
+            "--factory",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        async with httpx.AsyncClient() as probe:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                try:
+                    await probe.get(f"{url}/")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("uvicorn did not start in time")
+                    await asyncio.sleep(0.1)
+        yield url, process.pid
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_benchmark(
+    target: str = "asgi",
+    endpoints: Sequence[str] = tuple(ENDPOINTS),
+    levels: Sequence[int] = (1, 8, 32),
+    requests: int = 200,
+    url: Optional[str] = None,
+    database_url: str = DEFAULT_DATABASE_URL,
+    allocation_requests: int = 20,
+) -> Dict[str, Any]:
+    """Run the sweep against a target and return the JSON-ready report."""
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=None)
+    if target == "asgi":
+        async with asgi_client(database_url) as client:
+            results = await _sweep(
+                client,
+                endpoints,
+                levels,
+                requests,
+                time.process_time,
+                allocation_requests,
+            )
+    elif target in ("uvicorn", "live"):
+        async with _live_target(target, url, database_url) as (base_url, pid):
+            cpu_seconds = (lambda: _process_cpu_seconds(pid)) if pid else (lambda: None)
+            async with httpx.AsyncClient(
+                base_url=f"{base_url}{settings.API_PREFIX}",
+                headers=_headers(),
+                limits=limits,
+                timeout=60.0,
+            ) as client:
+                results = await _sweep(client, endpoints, levels, requests, cpu_seconds)
+    else:
+        raise ValueError(f"Unknown benchmark target: {target}")
+
+    return {
+        "target": target,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "requests_per_level": requests,
+        "results": [asdict(result) for result in results],
+    }
+
+
+@asynccontextmanager
+async def _live_target(
+    target: str, url: Optional[str], database_url: str
+) -> AsyncIterator[tuple[str, Optional[int]]]:
+    if target == "live":
+        if not url:
+            raise ValueError("The live target needs --url")
+        yield url.rstrip("/"), None
+        return
+    async with uvicorn_server(database_url) as (base_url, pid):
+        yield base_url, pid
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2
+) -> List[Dict[str, Any]]:
+    """
+    Compare each level with the baseline run of the same target.
+
+    Returns one row per level present in both, with `regression` set when
+    RPS dropped or p95 rose by more than `tolerance` (a fraction).
+    """
+    runs = baseline.get("targets", {})
+    previous = {
+        (r["endpoint"], r["concurrency"]): r
+        for r in runs.get(report["target"], {}).get("results", [])
+    }
+    rows = []
+    for result in report["results"]:
+        before = previous.get((result["endpoint"], result["concurrency"]))
+        if before is None:
+            continue
+        rps_change = _change(result["rps"], before["rps"])
+        p95_change = _change(result["p95_ms"], before["p95_ms"])
+        rows.append(
+            {
+                "endpoint": result["endpoint"],
+                "concurrency": result["concurrency"],
+                "rps_change": rps_change,
+                "p95_change": p95_change,
+                "regression": rps_change < -tolerance or p95_change > tolerance,
+            }
+        )
+    return rows
+
+
+def _change(value: float, before: float) -> float:
+    return round((value - before) / before, 3) if before else 0.0
+
+
+def update_baseline(report: Dict[str, Any], path: Path = BASELINE_PATH) -> None:
+    """Store a report as the baseline of its target."""
+    baseline = json.loads(path.read_text()) if path.exists() else {}
+    baseline.setdefault("targets", {})[report["target"]] = report
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def _print_report(report: Dict[str, Any], comparison: List[Dict[str, Any]]) -> None:
+    changes = {(c["endpoint"], c["concurrency"]): c for c in comparison}
+    print(
+        f"{'endpoint':<15}{'conc':>5}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'cpu ms':>9}{'alloc KiB':>11}{'errors':>8}  vs baseline"
+    )
+    for r in report["results"]:
+        change = changes.get((r["endpoint"], r["concurrency"]))
+        versus = ""
+        if change is not None:
+            versus = (
+                f"rps {change['rps_change']:+.0%}, p95 {change['p95_change']:+.0%}"
+                + ("  REGRESSION" if change["regression"] else "")
+            )
+        cpu = "-" if r["cpu_ms_per_request"] is None else r["cpu_ms_per_request"]
+        alloc = (
+            "-"
+            if r["alloc_peak_kib_per_request"] is None
+            else r["alloc_peak_kib_per_request"]
+        )
+        print(
+            f"{r['endpoint']:<15}{r['concurrency']:>5}{r['rps']:>10}{r['p50_ms']:>10}"
+            f"{r['p95_ms']:>10}{r['p99_ms']:>10}{cpu:>9}{alloc:>11}{r['errors']:>8}"
+            f"  {versus}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", choices=["asgi", "uvicorn", "live"])
+    parser.add_argument("--url", help="base URL of a running server (live target)")
+    parser.add_argument(
+        "--endpoints", default=",".join(ENDPOINTS), help="comma-separated"
+    )
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated")
+    parser.add_argument("--requests", type=int, default=200, help="per level")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store this run as baseline"
+    )
+    args = parser.parse_args(argv)
+    target = args.target or ("live" if args.url else "asgi")
+
+    logging.disable(logging.INFO)
+    report = asyncio.run(
+        run_benchmark(
+            target=target,
+            endpoints=args.endpoints.split(","),
+            levels=[int(level) for level in args.concurrency.split(",")],
+            requests=args.requests,
+            url=args.url,
+            database_url=args.database_url,
+        )
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    comparison = []
+    if args.baseline.exists():
+        comparison = compare(
+            report, json.loads(args.baseline.read_text()), args.tolerance
+        )
+    _print_report(report, comparison)
+
+    if args.update_baseline:
+        update_baseline(report, args.baseline)
+    if args.fail_on_regression and any(row["regression"] for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
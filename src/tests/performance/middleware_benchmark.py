@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of the per-request overhead of the HTTP middleware stack.
+
+A trivial endpoint is called through the ASGI interface directly (no
+server, network or HTTP client), once bare and once behind each middleware
+stack, so the difference is the time the stack adds to every request:
+
+- app: the middleware registered by `create_app()`, in the same order
+- base_http: as many no-op `BaseHTTPMiddleware` layers as the app stack has
+  custom middleware; the wrapping cost alone that the stack paid when its
+  middleware were BaseHTTPMiddleware subclasses
+
+Reported per stack: mean, p50 and p99 microseconds per request and the
+overhead over the bare endpoint. Requests are sequential and INFO logging
+is disabled, so console output does not drown the middleware cost.
+
+Usage:
+    python -m src.tests.performance.middleware_benchmark --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+
+from src.config.settings import settings
+from src.tests.performance.benchmark import percentile
+
+PING_PATH = "/v1/ping"
+
+
+class _PassThroughMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def _ping_app(middleware: Sequence[Middleware] = ()) -> FastAPI:
+    app = FastAPI(middleware=list(middleware), openapi_url=None)
+
+    @app.get(PING_PATH)
+    async def ping():
+        return JSONResponse({"pong": True})
+
+    return app
+
+
+def build_stacks() -> Dict[str, FastAPI]:
+    """The ping app bare and behind each middleware stack, by stack name."""
+    # Imported here so that building the app is part of the benchmark only
+    from src.api.main import create_app
+
+    app_middleware = list(create_app().user_middleware)
+    custom_layers = sum(1 for m in app_middleware if m.cls is not CORSMiddleware)
+    return {
+        "bare": _ping_app(),
+        "app": _ping_app(app_middleware),
+        "base_http": _ping_app([Middleware(_PassThroughMiddleware)] * custom_layers),
+    }
+
+
+async def _call(app: FastAPI) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PING_PATH,
+        "raw_path": PING_PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"x-api-key", (settings.X_API_KEY or "test-api-key").encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    status = 0
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: FastAPI, requests: int, warmup: int = 200) -> List[float]:
+    """Per-request latencies in microseconds, ascending."""
+    for _ in range(warmup):
+        await _call(app)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        status = await _call(app)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        if status != 200:
+            raise RuntimeError(f"Benchmark request failed with status {status}")
+    return sorted(latencies)
+
+
+async def run_middleware_benchmark(requests: int = 5000) -> Dict[str, Any]:
+    stacks = build_stacks()
+    results = {}
+    for name, app in stacks.items():
+        latencies = await measure(app, requests)
+        results[name] = {
+            "mean_us": round(sum(latencies) / len(latencies), 1),
+            "p50_us": round(percentile(latencies, 50), 1),
+            "p99_us": round(percentile(latencies, 99), 1),
+        }
+    bare = results["bare"]["mean_us"]
+    for result in results.values():
+        result["overhead_us"] = round(result["mean_us"] - bare, 1)
+    return {"requests": requests, "stacks": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000, help="per stack")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    report = asyncio.run(run_middleware_benchmark(args.requests))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(f"{'stack':<12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'overhead':>10}")
+    for name, r in report["stacks"].items():
+        print(
+            f"{name:<12}{r['mean_us']:>10}{r['p50_us']:>10}{r['p99_us']:>10}"
+            f"{r['overhead_us']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Smoke runs of the benchmark harness, in-process and against uvicorn.
+
+These keep the harness working; real measurements come from running
+`python -m src.tests.performance.benchmark` on a quiet machine.
+"""
+
+import json
+
+import pytest
+
+from src.config.settings import settings
+from src.tests.performance.benchmark import (
+    BASELINE_PATH,
+    ENDPOINTS,
+    benchmark_settings,
+    compare,
+    main,
+    percentile,
+    run_benchmark,
+)
+from src.tests.performance.middleware_benchmark import run_middleware_benchmark
+
+
+@pytest.fixture(autouse=True)
+def restore_settings(monkeypatch):
+    """The harness reconfigures the process-wide settings; undo it afterwards."""
+    for name in benchmark_settings():
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+
+
+def _report(target, rps, p95_ms):
+    return {
+        "target": target,
+        "results": [
+            {"endpoint": "health", "concurrency": 1, "rps": rps, "p95_ms": p95_ms}
+        ],
+    }
+
+
+class TestHarness:
+    @pytest.mark.asyncio
+    async def test_middleware_overhead(self):
+        report = await run_middleware_benchmark(requests=50)
+
+        stacks = report["stacks"]
+        assert set(stacks) == {"bare", "app", "base_http"}
+        assert stacks["bare"]["overhead_us"] == 0
+        for r in stacks.values():
+            assert 0 < r["p50_us"] <= r["p99_us"]
+
+    @pytest.mark.asyncio
+    async def test_in_process_sweep(self):
+        report = await run_benchmark(
+            target="asgi",
+            endpoints=["agent_execute", "metrics"],
+            levels=[1, 4],
+            requests=20,
+            allocation_requests=3,
+        )
+
+        results = report["results"]
+        assert [(r["endpoint"], r["concurrency"]) for r in results] == [
+            ("agent_execute", 1),
+            ("agent_execute", 4),
+            ("metrics", 1),
+            ("metrics", 4),
+        ]
+        for r in results:
+            assert r["errors"] == 0
+            assert r["rps"] > 0
+            assert r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"]
+            assert r["cpu_ms_per_request"] > 0
+            assert r["alloc_peak_kib_per_request"] > 0
+
+    @pytest.mark.asyncio
+    async def test_uvicorn_sweep(self):
+        report = await run_benchmark(
+            target="uvicorn", endpoints=["agent_execute"], levels=[2], requests=20
+        )
+
+        (result,) = report["results"]
+        assert result["errors"] == 0
+        assert result["cpu_ms_per_request"] is not None
+
+    def test_cli_writes_json_report(self, tmp_path, capsys):
+        output = tmp_path / "report.json"
+
+        code = main(
+            [
+                "--target",
+                "asgi",
+                "--endpoints",
+                "metrics",
+                "--concurrency",
+                "2",
+                "--requests",
+                "10",
+                "--output",
+                str(output),
+            ]
+        )
+
+        assert code == 0
+        assert json.loads(output.read_text())["results"][0]["endpoint"] == "metrics"
+        assert "metrics" in capsys.readouterr().out
+
+
+class TestBaselineComparison:
+    def test_regressions_beyond_tolerance_are_flagged(self):
+        baseline = {"targets": {"asgi": _report("asgi", 100, 10)}}
+
+        assert compare(_report("asgi", 70, 10), baseline)[0]["regression"] is True
+        assert compare(_report("asgi", 100, 13), baseline)[0]["regression"] is True
+        assert compare(_report("asgi", 95, 11), baseline)[0]["regression"] is False
+
+    def test_other_targets_are_not_compared(self):
+        baseline = {"targets": {"asgi": _report("asgi", 100, 10)}}
+
+        assert compare(_report("uvicorn", 10, 100), baseline) == []
+
+    def test_committed_baseline_covers_every_endpoint(self):
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+        for target in ("asgi", "uvicorn"):
+            endpoints = {r["endpoint"] for r in baseline["targets"][target]["results"]}
+            assert endpoints == set(ENDPOINTS)
+
+    def test_percentile_is_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
@@ -0,0 +1,45 @@
+"""
+Local stdio MCP server standing in for a real tool server in the MCP tests.
+
+Run as a script; `grow` adds a tool at runtime and announces the change.
+"""
+
+import os
+
+from mcp.server.fastmcp import Context, FastMCP
+
+server = FastMCP("stub", log_level="WARNING")
+
+
+@server.tool()
+def add(a: int, b: int) -> int:
+    """Add two integers."""
+    return a + b
+
+
+@server.tool()
+def pid() -> int:
+    """Process id of the server, to tell sessions apart."""
+    return os.getpid()
+
+
+@server.tool()
+def fail() -> str:
+    """Always fails."""
+    raise ValueError("stub failure")
+
+
+@server.tool()
+async def grow(name: str, ctx: Context) -> str:
+    """Add a tool called name and notify clients that the tools changed."""
+
+    def extra() -> str:
+        return name
+
+    server.add_tool(extra, name=name, description=f"Added at runtime: {name}")
+    await ctx.session.send_tool_list_changed()
+    return name
+
+
+if __name__ == "__main__":
+    server.run("stdio")
@@ -0,0 +1,96 @@
+"""
+Tests for the batch agent execution endpoint.
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.api.endpoints.v1.dependencies import get_response_cache, get_sample_agent
+from src.api.main import app
+from src.config.settings import settings
+from src.core.exceptions import DomainException
+
+
+class _EchoAgent:
+    """Echoes the query back, after a delay encoded in the query itself."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, state, config=None):
+        query = state["messages"][0]["content"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            name, _, delay = query.partition(":")
+            await asyncio.sleep(float(delay or 0))
+            if name == "fail":
+                raise DomainException("Query rejected", error_code="REJECTED")
+            return {"messages": [AIMessage(content=name)]}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def agent():
+    agent = _EchoAgent()
+    app.dependency_overrides[get_sample_agent] = lambda: agent
+    app.dependency_overrides[get_response_cache] = lambda: None
+    return agent
+
+
+class TestAgentBatchEndpoint:
+    def test_results_in_input_order_with_errors(self, client, agent):
+        response = client.post(
+            "/api/v1/agent/execute:batch",
+            json={"queries": ["a:0.03", "fail:0", "c:0"]},
+        )
+
+        assert response.status_code == 200
+        results = response.json()["data"]["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[0] == {
+            "index": 0,
+            "success": True,
+            "response": "a",
+            "error": None,
+        }
+        assert results[1]["success"] is False
+        assert results[1]["error"]["code"] == "REJECTED"
+        assert results[2]["response"] == "c"
+
+    def test_concurrency_is_bounded(self, client, agent):
+        queries = [f"q{i}:0.01" for i in range(6)]
+
+        client.post(
+            "/api/v1/agent/execute:batch",
+            json={"queries": queries, "max_concurrency": 2},
+        )
+
+        assert agent.max_in_flight == 2
+
+    def test_ndjson_stream_in_completion_order(self, client, agent):
+        response = client.post(
+            "/api/v1/agent/execute:batch",
+            json={"queries": ["slow:0.05", "fast:0"], "stream": True},
+        )
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["response"] for line in lines] == ["fast", "slow"]
+        assert [line["index"] for line in lines] == [1, 0]
+
+    def test_oversized_batch_rejected(self, client, agent):
+        queries = ["q"] * (settings.AGENT_BATCH_MAX_SIZE + 1)
+
+        response = client.post("/api/v1/agent/execute:batch", json={"queries": queries})
+
+        assert response.status_code == 422
+        assert response.json()["error"]["code"] == "BATCH_TOO_LARGE"
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,453 @@
+"""
+Tests for the asynchronous agent job queue, its workers and the jobs API.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+
+from src.api.endpoints.v1 import dependencies
+from src.api.endpoints.v1.dependencies import get_job_worker_pool
+from src.api.main import app
+from src.config.settings import settings
+from src.core.exceptions import DomainException
+from src.execution.actions.sample_action import SampleAction
+from src.execution.usecases.sample_usecase import SampleUseCase
+from src.execution.workers.agent_job_worker import AgentJobWorkerPool
+from src.models.agent_job import AgentJob
+from src.observability.metrics import agent_job_queue_depth
+from src.providers.queue.job_queue import (
+    InMemoryJobQueue,
+    RedisJobQueue,
+    get_job_queue,
+)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append(command(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+class _FakeRedis:
+    """The list, sorted set and script commands RedisJobQueue uses."""
+
+    def __init__(self):
+        self.store = {}
+        self.lists = defaultdict(list)
+        self.zsets = defaultdict(dict)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def lpush(self, key, value):
+        self.lists[key].insert(0, value)
+        return len(self.lists[key])
+
+    async def llen(self, key):
+        return len(self.lists[key])
+
+    async def lrange(self, key, start, end):
+        return list(self.lists[key])
+
+    async def lrem(self, key, count, value):
+        if value not in self.lists[key]:
+            return 0
+        self.lists[key].remove(value)
+        return 1
+
+    async def blmove(self, source, destination, timeout, src, dest):
+        if not self.lists[source]:
+            return None
+        value = self.lists[source].pop()
+        self.lists[destination].insert(0, value)
+        return value
+
+    async def zadd(self, key, mapping, nx=False):
+        for member, score in mapping.items():
+            if not (nx and member in self.zsets[key]):
+                self.zsets[key][member] = score
+
+    async def zrem(self, key, member):
+        return int(self.zsets[key].pop(member, None) is not None)
+
+    async def zmscore(self, key, members):
+        return [self.zsets[key].get(member) for member in members]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def register_script(self, script):
+        async def requeue(keys, args):
+            processing, queue, leases = keys
+            job_id, stale_before = args
+            lease = self.zsets[leases].get(job_id)
+            if stale_before != "" and lease is not None and lease > stale_before:
+                return 0
+            if not await self.lrem(processing, 1, job_id):
+                return 0
+            self.lists[queue].append(job_id)
+            await self.zrem(leases, job_id)
+            return 1
+
+        return requeue
+
+
+class _EchoAgent:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+
+    async def ainvoke(self, state, config=None):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        query = state["messages"][-1]["content"]
+        return {"messages": [AIMessage(content=f"echo: {query}")]}
+
+
+def _usecase_factory(agent):
+    return lambda: SampleUseCase(action=SampleAction(agent=agent))
+
+
+class TestInMemoryJobQueue:
+    @pytest.mark.asyncio
+    async def test_jobs_are_taken_in_order(self):
+        queue = InMemoryJobQueue()
+        first, second = AgentJob(query="a"), AgentJob(query="b")
+        await queue.put(first)
+        await queue.put(second)
+
+        assert await queue.depth() == 2
+        assert agent_job_queue_depth.labels(backend="memory")._value.get() == 2
+        assert (await queue.take(0.1)).id == first.id
+        assert (await queue.take(0.1)).id == second.id
+        assert await queue.take(0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_waiting_worker_gets_new_job(self):
+        queue = InMemoryJobQueue()
+        waiting = asyncio.create_task(queue.take(5.0))
+        await asyncio.sleep(0)
+        job = AgentJob(query="a")
+
+        await queue.put(job)
+
+        assert (await waiting).id == job.id
+        assert await queue.depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_is_none(self):
+        assert await InMemoryJobQueue().get("missing") is None
+
+
+class TestRedisJobQueue:
+    @pytest.fixture
+    def redis(self):
+        return _FakeRedis()
+
+    @pytest.fixture
+    def queue(self, redis):
+        return RedisJobQueue(redis, name="jobs", lease_timeout=30)
+
+    @pytest.mark.asyncio
+    async def test_taken_job_is_claimed_until_acked(self, redis, queue):
+        job = AgentJob(query="a")
+        await queue.put(job)
+
+        assert (await queue.take(0.1)).id == job.id
+        assert redis.lists["jobs:processing"] == [job.id]
+        assert redis.zsets["jobs:leases"][job.id] > time.time()
+
+        await queue.ack(job.id)
+
+        assert redis.lists["jobs:processing"] == []
+        assert redis.zsets["jobs:leases"] == {}
+
+    @pytest.mark.asyncio
+    async def test_job_taken_while_cancelled_goes_back_first(self, redis, queue):
+        first, second = AgentJob(query="a"), AgentJob(query="b")
+        await queue.put(first)
+        await queue.put(second)
+        blocked = asyncio.Event()
+
+        async def stalled_zadd(key, mapping, nx=False):
+            blocked.set()
+            await asyncio.Event().wait()
+
+        redis.zadd = stalled_zadd
+        taking = asyncio.create_task(queue.take(0.1))
+        await blocked.wait()
+        taking.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await taking
+
+        assert redis.lists["jobs:processing"] == []
+        assert redis.lists["jobs:queue"] == [second.id, first.id]
+
+    @pytest.mark.asyncio
+    async def test_expired_leases_are_requeued(self, redis, queue):
+        stale, live = AgentJob(query="stale"), AgentJob(query="live")
+        await queue.put(stale)
+        await queue.put(live)
+        await queue.take(0.1)
+        await queue.take(0.1)
+        redis.zsets["jobs:leases"][stale.id] = time.time() - 1
+
+        assert await queue.requeue_stale() == 1
+        assert redis.lists["jobs:processing"] == [live.id]
+        assert (await queue.take(0.1)).id == stale.id
+
+    @pytest.mark.asyncio
+    async def test_unleased_job_gets_a_lease_before_it_is_requeued(self, redis, queue):
+        # A take cancelled mid-BLMOVE leaves the id moved but never leased
+        redis.lists["jobs:processing"] = ["lost"]
+
+        assert await queue.requeue_stale() == 0
+        redis.zsets["jobs:leases"]["lost"] -= 31
+        assert await queue.requeue_stale() == 1
+        assert redis.lists["jobs:queue"] == ["lost"]
+
+    @pytest.mark.asyncio
+    async def test_finished_job_is_not_released_or_run_again(self, redis, queue):
+        job = AgentJob(query="a")
+        await queue.put(job)
+        await queue.take(0.1)
+        await queue.ack(job.id)
+
+        assert await queue.release(job) is False
+        assert redis.lists["jobs:queue"] == []
+
+        job.finished_at = job.created_at
+        await queue.save(job)
+        redis.lists["jobs:queue"] = [job.id]
+        assert await queue.take(0.1) is None
+        assert redis.lists["jobs:processing"] == []
+
+
+class TestAgentJobWorkerPool:
+    @pytest.mark.asyncio
+    async def test_job_result_is_stored(self):
+        queue = InMemoryJobQueue()
+        pool = AgentJobWorkerPool(queue, _usecase_factory(_EchoAgent()), 1)
+        job = AgentJob(query="hi")
+        await queue.put(job)
+
+        finished = await pool.run(await queue.take(0.1))
+
+        stored = await queue.get(job.id)
+        assert finished.status == stored.status == "succeeded"
+        assert stored.result == "echo: hi"
+        assert stored.started_at is not None and stored.finished_at is not None
+        assert stored.usage is not None
+
+    @pytest.mark.asyncio
+    async def test_app_errors_are_reported(self):
+        queue = InMemoryJobQueue()
+        agent = _EchoAgent(error=DomainException("nope", error_code="NOPE"))
+        pool = AgentJobWorkerPool(queue, _usecase_factory(agent), 1)
+
+        job = await pool.run(AgentJob(query="hi"))
+
+        assert job.status == "failed"
+        assert (job.error.code, job.error.message) == ("NOPE", "nope")
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_are_not_leaked(self):
+        queue = InMemoryJobQueue()
+        agent = _EchoAgent(error=RuntimeError("secret"))
+        pool = AgentJobWorkerPool(queue, _usecase_factory(agent), 1)
+
+        job = await pool.run(AgentJob(query="hi"))
+
+        assert job.error.code == "INTERNAL_SERVER_ERROR"
+        assert "secret" not in job.error.message
+
+    @pytest.mark.asyncio
+    async def test_workers_bound_concurrency(self):
+        queue = InMemoryJobQueue()
+        pool = AgentJobWorkerPool(
+            queue, _usecase_factory(_EchoAgent(delay=0.1)), 2, poll_timeout=0.05
+        )
+        jobs = [AgentJob(query=str(i)) for i in range(4)]
+        for job in jobs:
+            await queue.put(job)
+
+        pool.start()
+        await asyncio.sleep(0.05)
+        states = [(await queue.get(job.id)).status for job in jobs]
+        await asyncio.sleep(0.3)
+        await pool.stop()
+
+        assert states.count("running") == 2
+        for job in jobs:
+            assert (await queue.get(job.id)).status == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_is_requeued(self):
+        queue = InMemoryJobQueue()
+        pool = AgentJobWorkerPool(
+            queue, _usecase_factory(_EchoAgent(delay=5.0)), 1, poll_timeout=0.05
+        )
+        job = AgentJob(query="slow")
+        await queue.put(job)
+        pool.start()
+        await asyncio.sleep(0.05)
+
+        await pool.stop()
+
+        assert (await queue.get(job.id)).status == "queued"
+        assert (await queue.take(0.1)).id == job.id
+
+    @pytest.mark.asyncio
+    async def test_queue_errors_do_not_stop_the_worker(self):
+        class FlakyQueue(InMemoryJobQueue):
+            failing_saves = 0
+
+            async def save(self, job):
+                if self.failing_saves:
+                    self.failing_saves -= 1
+                    raise ConnectionError("redis down")
+                await super().save(job)
+
+        queue = FlakyQueue()
+        pool = AgentJobWorkerPool(
+            queue, _usecase_factory(_EchoAgent()), 1, poll_timeout=0.05
+        )
+        first, second = AgentJob(query="a"), AgentJob(query="b")
+        await queue.put(first)
+        queue.failing_saves = 1
+        pool.start()
+        await asyncio.sleep(0.05)
+        await queue.put(second)
+        await asyncio.sleep(0.1)
+        workers_alive = all(not task.done() for task in pool._tasks)
+        await pool.stop()
+
+        assert workers_alive
+        assert (await queue.get(second.id)).status == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_returns_claimed_job_to_redis_queue(self):
+        redis = _FakeRedis()
+        queue = RedisJobQueue(redis, name="jobs")
+        pool = AgentJobWorkerPool(
+            queue, _usecase_factory(_EchoAgent(delay=5.0)), 1, poll_timeout=0.05
+        )
+        job = AgentJob(query="slow")
+        await queue.put(job)
+        pool.start()
+        await asyncio.sleep(0.05)
+
+        await pool.stop()
+
+        assert redis.lists["jobs:processing"] == []
+        assert redis.lists["jobs:queue"] == [job.id]
+        assert (await queue.get(job.id)).status == "queued"
+
+    @pytest.mark.asyncio
+    async def test_finished_job_is_acked_and_lease_renewed(self):
+        redis = _FakeRedis()
+        queue = RedisJobQueue(redis, name="jobs", lease_timeout=0.06)
+        pool = AgentJobWorkerPool(
+            queue, _usecase_factory(_EchoAgent(delay=0.1)), 1, lease_timeout=0.06
+        )
+        job = AgentJob(query="hi")
+        await queue.put(job)
+        taken = await queue.take(0.1)
+
+        running = asyncio.create_task(pool.run(taken))
+        await asyncio.sleep(0.07)
+        assert await queue.requeue_stale() == 0
+        await running
+
+        assert redis.lists["jobs:processing"] == []
+        assert redis.lists["jobs:queue"] == []
+        assert (await queue.get(job.id)).status == "succeeded"
+
+
+class TestAgentJobsApi:
+    @pytest.fixture
+    def queue(self):
+        queue = InMemoryJobQueue()
+        app.dependency_overrides[get_job_queue] = lambda: queue
+        return queue
+
+    def test_submit_returns_job_id_right_away(self, client, queue):
+        response = client.post("/api/v1/agent/jobs", json={"query": "hi"})
+
+        assert response.status_code == 202
+        job = response.json()["data"]
+        assert job["status"] == "queued"
+        assert job["query"] == "hi"
+        poll = client.get(f"/api/v1/agent/jobs/{job['id']}")
+        assert poll.json()["data"]["id"] == job["id"]
+
+    def test_unknown_job_is_404(self, client, queue):
+        response = client.get("/api/v1/agent/jobs/missing")
+
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "JOB_NOT_FOUND"
+
+    def test_invalid_request_is_rejected(self, client, queue):
+        response = client.post(
+            "/api/v1/agent/jobs", json={"query": "hi", "model_hint": "x"}
+        )
+
+        assert response.status_code == 422
+
+
+class TestLocalWorkers:
+    @pytest.fixture
+    def job_client(self, monkeypatch):
+        monkeypatch.setattr(settings, "JOB_QUEUE_BACKEND", "memory")
+        monkeypatch.setattr(settings, "JOB_WORKERS", 1)
+        monkeypatch.setattr(settings, "JOB_POLL_TIMEOUT", 0.05)
+        monkeypatch.setattr(
+            dependencies, "build_sample_usecase", _usecase_factory(_EchoAgent())
+        )
+        get_job_queue.cache_clear()
+        get_job_worker_pool.cache_clear()
+        headers = {"X-API-Key": settings.X_API_KEY or "test-api-key"}
+        with TestClient(app, headers=headers) as client:
+            yield client
+        get_job_queue.cache_clear()
+        get_job_worker_pool.cache_clear()
+
+    def test_submitted_job_completes(self, job_client):
+        job_id = job_client.post("/api/v1/agent/jobs", json={"query": "hi"}).json()[
+            "data"
+        ]["id"]
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            job = job_client.get(f"/api/v1/agent/jobs/{job_id}").json()["data"]
+            if job["status"] == "succeeded":
+                break
+            time.sleep(0.02)
+
+        assert job["status"] == "succeeded"
+        assert job["result"] == "echo: hi"
+
+
+pytestmark = pytest.mark.unit
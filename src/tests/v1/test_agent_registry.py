@@ -0,0 +1,180 @@
+"""
+Tests for lazy agent construction through the agent registry and manager.
+"""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.agents.agent_manager.manager import AgentManager, AgentSpec
+from src.agents.agent_manager.registry import AgentRegistry
+from src.api.endpoints.v1.dependencies import get_agent, get_sample_agent
+from src.config.settings import settings
+from src.core.exceptions import NotFoundException
+from src.providers.ai.langchain_model_loader import LangchainModelLoader
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+LLM_PACKAGES = ("langchain", "langchain_core", "langgraph", "langsmith", "openai")
+
+
+class TestAgentRegistry:
+    def test_specs_are_looked_up_by_name(self):
+        registry = AgentRegistry()
+        spec = AgentSpec(name="a", prompt="p")
+
+        registry.register(spec)
+
+        assert registry.get("a") is spec
+        assert registry.list_agents() == ["a"]
+
+    def test_unknown_agent_raises(self):
+        with pytest.raises(KeyError):
+            AgentRegistry().get("missing")
+
+
+class _Graph:
+    """Placeholder compiled graph; with_config returns a bound copy."""
+
+    def __init__(self, base=None, config=None):
+        self.base = base or self
+        self.config = config or {}
+
+    def with_config(self, config=None, **kwargs):
+        return _Graph(self.base, {**self.config, **(config or {}), **kwargs})
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """A manager on its own registry whose graphs are placeholder objects."""
+    manager = AgentManager(AgentRegistry())
+    builds = []
+    monkeypatch.setattr(manager, "build", lambda spec: builds.append(spec) or _Graph())
+    manager.builds = builds
+    return manager
+
+
+class TestAgentManager:
+    def test_graph_compiled_once_per_distinct_spec(self, manager):
+        manager.register(AgentSpec(name="a", prompt="p"))
+        manager.register(AgentSpec(name="b", prompt="p"))
+        manager.register(AgentSpec(name="c", prompt="p", model="reasoning"))
+
+        assert manager.get("a").base is manager.get("b").base
+        assert manager.get("c").base is not manager.get("a").base
+        assert len(manager.builds) == 2
+        assert manager.compiled_graph_count() == 2
+
+    def test_shared_graph_is_bound_to_each_agent_name(self, manager):
+        manager.register(AgentSpec(name="a", prompt="p"))
+        manager.register(AgentSpec(name="b", prompt="p"))
+
+        assert manager.get("a").config["metadata"] == {"agent_name": "a"}
+        assert manager.get("b").config["metadata"] == {"agent_name": "b"}
+
+    def test_distinct_specs_compile_in_parallel(self, manager, monkeypatch):
+        other_building = threading.Event()
+
+        def build(spec):
+            if spec.prompt == "slow":
+                # Blocks forever if the other build waits for this one
+                assert other_building.wait(5)
+            else:
+                other_building.set()
+            manager.builds.append(spec)
+            return _Graph()
+
+        monkeypatch.setattr(manager, "build", build)
+        manager.register(AgentSpec(name="slow", prompt="slow"))
+        manager.register(AgentSpec(name="fast", prompt="fast"))
+        slow = threading.Thread(target=manager.get, args=["slow"])
+        slow.start()
+        manager.get("fast")
+        slow.join(10)
+
+        assert sorted(spec.name for spec in manager.builds) == ["fast", "slow"]
+
+    def test_warm_up_compiles_selected_agents(self, manager):
+        manager.register(AgentSpec(name="a", prompt="a"))
+        manager.register(AgentSpec(name="b", prompt="b"))
+
+        manager.warm_up(["a"])
+
+        assert manager.is_built("a")
+        assert not manager.is_built("b")
+
+    def test_agent_built_once_on_first_use(self, manager):
+        manager.register(AgentSpec(name="a"))
+
+        assert not manager.is_built("a")
+        first = manager.get("a")
+
+        assert manager.get("a") is first
+        assert len(manager.builds) == 1
+
+    def test_reregistering_drops_the_built_agent(self, manager):
+        manager.register(AgentSpec(name="a", prompt="old"))
+        manager.get("a")
+
+        manager.register(AgentSpec(name="a", prompt="new"))
+
+        assert not manager.is_built("a")
+        assert manager.get("a") is not None
+        assert [spec.prompt for spec in manager.builds] == ["old", "new"]
+
+    def test_reset_recompiles_on_next_use(self, manager):
+        manager.register(AgentSpec(name="a"))
+        first = manager.get("a")
+
+        manager.reset()
+
+        assert manager.get("a").base is not first.base
+        assert len(manager.builds) == 2
+
+    def test_builds_agent_from_spec_offline(self, monkeypatch):
+        monkeypatch.setattr(LangchainModelLoader, "_instance", None)
+        monkeypatch.setattr(settings, "AI_PROVIDER_MODE", "fake")
+        manager = AgentManager(AgentRegistry())
+        manager.register(AgentSpec(name="echo", prompt="Repeat", mcp_tools=False))
+
+        result = manager.get("echo").invoke(
+            {"messages": [{"role": "user", "content": "hello"}]}
+        )
+
+        assert result["messages"][-1].content == "hello"
+
+
+class TestAgentDependency:
+    def test_resolver_is_stable_per_name(self):
+        assert get_agent("sample_agent") is get_sample_agent
+        assert get_agent("sample_agent") is not get_agent("sample_agent_reasoning")
+
+    def test_unknown_agent_is_not_found(self):
+        with pytest.raises(NotFoundException):
+            get_agent("missing")()
+
+
+class TestStartupImportBudget:
+    def test_app_import_does_not_load_llm_libraries(self):
+        """Importing the app must not pay for LLM client libraries."""
+        code = (
+            "import sys, src.api.main; "
+            "loaded = {m.split('.')[0] for m in sys.modules}; "
+            f"print('LLM_MODULES=' + ','.join(sorted(loaded & {set(LLM_PACKAGES)!r})))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert "LLM_MODULES=\n" in result.stdout
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,90 @@
+"""
+Tests for the SSE streaming variant of the agent endpoint.
+"""
+
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.prebuilt import create_react_agent
+
+from src.api.endpoints.v1.dependencies import get_sample_agent
+from src.api.main import app
+from src.execution.actions.sample_action import SampleAction
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class _FailingAgent:
+    async def astream(self, *args, **kwargs):
+        raise RuntimeError("model unavailable")
+        yield  # pragma: no cover
+
+
+class TestAgentStreamEndpoint:
+    """Test suite for POST /api/v1/agent/execute/stream."""
+
+    def test_streams_tokens_and_done(self, client):
+        model = GenericFakeChatModel(messages=iter([AIMessage(content="hi there")]))
+        agent = create_react_agent(model, tools=[], prompt="test")
+        app.dependency_overrides[get_sample_agent] = lambda: agent
+
+        response = client.post("/api/v1/agent/execute/stream", json={"query": "Hi"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        tokens = [data["content"] for name, data in events if name == "token"]
+        assert "".join(tokens) == "hi there"
+        name, data = events[-1]
+        assert name == "done"
+        assert data["response"] == "hi there"
+        assert data["usage"]["llm_calls"] == 1
+
+    def test_error_event_terminates_stream(self, client):
+        app.dependency_overrides[get_sample_agent] = lambda: _FailingAgent()
+
+        response = client.post("/api/v1/agent/execute/stream", json={"query": "Hi"})
+
+        assert response.status_code == 200
+        events = _parse_sse(response.text)
+        assert len(events) == 1
+        assert events[0][0] == "error"
+        assert events[0][1]["code"] == "INTERNAL_SERVER_ERROR"
+
+
+class TestSampleActionStreamEvents:
+    """Test translation of LangGraph updates into tool step events."""
+
+    def test_tool_call_and_result_events(self):
+        update = {
+            "agent": {
+                "messages": [
+                    AIMessage(
+                        content="",
+                        tool_calls=[{"id": "c1", "name": "search", "args": {"q": "x"}}],
+                    )
+                ]
+            },
+            "tools": {
+                "messages": [
+                    ToolMessage(content="result", name="search", tool_call_id="c1")
+                ]
+            },
+        }
+
+        events = SampleAction._events_from_update(update)
+
+        assert [e.event for e in events] == ["tool_call", "tool_result"]
+        assert events[0].data == {"id": "c1", "name": "search", "args": {"q": "x"}}
+        assert events[1].data["content"] == "result"
+
+
+pytestmark = pytest.mark.unit
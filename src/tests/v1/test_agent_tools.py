@@ -0,0 +1,274 @@
+"""
+Tests for the tool registry and time-boxed, concurrent tool execution.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from src.agents.tools.registry import ToolCachePolicy, ToolRegistry
+from src.agents.tools.sample_tools import current_time
+from src.agents.tools.tool_executor import build_tool_node, reset_tool_caches
+from src.config.settings import settings
+from src.observability.metrics import (
+    agent_tool_duration_seconds,
+    agent_tools_used_total,
+    cache_hits_total,
+    cache_misses_total,
+)
+
+AGENT = "tools-test-agent"
+
+
+async def slow_lookup(key: str) -> str:
+    """Look a key up slowly."""
+    await asyncio.sleep(0.2)
+    return f"value of {key}"
+
+
+async def hang(key: str) -> str:
+    """Never answers in time."""
+    await asyncio.sleep(10)
+    return key
+
+
+def blocking_lookup(key: str) -> str:
+    """Look a key up with a blocking call."""
+    time.sleep(0.05)
+    return f"{key} from {threading.current_thread().name}"
+
+
+class ToolCallingModel(GenericFakeChatModel):
+    """Fake model that accepts tool binding."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _tool_calls(*calls):
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": name, "args": {"key": key}, "id": f"call-{i}"}
+            for i, (name, key) in enumerate(calls)
+        ],
+    )
+
+
+def _agent(tools, *calls, timeout=None, cache_policies=None):
+    replies = iter([_tool_calls(*calls), AIMessage(content="done")])
+    model = ToolCallingModel(messages=replies)
+    node = build_tool_node(
+        [tool(t) for t in tools],
+        AGENT,
+        timeout=timeout,
+        cache_policies=cache_policies,
+    )
+    return create_react_agent(model, tools=node)
+
+
+def _tool_messages(result):
+    return [m for m in result["messages"] if m.type == "tool"]
+
+
+class TestToolRegistry:
+    def test_tools_are_built_once_on_first_use(self):
+        registry = ToolRegistry()
+        builds = []
+        registry.register(
+            "now",
+            lambda: builds.append(1) or tool(current_time),
+        )
+
+        first = registry.get("now")
+
+        assert registry.get("now") is first
+        assert builds == [1]
+
+    def test_sets_resolve_in_order_with_timeouts(self):
+        registry = ToolRegistry()
+        registry.register("a", lambda: tool(slow_lookup))
+        registry.register("b", lambda: tool(blocking_lookup), timeout=1.5)
+        registry.define_set("both", ["b", "a"])
+
+        tools = registry.get_set("both")
+
+        assert [t.name for t in tools] == ["blocking_lookup", "slow_lookup"]
+        assert tools[0].metadata == {"timeout": 1.5}
+
+    def test_sets_of_unknown_tools_are_rejected(self):
+        with pytest.raises(KeyError):
+            ToolRegistry().define_set("bad", ["missing"])
+
+    def test_unknown_set_raises(self):
+        with pytest.raises(KeyError):
+            ToolRegistry().get_set("missing")
+
+    def test_cache_policies_are_keyed_by_tool_name(self):
+        registry = ToolRegistry()
+        policy = ToolCachePolicy(ttl=60)
+        registry.register("a", lambda: tool(slow_lookup), cache=policy)
+        registry.register("b", lambda: tool(blocking_lookup))
+        registry.define_set("both", ["a", "b"])
+
+        assert registry.cache_policies("both") == {"slow_lookup": policy}
+
+
+class TestToolExecution:
+    @pytest.mark.asyncio
+    async def test_tool_calls_of_one_step_run_concurrently(self):
+        agent = _agent([slow_lookup], ("slow_lookup", "a"), ("slow_lookup", "b"))
+
+        start = time.perf_counter()
+        result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        assert time.perf_counter() - start < 0.35
+        contents = sorted(m.content for m in _tool_messages(result))
+        assert contents == ["value of a", "value of b"]
+
+    @pytest.mark.asyncio
+    async def test_slow_tool_times_out_without_failing_the_run(self):
+        agent = _agent(
+            [slow_lookup, hang], ("hang", "x"), ("slow_lookup", "y"), timeout=0.5
+        )
+        timeouts = agent_tool_duration_seconds.labels(
+            agent_name=AGENT, tool_name="hang", status="timeout"
+        )
+        before = timeouts._sum.get()
+
+        result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        by_name = {m.name: m for m in _tool_messages(result)}
+        assert by_name["hang"].status == "error"
+        assert "timed out" in by_name["hang"].content
+        assert by_name["slow_lookup"].content == "value of y"
+        assert result["messages"][-1].content == "done"
+        assert timeouts._sum.get() > before
+
+    @pytest.mark.asyncio
+    async def test_sync_tools_run_in_the_tool_thread_pool(self):
+        agent = _agent([blocking_lookup], ("blocking_lookup", "k"))
+
+        result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        assert "agent-tool" in _tool_messages(result)[0].content
+
+    @pytest.mark.asyncio
+    async def test_every_call_is_recorded(self):
+        counter = agent_tools_used_total.labels(
+            agent_name=AGENT, tool_name="slow_lookup"
+        )
+        before = counter._value.get()
+        agent = _agent([slow_lookup], ("slow_lookup", "a"), ("slow_lookup", "b"))
+
+        await agent.ainvoke({"messages": [("user", "go")]})
+
+        assert counter._value.get() == before + 2
+
+    @pytest.mark.asyncio
+    async def test_calls_are_recorded_under_the_agent_name_of_the_run(self):
+        counter = agent_tools_used_total.labels(
+            agent_name="bound-agent", tool_name="slow_lookup"
+        )
+        before = counter._value.get()
+        agent = _agent([slow_lookup], ("slow_lookup", "a"))
+
+        await agent.with_config(metadata={"agent_name": "bound-agent"}).ainvoke(
+            {"messages": [("user", "go")]}
+        )
+
+        assert counter._value.get() == before + 1
+
+
+class TestToolResultCache:
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "CACHE_REDIS_ENABLED", False)
+        reset_tool_caches()
+        yield
+        reset_tool_caches()
+
+    @pytest.fixture
+    def counted_lookup(self):
+        calls = []
+
+        async def counted_lookup(key: str) -> str:
+            """Look a key up, counting executions."""
+            calls.append(key)
+            await asyncio.sleep(0.1)
+            if key == "bad":
+                raise ValueError("bad key")
+            return f"value of {key}"
+
+        return counted_lookup, calls
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_are_served_from_the_cache(self, counted_lookup):
+        fn, calls = counted_lookup
+        policies = {"counted_lookup": ToolCachePolicy(ttl=60)}
+        hits = cache_hits_total.labels(cache_name="tool:counted_lookup")
+        misses = cache_misses_total.labels(cache_name="tool:counted_lookup")
+        hits_before, misses_before = hits._value.get(), misses._value.get()
+
+        for _ in range(2):
+            agent = _agent([fn], ("counted_lookup", "a"), cache_policies=policies)
+            result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        message = _tool_messages(result)[0]
+        assert message.content == "value of a"
+        assert message.tool_call_id == "call-0"
+        assert calls == ["a"]
+        assert hits._value.get() == hits_before + 1
+        assert misses._value.get() == misses_before + 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_run_once(self, counted_lookup):
+        fn, calls = counted_lookup
+        policies = {"counted_lookup": ToolCachePolicy()}
+        agent = _agent(
+            [fn],
+            ("counted_lookup", "a"),
+            ("counted_lookup", "a"),
+            cache_policies=policies,
+        )
+
+        result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        messages = _tool_messages(result)
+        assert calls == ["a"]
+        assert [m.content for m in messages] == ["value of a"] * 2
+        assert sorted(m.tool_call_id for m in messages) == ["call-0", "call-1"]
+
+    @pytest.mark.asyncio
+    async def test_key_function_decides_what_is_the_same_call(self, counted_lookup):
+        fn, calls = counted_lookup
+        policy = ToolCachePolicy(key=lambda args: args["key"].lower())
+        policies = {"counted_lookup": policy}
+
+        for key in ("A", "a"):
+            agent = _agent([fn], ("counted_lookup", key), cache_policies=policies)
+            result = await agent.ainvoke({"messages": [("user", "go")]})
+
+        assert calls == ["A"]
+        assert _tool_messages(result)[0].content == "value of A"
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, counted_lookup):
+        fn, calls = counted_lookup
+        policies = {"counted_lookup": ToolCachePolicy()}
+
+        for _ in range(2):
+            agent = _agent([fn], ("counted_lookup", "bad"), cache_policies=policies)
+            with pytest.raises(ValueError):
+                await agent.ainvoke({"messages": [("user", "go")]})
+
+        assert calls == ["bad", "bad"]
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,327 @@
+"""
+Tests for the pure-ASGI middleware stack (request context, API key, error
+handler) on a minimal app.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middlewares import request_context
+from src.api.middlewares.error_handler import ErrorHandlerMiddleware
+from src.api.middlewares.request_context import (
+    UNMATCHED_ENDPOINT,
+    RequestContextMiddleware,
+    RouteTemplateResolver,
+)
+from src.api.middlewares.security import APIKeyMiddleware
+from src.config.logs_config import request_id_ctx
+from src.config.settings import settings
+from src.core.exceptions import NotFoundException
+from src.observability.metrics import (
+    http_request_duration_seconds,
+    http_requests_total,
+    http_response_size_bytes,
+)
+
+API_KEY = "middleware-test-key"
+MIDDLEWARES = [
+    RequestContextMiddleware,
+    APIKeyMiddleware,
+    ErrorHandlerMiddleware,
+]
+
+
+def _build_app(chunks_sent: list) -> FastAPI:
+    # Outermost first, like the add_middleware calls in create_app
+    app = FastAPI(middleware=[Middleware(cls) for cls in MIDDLEWARES])
+
+    @app.get("/mw/echo-id")
+    async def echo_id():
+        return {"request_id": request_id_ctx.get()}
+
+    @app.get("/mw/missing")
+    async def missing():
+        raise NotFoundException(message="Nothing here", error_code="MISSING")
+
+    @app.get("/mw/crash")
+    async def crash():
+        raise RuntimeError("boom")
+
+    @app.get("/mw/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/mw/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                chunks_sent.append(i)
+                yield f"chunk {i}\n"
+                await asyncio.sleep(0)
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+@pytest.fixture
+def mw_client(monkeypatch):
+    monkeypatch.setattr(settings, "X_API_KEY", API_KEY)
+    with TestClient(
+        _build_app([]),
+        headers={"X-API-Key": API_KEY},
+        raise_server_exceptions=False,
+    ) as client:
+        yield client
+
+
+class TestPureASGIMiddlewares:
+    def test_no_middleware_uses_base_http_middleware(self):
+        for cls in MIDDLEWARES:
+            assert not issubclass(cls, BaseHTTPMiddleware)
+
+    def test_request_id_is_propagated_and_returned(self, mw_client):
+        response = mw_client.get("/mw/echo-id", headers={"X-Request-ID": "req-42"})
+
+        assert response.status_code == 200
+        assert response.json() == {"request_id": "req-42"}
+        assert response.headers["X-Request-ID"] == "req-42"
+        assert float(response.headers["X-Process-Time"]) >= 0
+
+    def test_request_id_is_generated(self, mw_client):
+        response = mw_client.get("/mw/echo-id")
+
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+
+    def test_missing_api_key_is_rejected(self, mw_client):
+        response = mw_client.get(
+            "/mw/echo-id", headers={"X-API-Key": "wrong", "X-Request-ID": "req-7"}
+        )
+
+        assert response.status_code == 401
+        body = response.json()
+        assert body["error"]["code"] == "UNAUTHORIZED"
+        assert body["request_id"] == "req-7"
+        assert response.headers["X-Request-ID"] == "req-7"
+
+    def test_app_exception_becomes_error_response(self, mw_client):
+        before = http_requests_total.labels(
+            method="GET", endpoint="/mw/missing", status_code="404"
+        )._value.get()
+
+        response = mw_client.get("/mw/missing", headers={"X-Request-ID": "req-9"})
+
+        assert response.status_code == 404
+        body = response.json()
+        assert body["success"] is False
+        assert body["error"]["code"] == "MISSING"
+        assert body["request_id"] == "req-9"
+        # Metrics see the status actually sent, not the exception
+        after = http_requests_total.labels(
+            method="GET", endpoint="/mw/missing", status_code="404"
+        )._value.get()
+        assert after == before + 1
+
+    def test_unhandled_exception_becomes_500(self, mw_client):
+        before = http_requests_total.labels(
+            method="GET", endpoint="/mw/crash", status_code="500"
+        )._value.get()
+
+        response = mw_client.get("/mw/crash")
+
+        assert response.status_code == 500
+        assert response.json()["error"]["code"] == "INTERNAL_SERVER_ERROR"
+        after = http_requests_total.labels(
+            method="GET", endpoint="/mw/crash", status_code="500"
+        )._value.get()
+        assert after == before + 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_is_not_buffered(self, monkeypatch):
+        monkeypatch.setattr(settings, "X_API_KEY", API_KEY)
+        chunks_sent = []
+        app = _build_app(chunks_sent)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/mw/stream",
+            "raw_path": b"/mw/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"x-api-key", API_KEY.encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        generated_at_send = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                generated_at_send.append(len(chunks_sent))
+
+        await app(scope, receive, send)
+
+        # Each chunk reached the server before the next one was generated
+        assert generated_at_send == [1, 2, 3]
+
+    def test_response_size_counts_streamed_body(self, mw_client):
+        histogram = http_response_size_bytes.labels(method="GET", endpoint="/mw/stream")
+        before = histogram._sum.get()
+
+        mw_client.get("/mw/stream")
+
+        assert histogram._sum.get() == before + len("chunk 0\nchunk 1\nchunk 2\n")
+
+
+class TestHTTPTracingMode:
+    def _traced_client(self, monkeypatch, manual_span: bool) -> tuple:
+        monkeypatch.setattr(settings, "X_API_KEY", API_KEY)
+        mock_tracer = MagicMock()
+        monkeypatch.setattr(request_context, "tracer", mock_tracer)
+        app = _build_app([])
+        app.user_middleware[0] = Middleware(
+            RequestContextMiddleware, manual_span=manual_span
+        )
+        return TestClient(app, headers={"X-API-Key": API_KEY}), mock_tracer
+
+    def test_manual_mode_starts_one_span(self, monkeypatch):
+        client, mock_tracer = self._traced_client(monkeypatch, manual_span=True)
+
+        client.get("/mw/echo-id", headers={"X-Request-ID": "req-span"})
+
+        mock_tracer.start_as_current_span.assert_called_once()
+        attributes = mock_tracer.start_as_current_span.call_args.kwargs["attributes"]
+        assert attributes["http.request_id"] == "req-span"
+
+    def test_instrumentor_mode_starts_no_manual_span(self, monkeypatch):
+        client, mock_tracer = self._traced_client(monkeypatch, manual_span=False)
+
+        response = client.get("/mw/echo-id")
+
+        assert response.status_code == 200
+        mock_tracer.start_as_current_span.assert_not_called()
+
+    @pytest.mark.parametrize("mode", ["manual", "instrumentor"])
+    def test_create_app_instruments_only_in_instrumentor_mode(self, monkeypatch, mode):
+        from src.api.main import create_app
+
+        monkeypatch.setattr(settings, "HTTP_TRACING_MODE", mode)
+        app = create_app()
+        try:
+            instrumented = getattr(app, "_is_instrumented_by_opentelemetry", False)
+            assert instrumented == (mode == "instrumentor")
+            context_middleware = next(
+                m for m in app.user_middleware if m.cls is RequestContextMiddleware
+            )
+            assert RequestContextMiddleware(
+                Mock(), *context_middleware.args, **context_middleware.kwargs
+            ).manual_span == (mode == "manual")
+        finally:
+            if instrumented:
+                FastAPIInstrumentor.uninstrument_app(app)
+
+
+def _resolver_app() -> FastAPI:
+    app = FastAPI()
+    router = APIRouter()
+
+    @router.get("/health")
+    async def health():
+        return {}
+
+    @router.get("/jobs/{job_id}")
+    async def job(job_id: str):
+        return {}
+
+    @router.get("/jobs/latest")
+    async def latest_job():
+        return {}
+
+    @router.get("/metrics-summary")
+    async def metrics_summary():
+        return {}
+
+    app.include_router(router, prefix=f"{settings.API_PREFIX}/v1")
+    return app
+
+
+class TestRouteTemplateResolver:
+    def test_resolves_static_and_parameterized_routes(self):
+        resolver = RouteTemplateResolver(_resolver_app().routes)
+
+        assert resolver.resolve(f"{settings.API_PREFIX}/v1/health") == (
+            f"{settings.API_PREFIX}/v1/health"
+        )
+        assert resolver.resolve(f"{settings.API_PREFIX}/v1/jobs/abc-123") == (
+            f"{settings.API_PREFIX}/v1/jobs/{{job_id}}"
+        )
+
+    def test_earlier_parameterized_route_wins(self):
+        resolver = RouteTemplateResolver(_resolver_app().routes)
+
+        # Routed to job_id like the router does, not to the later static route
+        assert resolver.resolve(f"{settings.API_PREFIX}/v1/jobs/latest") == (
+            f"{settings.API_PREFIX}/v1/jobs/{{job_id}}"
+        )
+
+    @pytest.mark.parametrize("path", ["/wp-login.php", "/.env", "/api/v1/health/"])
+    def test_unknown_paths_collapse_to_one_label(self, path):
+        resolver = RouteTemplateResolver(_resolver_app().routes)
+
+        assert resolver.resolve(path) == UNMATCHED_ENDPOINT
+
+    def test_excluded_paths_match_under_api_prefix(self):
+        app = _resolver_app()
+        resolver = RouteTemplateResolver(app.routes, ["/health", "/metrics", "/docs"])
+
+        assert resolver.is_excluded(f"{settings.API_PREFIX}/v1/health")
+        assert resolver.is_excluded("/docs")
+        assert not resolver.is_excluded(f"{settings.API_PREFIX}/v1/metrics-summary")
+        assert not resolver.is_excluded(f"{settings.API_PREFIX}/v1/jobs/{{job_id}}")
+        assert not resolver.is_excluded(UNMATCHED_ENDPOINT)
+
+    def test_middleware_labels_metrics_with_route_templates(self, mw_client):
+        templated = http_requests_total.labels(
+            method="GET", endpoint="/mw/items/{item_id}", status_code="200"
+        )
+        unmatched = http_requests_total.labels(
+            method="GET", endpoint=UNMATCHED_ENDPOINT, status_code="404"
+        )
+        before = templated._value.get(), unmatched._value.get()
+
+        mw_client.get("/mw/items/1")
+        mw_client.get("/mw/items/2")
+        mw_client.get("/scanner/probe-1")
+        mw_client.get("/scanner/probe-2")
+
+        assert templated._value.get() == before[0] + 2
+        assert unmatched._value.get() == before[1] + 2
+
+    def test_app_health_endpoint_is_not_measured(self, client):
+        health = f"{settings.API_PREFIX}/v1/health"
+        before = http_request_duration_seconds.labels(
+            method="GET", endpoint=health
+        )._sum.get()
+
+        client.get(health)
+
+        after = http_request_duration_seconds.labels(
+            method="GET", endpoint=health
+        )._sum.get()
+        assert after == before
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,296 @@
+"""
+Tests for provider circuit breakers and the multi-provider fallback chain.
+"""
+
+from unittest.mock import Mock
+
+import httpx
+import openai
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.config.settings import settings
+from src.observability.metrics import ai_circuit_breaker_state
+from src.providers.ai.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from src.providers.ai.fallback_chat_model import (
+    FallbackChatModel,
+    is_retryable_error,
+)
+from src.providers.ai import langchain_model_loader as loader_module
+from src.providers.ai.langchain_model_loader import LangchainModelLoader
+from src.providers.ai.managed_chat_model import ManagedChatModel
+
+
+@pytest.fixture(autouse=True)
+def clean_breakers(monkeypatch):
+    monkeypatch.setattr(settings, "AI_BREAKER_MIN_CALLS", 4)
+    monkeypatch.setattr(settings, "AI_BREAKER_WINDOW_SIZE", 4)
+    monkeypatch.setattr(settings, "AI_BREAKER_OPEN_SECONDS", 60.0)
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+class ProviderError(Exception):
+    """Provider response with an HTTP status, like the SDK errors."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _openai_error(cls, status_code):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return cls("error", response=response, body=None)
+
+
+class ScriptedModel(BaseChatModel):
+    """Answers with its name, or raises `error` when set."""
+
+    name: str
+    error: Exception | None = None
+    calls: int = 0
+    seen_kwargs: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[f"{self.name}:{tool}" for tool in tools])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        self.seen_kwargs.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        message = AIMessage(content=self.name)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _chain(primary_error=None):
+    primary = ScriptedModel(name="openai", error=primary_error, seen_kwargs=[])
+    secondary = ScriptedModel(name="google", seen_kwargs=[])
+    model = FallbackChatModel(
+        candidates=[primary, secondary], providers=["openai", "google"]
+    )
+    return model, primary, secondary
+
+
+def _breaker(**kwargs):
+    options = dict(failure_rate=0.5, slow_call_seconds=1.0, window_size=4, min_calls=4)
+    options.update(kwargs)
+    return CircuitBreaker("test-provider", **options)
+
+
+class TestCircuitBreaker:
+    def test_opens_on_error_rate(self):
+        breaker = _breaker(open_seconds=60)
+        for ok in (True, False, True):
+            breaker.record_success() if ok else breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert not breaker.allow_request()
+        gauge = ai_circuit_breaker_state.labels(provider="test-provider")
+        assert gauge._value.get() == 2
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = _breaker(open_seconds=60)
+        for _ in range(4):
+            breaker.record_success(duration=5.0)
+
+        assert breaker.state == "open"
+
+    def test_explicit_zero_options_are_kept(self):
+        breaker = _breaker(slow_call_seconds=0.0, half_open_calls=0)
+
+        assert breaker.slow_call_seconds == 0.0
+        assert breaker.half_open_calls == 0
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = _breaker(open_seconds=0, half_open_calls=1)
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_failure_reopens(self):
+        breaker = _breaker(open_seconds=0)
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.open_seconds = 60
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+
+    def test_cancelled_probe_is_given_back(self):
+        breaker = _breaker(open_seconds=0, half_open_calls=1)
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.record_cancelled()
+
+        assert breaker.allow_request()
+
+
+class TestFallbackChatModel:
+    @pytest.mark.asyncio
+    async def test_primary_serves_when_healthy(self):
+        model, _, secondary = _chain()
+
+        assert (await model.ainvoke("hi")).content == "openai"
+        assert secondary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_falls_back_to_secondary(self):
+        model, _, _ = _chain(primary_error=ProviderError(503))
+
+        assert (await model.ainvoke("hi")).content == "google"
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_primary_without_calling_it(self):
+        model, primary, _ = _chain(primary_error=ProviderError(503))
+        for _ in range(4):
+            await model.ainvoke("hi")
+        assert get_circuit_breaker("openai").state == "open"
+        calls = primary.calls
+
+        assert (await model.ainvoke("hi")).content == "google"
+        assert primary.calls == calls
+
+    @pytest.mark.asyncio
+    async def test_all_breakers_open_fails_fast(self):
+        model, _, _ = _chain()
+        for provider in ("openai", "google"):
+            breaker = get_circuit_breaker(provider)
+            for _ in range(4):
+                breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            await model.ainvoke("hi")
+
+    @pytest.mark.asyncio
+    async def test_last_error_is_raised_when_every_provider_fails(self):
+        model, _, secondary = _chain(primary_error=ProviderError(503))
+        secondary.error = TimeoutError("also down")
+
+        with pytest.raises(TimeoutError):
+            await model.ainvoke("hi")
+
+    @pytest.mark.asyncio
+    async def test_tools_are_bound_per_provider(self):
+        model, primary, secondary = _chain(primary_error=ProviderError(503))
+
+        await model.bind_tools(["search"]).ainvoke("hi")
+
+        assert primary.seen_kwargs[0]["tools"] == ["openai:search"]
+        assert secondary.seen_kwargs[0]["tools"] == ["google:search"]
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_raised_without_fallback(self):
+        model, primary, secondary = _chain(primary_error=ProviderError(400))
+
+        for _ in range(4):
+            with pytest.raises(ProviderError):
+                await model.ainvoke("hi")
+
+        assert secondary.calls == 0
+        assert get_circuit_breaker("openai").state == "closed"
+
+    @pytest.mark.parametrize(
+        "error, retryable",
+        [
+            (TimeoutError(), True),
+            (ConnectionResetError(), True),
+            (ProviderError(429), True),
+            (ProviderError(502), True),
+            (ProviderError(401), False),
+            (ProviderError(404), False),
+            (ValueError("bad output"), False),
+            (
+                openai.APITimeoutError(
+                    request=httpx.Request("POST", "https://api.openai.com")
+                ),
+                True,
+            ),
+            (_openai_error(openai.RateLimitError, 429), True),
+            (_openai_error(openai.InternalServerError, 500), True),
+            # What a context-length overflow is raised as
+            (_openai_error(openai.BadRequestError, 400), False),
+            (_openai_error(openai.AuthenticationError, 401), False),
+        ],
+    )
+    def test_retryable_errors(self, error, retryable):
+        assert is_retryable_error(error) is retryable
+
+
+class TestLoaderChain:
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(LangchainModelLoader, "_instance", None)
+        monkeypatch.setattr(settings, "OPENAI_MODEL_BASIC", "gpt-4o-mini")
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(settings, "GOOGLE_MODEL_BASIC", "gemini-2.0-flash")
+        monkeypatch.setattr(settings, "AI_PROVIDER_ORDER", ["openai", "google"])
+        return LangchainModelLoader()
+
+    def test_configured_providers_are_chained_in_order(self, loader, monkeypatch):
+        google = ScriptedModel(name="google")
+        monkeypatch.setattr(loader, "init_model_google_basic", lambda **kwargs: google)
+
+        model = loader.init_model_basic()
+
+        assert isinstance(model, FallbackChatModel)
+        assert model.providers == ["openai", "google"]
+        assert model.candidates[1] is google
+
+    def test_missing_provider_package_is_skipped(self, loader, monkeypatch):
+        def missing(**kwargs):
+            raise ImportError("langchain-google-genai is not installed")
+
+        monkeypatch.setattr(loader, "init_model_google_basic", missing)
+        warning = Mock()
+        monkeypatch.setattr(loader_module.logger, "warning", warning)
+
+        assert isinstance(loader.init_model_basic(), ManagedChatModel)
+        message = warning.call_args.args[0]
+        assert "google" in message and "AI_PROVIDER_ORDER" in message
+
+    def test_fallback_disabled_uses_first_provider_only(self, loader, monkeypatch):
+        monkeypatch.setattr(settings, "AI_FALLBACK_ENABLED", False)
+
+        assert isinstance(loader.init_model_basic(), ManagedChatModel)
+
+
+class TestHealthReportsBreakers:
+    def test_open_breaker_degrades_health(self, client):
+        breaker = get_circuit_breaker("openai")
+        for _ in range(4):
+            breaker.record_failure()
+
+        data = client.get("/api/v1/health").json()["data"]
+
+        assert data["status"] == "degraded"
+        assert data["dependencies"]["ai_providers"] == {"openai": "open"}
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,168 @@
+"""
+Tests for cancelling agent work when the client disconnects.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.api.endpoints.v1.dependencies import get_response_cache, get_sample_agent
+from src.api.main import app
+from src.config.settings import settings
+from src.core.exceptions import ClientDisconnectedException
+from src.execution.actions.sample_action import SampleAction
+from src.observability.metrics import agent_executions_total
+from src.utils.disconnect import cancel_on_disconnect
+
+
+def _executions(agent_name: str, status: str) -> float:
+    return agent_executions_total.labels(
+        agent_name=agent_name, status=status
+    )._value.get()
+
+
+class _BlockingAgent:
+    """Agent whose run blocks until released, recording whether it was cancelled."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def ainvoke(self, *args, **kwargs):
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+        class _Message:
+            content = "done"
+
+        return {"messages": [_Message()]}
+
+
+def _receive_disconnect_on(event: asyncio.Event, body: bytes = b""):
+    """ASGI receive: the request body, then a disconnect once event is set."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await event.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+class TestCancelOnDisconnect:
+    @pytest.mark.asyncio
+    async def test_returns_result_when_client_stays(self):
+        never = asyncio.Event()
+
+        async def work():
+            await asyncio.sleep(0)
+            return "result"
+
+        result = await cancel_on_disconnect(_receive_disconnect_on(never), work())
+
+        assert result == "result"
+
+    @pytest.mark.asyncio
+    async def test_work_errors_propagate(self):
+        async def work():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await cancel_on_disconnect(_receive_disconnect_on(asyncio.Event()), work())
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_work(self):
+        disconnected = asyncio.Event()
+        cancelled = False
+
+        async def work():
+            nonlocal cancelled
+            disconnected.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with pytest.raises(ClientDisconnectedException) as exc_info:
+            await cancel_on_disconnect(_receive_disconnect_on(disconnected), work())
+
+        assert cancelled
+        assert exc_info.value.status_code == 499
+
+
+class TestSampleActionCancellation:
+    @pytest.mark.asyncio
+    async def test_cancelled_run_is_recorded(self):
+        agent = _BlockingAgent()
+        action = SampleAction(agent=agent, agent_name="test_cancel_agent")
+
+        task = asyncio.create_task(action.execute("Hi"))
+        await agent.started.wait()
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert agent.cancelled
+        assert _executions("test_cancel_agent", "cancelled") == 1
+        assert _executions("test_cancel_agent", "success") == 0
+
+    @pytest.mark.asyncio
+    async def test_completed_run_is_recorded(self):
+        agent = _BlockingAgent()
+        agent.release.set()
+        action = SampleAction(agent=agent, agent_name="test_success_agent")
+
+        assert await action.execute("Hi") == "done"
+        assert _executions("test_success_agent", "success") == 1
+
+
+class TestAgentEndpointDisconnect:
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_agent_run(self):
+        agent = _BlockingAgent()
+        app.dependency_overrides[get_sample_agent] = lambda: agent
+        app.dependency_overrides[get_response_cache] = lambda: None
+        body = json.dumps({"query": "disconnect me"}).encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/v1/agent/execute",
+            "raw_path": b"/api/v1/agent/execute",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"x-api-key", (settings.X_API_KEY or "test-api-key").encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        before = _executions("sample_agent", "cancelled")
+        await asyncio.wait_for(
+            app(scope, _receive_disconnect_on(agent.started, body), send), timeout=5
+        )
+
+        assert agent.cancelled
+        assert _executions("sample_agent", "cancelled") == before + 1
+        assert sent[0]["type"] == "http.response.start"
+        assert sent[0]["status"] == 499
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,378 @@
+"""
+Tests for conversation threads: message window, checkpoint batching and the
+thread_id request flow.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.agents.memory.message_window import build_message_window
+from src.api.endpoints.v1.dependencies import (
+    get_checkpointer,
+    get_model_router,
+    get_response_cache,
+    get_sample_agent,
+)
+from src.api.main import app
+from src.database.checkpoint_store import (
+    checkpoint_writes_table,
+    checkpoints_table,
+    prune_checkpoints,
+)
+from src.database.checkpointer import SQLAlchemyCheckpointSaver
+from src.execution.actions.sample_action import SampleAction
+
+
+class RecordingChatModel(GenericFakeChatModel):
+    """Fake model that remembers how many messages each call received."""
+
+    seen: list = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.seen.append(len(messages))
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def _agent(model):
+    return create_react_agent(
+        model,
+        tools=[],
+        prompt="You are helpful.",
+        pre_model_hook=build_message_window(),
+    )
+
+
+class TestMessageWindow:
+    def test_short_history_is_untouched(self):
+        window = build_message_window(max_tokens=1000)
+
+        assert window({"messages": [HumanMessage(content="hi")]}) == {}
+
+    def test_old_turns_are_dropped(self):
+        window = build_message_window(max_tokens=60)
+        messages = [SystemMessage(content="sys")]
+        for i in range(10):
+            messages += [
+                HumanMessage(content=f"question {i} " * 5),
+                AIMessage(content=f"answer {i} " * 5),
+            ]
+
+        update = window({"messages": messages})
+
+        kept = update["messages"][1:]
+        assert kept[0].type == "system"
+        assert kept[1].type == "human"
+        assert kept[-1].content == messages[-1].content
+        assert len(kept) < len(messages)
+
+    def test_oversized_turn_is_kept_whole(self):
+        window = build_message_window(max_tokens=5)
+        messages = [
+            HumanMessage(content="old"),
+            AIMessage(content="reply"),
+            HumanMessage(content="a very long question " * 20),
+        ]
+
+        update = window({"messages": messages})
+
+        assert [m.content for m in update["messages"][1:]] == [messages[-1].content]
+
+
+class TestThreadEndpoint:
+    @pytest.fixture
+    def agent(self):
+        model = RecordingChatModel(
+            messages=(AIMessage(content=f"answer {i}") for i in range(100)), seen=[]
+        )
+        agent = _agent(model)
+        app.dependency_overrides[get_sample_agent] = lambda: agent
+        app.dependency_overrides[get_response_cache] = lambda: None
+        app.dependency_overrides[get_model_router] = lambda: None
+        return model
+
+    def test_thread_keeps_history(self, client, agent):
+        saver = InMemorySaver()
+        app.dependency_overrides[get_checkpointer] = lambda: saver
+
+        for query in ("first", "second"):
+            response = client.post(
+                "/api/v1/agent/execute", json={"query": query, "thread_id": "t-1"}
+            )
+            assert response.status_code == 200
+
+        # system + first turn + second question
+        assert agent.seen == [2, 4]
+        assert response.json()["data"]["response"] == "answer 1"
+
+    def test_requests_without_thread_are_stateless(self, client, agent):
+        app.dependency_overrides[get_checkpointer] = lambda: InMemorySaver()
+
+        client.post("/api/v1/agent/execute", json={"query": "first"})
+        client.post("/api/v1/agent/execute", json={"query": "second"})
+
+        assert agent.seen == [2, 2]
+
+    def test_thread_requires_memory_enabled(self, client, agent):
+        app.dependency_overrides[get_checkpointer] = lambda: None
+
+        response = client.post(
+            "/api/v1/agent/execute", json={"query": "hi", "thread_id": "t-1"}
+        )
+
+        assert response.status_code == 422
+        assert response.json()["error"]["code"] == "THREADS_DISABLED"
+
+
+def _session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+class TestSQLAlchemyCheckpointSaver:
+    @pytest.fixture
+    def session(self):
+        session = AsyncMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def saver(self, session):
+        saver = SQLAlchemyCheckpointSaver(
+            session_factory=_session_factory(session),
+            flush_interval=60,
+            max_pending=100,
+        )
+        saver._tables_ready = True
+        return saver
+
+    @staticmethod
+    def _checkpoint(checkpoint_id):
+        return {
+            "v": 4,
+            "id": checkpoint_id,
+            "ts": "2024-01-01T00:00:00+00:00",
+            "channel_values": {"messages": [HumanMessage(content="hi")]},
+            "channel_versions": {"messages": 1},
+            "versions_seen": {},
+        }
+
+    @pytest.mark.asyncio
+    async def test_writes_are_buffered_and_flushed_in_one_batch(self, saver, session):
+        for i in range(3):
+            config = {"configurable": {"thread_id": f"t-{i}", "checkpoint_ns": ""}}
+            saved = await saver.aput(config, self._checkpoint(f"c-{i}"), {}, {})
+            await saver.aput_writes(saved, [("messages", "x"), ("other", 1)], "task")
+
+        assert session.execute.await_count == 0
+        assert saver.pending_count == 9
+
+        await saver.aflush()
+
+        # One executemany for the checkpoints, one for the writes
+        assert session.execute.await_count == 2
+        checkpoint_rows = session.execute.await_args_list[0].args[1]
+        write_rows = session.execute.await_args_list[1].args[1]
+        assert [r["checkpoint_id"] for r in checkpoint_rows] == ["c-0", "c-1", "c-2"]
+        assert len(write_rows) == 6
+        session.commit.assert_awaited_once()
+        assert saver.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_buffer_is_full(self, saver, session):
+        saver.max_pending = 2
+        config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+
+        await saver.aput(config, self._checkpoint("c-0"), {}, {})
+        assert session.execute.await_count == 0
+        await saver.aput(config, self._checkpoint("c-1"), {}, {})
+
+        assert session.execute.await_count == 1
+        assert saver.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rows(self, saver, session):
+        session.execute.side_effect = RuntimeError("database down")
+        config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        await saver.aput(config, self._checkpoint("c-0"), {}, {})
+
+        with pytest.raises(RuntimeError):
+            await saver.aflush()
+
+        assert saver.pending_count == 1
+
+    def test_upsert_compiles_for_postgres(self):
+        stmt = SQLAlchemyCheckpointSaver._upsert(checkpoints_table)
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id) DO UPDATE" in sql
+
+
+def _checkpoint(checkpoint_id):
+    return {
+        "v": 4,
+        "id": checkpoint_id,
+        "ts": "2024-01-01T00:00:00+00:00",
+        "channel_values": {"messages": [HumanMessage(content="hi")]},
+        "channel_versions": {"messages": 1},
+        "versions_seen": {},
+    }
+
+
+class TestSQLAlchemyCheckpointSaverOnSQLite:
+    """The saver and pruning against a real (in-memory SQLite) database."""
+
+    @pytest.fixture
+    async def sessions(self):
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+        )
+        yield async_sessionmaker(bind=engine, expire_on_commit=False)
+        await engine.dispose()
+
+    @pytest.fixture
+    def saver(self, sessions):
+        return SQLAlchemyCheckpointSaver(
+            session_factory=sessions, flush_interval=60, max_pending=100
+        )
+
+    @staticmethod
+    async def _put_chain(saver, thread_id, count, step=0):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        for i in range(count):
+            config = await saver.aput(
+                config, _checkpoint(f"{thread_id}-{i}"), {"step": step + i}, {}
+            )
+            await saver.aput_writes(config, [("messages", f"write {i}")], "task")
+        return config
+
+    @staticmethod
+    async def _count(sessions, table):
+        async with sessions() as session:
+            return (
+                await session.execute(select(func.count()).select_from(table))
+            ).scalar()
+
+    @pytest.mark.asyncio
+    async def test_get_tuple_round_trips_through_the_database(self, saver, sessions):
+        await self._put_chain(saver, "t", 2)
+        await saver.aflush()
+        reader = SQLAlchemyCheckpointSaver(session_factory=sessions)
+
+        item = await reader.aget_tuple({"configurable": {"thread_id": "t"}})
+
+        assert item.config["configurable"]["checkpoint_id"] == "t-1"
+        assert item.checkpoint["channel_values"]["messages"][0].content == "hi"
+        assert item.metadata["step"] == 1
+        assert item.parent_config["configurable"]["checkpoint_id"] == "t-0"
+        assert item.pending_writes == [("task", "messages", "write 1")]
+
+    @pytest.mark.asyncio
+    async def test_get_tuple_by_id_and_unknown_thread(self, saver):
+        await self._put_chain(saver, "t", 2)
+
+        first = await saver.aget_tuple(
+            {"configurable": {"thread_id": "t", "checkpoint_id": "t-0"}}
+        )
+        missing = await saver.aget_tuple({"configurable": {"thread_id": "other"}})
+
+        assert first.parent_config is None
+        assert first.pending_writes == [("task", "messages", "write 0")]
+        assert missing is None
+
+    @pytest.mark.asyncio
+    async def test_list_orders_filters_and_limits(self, saver):
+        await self._put_chain(saver, "t", 4)
+        await self._put_chain(saver, "u", 1)
+        thread = {"configurable": {"thread_id": "t"}}
+
+        def ids(items):
+            return [i.config["configurable"]["checkpoint_id"] for i in items]
+
+        everything = [i async for i in saver.alist(None)]
+        newest = [i async for i in saver.alist(thread, limit=2)]
+        before = [
+            i
+            async for i in saver.alist(
+                thread, before={"configurable": {"checkpoint_id": "t-2"}}
+            )
+        ]
+        filtered = [i async for i in saver.alist(thread, filter={"step": 1}, limit=1)]
+
+        assert ids(everything) == ["u-0", "t-3", "t-2", "t-1", "t-0"]
+        assert ids(newest) == ["t-3", "t-2"]
+        assert ids(before) == ["t-1", "t-0"]
+        assert ids(filtered) == ["t-1"]
+
+    @pytest.mark.asyncio
+    async def test_prune_keeps_newest_checkpoints_and_their_writes(
+        self, saver, sessions
+    ):
+        await self._put_chain(saver, "t", 3)
+        await self._put_chain(saver, "u", 2)
+        await saver.aflush()
+
+        deleted = await prune_checkpoints(sessions, keep_last=1)
+
+        remaining = [i async for i in saver.alist(None)]
+        assert deleted == 3
+        assert [i.config["configurable"]["checkpoint_id"] for i in remaining] == [
+            "u-1",
+            "t-2",
+        ]
+        assert await self._count(sessions, checkpoint_writes_table) == 2
+
+    @pytest.mark.asyncio
+    async def test_prune_drops_checkpoints_past_retention(self, saver, sessions):
+        await self._put_chain(saver, "old", 1)
+        await self._put_chain(saver, "new", 1)
+        await saver.aflush()
+        async with sessions() as session:
+            await session.execute(
+                update(checkpoints_table)
+                .where(checkpoints_table.c.thread_id == "old")
+                .values(created_at=func.datetime("now", "-30 days"))
+            )
+            await session.commit()
+
+        deleted = await prune_checkpoints(
+            sessions, keep_last=10, older_than=timedelta(days=7)
+        )
+
+        assert deleted == 1
+        assert await saver.aget_tuple({"configurable": {"thread_id": "old"}}) is None
+        assert await saver.aget_tuple({"configurable": {"thread_id": "new"}})
+
+    @pytest.mark.asyncio
+    async def test_thread_run_is_visible_to_another_worker(self, sessions):
+        model = GenericFakeChatModel(messages=iter([AIMessage(content="answer")]))
+        worker = SQLAlchemyCheckpointSaver(
+            session_factory=sessions, flush_interval=60, max_pending=100
+        )
+        action = SampleAction(_agent(model), checkpointer=worker)
+
+        await action.execute("first", thread_id="t-1")
+
+        assert worker.pending_count == 0
+        other_worker = SQLAlchemyCheckpointSaver(session_factory=sessions)
+        item = await other_worker.aget_tuple({"configurable": {"thread_id": "t-1"}})
+        contents = [m.content for m in item.checkpoint["channel_values"]["messages"]]
+        assert contents == ["first", "answer"]
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,206 @@
+"""
+Tests for the offline fake LLM provider: echo, canned and cassette replay.
+"""
+
+import json
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from src.agents.agent_manager.agent import SAMPLE_AGENT_SPEC
+from src.agents.agent_manager.manager import agent_manager
+from src.agents.tools.sample_tools import current_time
+from src.agents.tools.tool_executor import build_tool_node
+from src.api.endpoints.v1.dependencies import get_sample_agent
+from src.api.main import app
+from src.config.settings import settings
+from src.providers.ai.fake_chat_model import (
+    Cassette,
+    CassetteRecorder,
+    FakeChatModel,
+    LatencyModel,
+)
+from src.providers.ai.langchain_model_loader import LangchainModelLoader
+
+CASSETTE = {
+    "conversations": [
+        {
+            "input": "What time is it in Paris?",
+            "responses": [
+                {
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "name": "current_time",
+                            "args": {"timezone": "Europe/Paris"},
+                            "id": "call_1",
+                        }
+                    ],
+                    "usage_metadata": {
+                        "input_tokens": 80,
+                        "output_tokens": 12,
+                        "total_tokens": 92,
+                    },
+                },
+                {
+                    "content": "It is 10:04 in Paris.",
+                    "usage_metadata": {
+                        "input_tokens": 120,
+                        "output_tokens": 8,
+                        "total_tokens": 128,
+                    },
+                },
+            ],
+        },
+        {"responses": [{"content": "I can only tell the time."}]},
+    ]
+}
+
+
+@pytest.fixture
+def fake_loader(monkeypatch):
+    """A fresh loader in fake provider mode."""
+    monkeypatch.setattr(LangchainModelLoader, "_instance", None)
+    monkeypatch.setattr(settings, "AI_PROVIDER_MODE", "fake")
+    return LangchainModelLoader()
+
+
+class TestFakeChatModel:
+    def test_echo_repeats_the_last_user_message_with_usage(self):
+        model = FakeChatModel()
+
+        reply = model.invoke(
+            [SystemMessage(content="be nice"), HumanMessage(content="hello there")]
+        )
+
+        assert reply.content == "hello there"
+        assert reply.usage_metadata["output_tokens"] == 2
+        assert reply.usage_metadata["input_tokens"] == 4
+
+    def test_canned_response(self):
+        model = FakeChatModel(mode="canned", canned_response="always this")
+
+        assert model.invoke("anything").content == "always this"
+
+    @pytest.mark.asyncio
+    async def test_streaming_models_ttft_and_token_delay(self):
+        latency = LatencyModel(ttft=0.1, token_delay=0.02)
+        model = FakeChatModel(latency=latency)
+
+        start = time.perf_counter()
+        arrivals, text = [], ""
+        async for chunk in model.astream("one two three four"):
+            arrivals.append(time.perf_counter() - start)
+            text += chunk.content
+
+        assert text == "one two three four"
+        assert arrivals[0] >= 0.1
+        assert arrivals[-1] >= 0.1 + 3 * 0.02
+
+    def test_seeded_latency_repeats(self):
+        first = LatencyModel(ttft=0.2, jitter=0.5, seed=7)
+        second = LatencyModel(ttft=0.2, jitter=0.5, seed=7)
+
+        samples = [first.sample_ttft() for _ in range(5)]
+
+        assert samples == [second.sample_ttft() for _ in range(5)]
+        assert len(set(samples)) == 5
+
+
+class TestCassetteReplay:
+    @pytest.mark.asyncio
+    async def test_replays_tool_calls_and_usage_through_an_agent(self):
+        model = FakeChatModel(mode="cassette", cassette=Cassette(**CASSETTE))
+        agent = create_react_agent(
+            model, tools=build_tool_node([tool(current_time)], "cassette-agent")
+        )
+
+        result = await agent.ainvoke(
+            {"messages": [("user", "What time is it in Paris?")]}
+        )
+
+        messages = result["messages"]
+        assert messages[1].tool_calls[0]["args"] == {"timezone": "Europe/Paris"}
+        assert messages[2].type == "tool"
+        assert messages[-1].content == "It is 10:04 in Paris."
+        assert messages[-1].usage_metadata["total_tokens"] == 128
+
+    @pytest.mark.asyncio
+    async def test_streamed_replay_keeps_tool_calls(self):
+        model = FakeChatModel(mode="cassette", cassette=Cassette(**CASSETTE))
+
+        chunks = [c async for c in model.astream("What time is it in Paris?")]
+        message = chunks[0]
+        for chunk in chunks[1:]:
+            message += chunk
+
+        assert message.tool_calls[0]["name"] == "current_time"
+        assert message.usage_metadata["input_tokens"] == 80
+
+    def test_unmatched_input_uses_the_catch_all_conversation(self):
+        model = FakeChatModel(mode="cassette", cassette=Cassette(**CASSETTE))
+
+        assert model.invoke("Hi").content == "I can only tell the time."
+
+    def test_recorded_conversation_replays(self, tmp_path):
+        live = GenericFakeChatModel(
+            messages=iter([AIMessage(content="recorded answer")])
+        )
+        recorder = CassetteRecorder()
+        live.invoke("question", config={"callbacks": [recorder]})
+        path = tmp_path / "cassette.json"
+        recorder.save(str(path))
+
+        replay = FakeChatModel(mode="cassette", cassette=Cassette.load(str(path)))
+
+        assert json.loads(path.read_text())["conversations"][0]["input"] == "question"
+        assert replay.invoke("question").content == "recorded answer"
+
+
+class TestFakeProviderMode:
+    def test_loader_returns_managed_fake_models(self, fake_loader):
+        basic = fake_loader.init_model_basic()
+        reasoning = fake_loader.init_model_reasoning()
+
+        assert basic is fake_loader.init_model_basic()
+        assert basic.model_name == "fake-basic"
+        assert reasoning.model_name == "fake-reasoning"
+        assert isinstance(basic.inner, FakeChatModel)
+
+    def test_loader_replays_the_configured_cassette(
+        self, fake_loader, monkeypatch, tmp_path
+    ):
+        path = tmp_path / "cassette.json"
+        path.write_text(json.dumps(CASSETTE))
+        monkeypatch.setattr(settings, "AI_FAKE_RESPONSE_MODE", "cassette")
+        monkeypatch.setattr(settings, "AI_FAKE_CASSETTE_PATH", str(path))
+
+        model = fake_loader.init_model_basic()
+
+        assert model.invoke("Hi").content == "I can only tell the time."
+
+    def test_streaming_endpoint_runs_offline(self, fake_loader, client):
+        # A fresh graph, so the agent is built on the fake loader
+        app.dependency_overrides[get_sample_agent] = lambda: agent_manager.build(
+            SAMPLE_AGENT_SPEC
+        )
+
+        response = client.post(
+            "/api/v1/agent/execute/stream", json={"query": "ping from the laptop"}
+        )
+
+        events = [
+            (block.split("\n")[0][len("event: ") :], block)
+            for block in response.text.strip().split("\n\n")
+        ]
+        assert events[-1][0] == "done"
+        done = json.loads(events[-1][1].split("data: ", 1)[1])
+        assert done["response"] == "ping from the laptop"
+        assert done["usage"]["llm_calls"] == 1
+
+
+pytestmark = pytest.mark.unit
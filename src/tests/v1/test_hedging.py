@@ -0,0 +1,146 @@
+"""
+Tests for hedged LLM requests.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.observability.metrics import ai_hedges_fired_total, ai_hedges_won_total
+from src.providers.ai.hedging import HedgeBudget, HedgePolicy
+from src.providers.ai.model_stats import get_model_stats, reset_model_stats
+
+MODEL = "hedge-test-model"
+
+
+@pytest.fixture(autouse=True)
+def warm_stats():
+    """Twenty recent calls of 50ms: the live p95 delay is 50ms."""
+    reset_model_stats()
+    stats = get_model_stats(MODEL)
+    for _ in range(20):
+        stats.record(0.05)
+    yield
+    reset_model_stats()
+
+
+def _policy(ratio=1.0):
+    budget = HedgeBudget(ratio)
+    return HedgePolicy(budget, percentile=95, min_samples=10, min_delay=0.0)
+
+
+class _Calls:
+    """Serves one scripted (delay, result) pair per call."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        delay, result = self.script[self.started]
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestHedgeBudget:
+    def test_hedges_are_a_fraction_of_requests(self):
+        budget = HedgeBudget(0.25)
+
+        allowed = 0
+        for _ in range(100):
+            budget.on_request()
+            allowed += budget.try_spend()
+
+        assert allowed == 25
+
+
+class TestHedgePolicy:
+    @pytest.mark.asyncio
+    async def test_fast_call_is_not_hedged(self):
+        calls = _Calls((0.0, "primary"))
+
+        assert await _policy().run(MODEL, calls) == "primary"
+        assert calls.started == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        fired = ai_hedges_fired_total.labels(model=MODEL)
+        won = ai_hedges_won_total.labels(model=MODEL)
+        fired_before, won_before = fired._value.get(), won._value.get()
+        calls = _Calls((5.0, "primary"), (0.0, "hedge"))
+
+        start = time.monotonic()
+        result = await _policy().run(MODEL, calls)
+
+        assert result == "hedge"
+        assert time.monotonic() - start < 1.0
+        await asyncio.sleep(0)
+        assert calls.cancelled == 1
+        assert fired._value.get() == fired_before + 1
+        assert won._value.get() == won_before + 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_budget(self):
+        calls = _Calls((0.15, "primary"), (0.0, "hedge"))
+
+        assert await _policy(ratio=0.0).run(MODEL, calls) == "primary"
+        assert calls.started == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_samples(self):
+        reset_model_stats()
+        calls = _Calls((0.15, "primary"), (0.0, "hedge"))
+
+        assert await _policy().run(MODEL, calls) == "primary"
+        assert calls.started == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_call_falls_back_to_the_other(self):
+        calls = _Calls((0.1, RuntimeError("boom")), (0.2, "hedge"))
+
+        assert await _policy().run(MODEL, calls) == "hedge"
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self):
+        calls = _Calls((0.1, RuntimeError("primary")), (0.1, RuntimeError("hedge")))
+
+        with pytest.raises(RuntimeError, match="primary"):
+            await _policy().run(MODEL, calls)
+
+    @pytest.mark.asyncio
+    async def test_delay_counts_from_start_signal(self):
+        started = asyncio.Event()
+        calls = _Calls((0.02, "primary"), (0.0, "hedge"))
+
+        async def queued_call():
+            if not started.is_set():
+                # Queued well past the 50ms delay before the call really starts
+                await asyncio.sleep(0.2)
+                started.set()
+            return await calls()
+
+        result = await _policy().run(MODEL, queued_call, started=started)
+
+        assert result == "primary"
+        assert calls.started == 1
+
+    @pytest.mark.asyncio
+    async def test_vetoed_hedge_is_not_sent(self):
+        calls = _Calls((0.15, "primary"), (0.0, "hedge"))
+
+        result = await _policy().run(MODEL, calls, can_hedge=lambda: False)
+
+        assert result == "primary"
+        assert calls.started == 1
+
+
+pytestmark = pytest.mark.unit
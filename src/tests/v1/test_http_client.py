@@ -0,0 +1,84 @@
+"""
+Tests for the shared outbound HTTP client provider.
+"""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.observability.metrics import (
+    http_client_pool_connections,
+    http_client_requests_in_flight,
+)
+from src.providers.http import http_client
+from src.providers.http.http_client import (
+    _InstrumentedTransport,
+    close_http_clients,
+    get_async_http_client,
+)
+
+
+def _gauge(metric, **labels) -> float:
+    return metric.labels(**labels)._value.get()
+
+
+class TestSharedClients:
+    @pytest.mark.asyncio
+    async def test_one_client_per_name(self):
+        llm = get_async_http_client("test_llm")
+
+        assert get_async_http_client("test_llm") is llm
+        assert get_async_http_client("test_tools") is not llm
+
+        await close_http_clients()
+        assert llm.is_closed
+        assert get_async_http_client("test_llm") is not llm
+        await close_http_clients()
+
+    def test_limits_and_timeouts_from_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_MAX_CONNECTIONS", 7)
+        monkeypatch.setattr(settings, "HTTP_CONNECT_TIMEOUT", 1.5)
+
+        client = http_client._build_client("test_settings")
+
+        pool = client._transport._transport._pool
+        assert pool._max_connections == 7
+        assert client.timeout.connect == 1.5
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP2_ENABLED", True)
+        monkeypatch.setattr(http_client.importlib.util, "find_spec", lambda name: None)
+
+        assert http_client._http2_enabled() is False
+
+
+class TestInstrumentedTransport:
+    @pytest.mark.asyncio
+    async def test_in_flight_gauge_returns_to_zero(self):
+        transport = _InstrumentedTransport(
+            "test_mock", httpx.MockTransport(lambda request: httpx.Response(200))
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("http://example.test/")
+
+        assert response.status_code == 200
+        assert _gauge(http_client_requests_in_flight, client="test_mock") == 0
+
+    def test_pool_stats_exported(self):
+        connections = [
+            SimpleNamespace(is_idle=lambda: True),
+            SimpleNamespace(is_idle=lambda: False),
+            SimpleNamespace(is_idle=lambda: False),
+        ]
+        inner = SimpleNamespace(_pool=SimpleNamespace(connections=connections))
+
+        _InstrumentedTransport("test_pool", inner)._record_pool_stats()
+
+        labels = {"client": "test_pool"}
+        assert _gauge(http_client_pool_connections, state="idle", **labels) == 1
+        assert _gauge(http_client_pool_connections, state="active", **labels) == 2
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,193 @@
+"""
+Tests for pooled MCP tool server sessions, run against a local stdio server.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents.tools.mcp_tools import get_mcp_tools, mount_mcp_servers
+from src.agents.tools.registry import ToolRegistry, tool_registry
+from src.api.main import app
+from src.config.settings import settings
+from src.observability.metrics import mcp_requests_total, mcp_sessions_open
+from src.providers.mcp.mcp_client import MCPClient, MCPServer
+
+STUB_SERVER = {
+    "transport": "stdio",
+    "command": sys.executable,
+    "args": [str(Path(__file__).with_name("mcp_stub_server.py"))],
+}
+
+
+@asynccontextmanager
+async def _server(pool_size=1, on_tools_changed=None):
+    server = MCPServer("stub", STUB_SERVER, pool_size, on_tools_changed)
+    await server.start()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+def _tool(server, name):
+    return next(t for t in server.get_tools() if t.name == name)
+
+
+def _text(content):
+    return content[0]["text"]
+
+
+class TestMCPServer:
+    @pytest.mark.asyncio
+    async def test_tools_are_listed_with_server_prefix(self):
+        async with _server() as server:
+            names = [t.name for t in server.get_tools()]
+            result = await _tool(server, "stub_add").ainvoke({"a": 1, "b": 2})
+
+        assert names == ["stub_add", "stub_pid", "stub_fail", "stub_grow"]
+        assert _text(result) == "3"
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_kept_alive_across_calls(self):
+        async with _server(pool_size=1) as server:
+            pid = _tool(server, "stub_pid")
+            first = await pid.ainvoke({})
+            second = await pid.ainvoke({})
+
+            assert _text(first) == _text(second)
+            assert mcp_sessions_open.labels(server="stub")._value.get() == 1
+
+        assert mcp_sessions_open.labels(server="stub")._value.get() == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_are_recorded_per_server(self):
+        def count(status):
+            return mcp_requests_total.labels(
+                server="stub", operation="call_tool", status=status
+            )._value.get()
+
+        successes, errors = count("success"), count("error")
+        async with _server() as server:
+            await _tool(server, "stub_add").ainvoke({"a": 1, "b": 1})
+            with pytest.raises(Exception, match="stub failure"):
+                await _tool(server, "stub_fail").ainvoke({})
+
+        assert count("success") == successes + 1
+        assert count("error") == errors + 1
+
+    @pytest.mark.asyncio
+    async def test_tool_list_change_refreshes_cached_tools(self):
+        changed = asyncio.Event()
+        async with _server(on_tools_changed=lambda _: changed.set()) as server:
+            await _tool(server, "stub_grow").ainvoke({"name": "extra"})
+            await asyncio.wait_for(changed.wait(), 5)
+
+            result = await _tool(server, "stub_extra").ainvoke({})
+
+        assert _text(result) == "extra"
+
+    @pytest.mark.asyncio
+    async def test_broken_session_is_replaced(self):
+        async with _server(pool_size=1) as server:
+            pooled = next(iter(server._sessions))
+
+            async def broken(*args, **kwargs):
+                raise anyio.ClosedResourceError()
+
+            pooled.session.call_tool = broken
+            with pytest.raises(anyio.ClosedResourceError):
+                await _tool(server, "stub_add").ainvoke({"a": 1, "b": 1})
+
+            result = await _tool(server, "stub_add").ainvoke({"a": 2, "b": 2})
+
+            assert _text(result) == "4"
+            assert pooled not in server._sessions
+
+    @pytest.mark.asyncio
+    async def test_session_that_ends_while_pooled_is_replaced(self):
+        async with _server(pool_size=1) as server:
+            pooled = next(iter(server._sessions))
+            first = _text(await _tool(server, "stub_pid").ainvoke({}))
+
+            # What a transport task group does when the connection drops
+            holder = next(iter(server._holders))
+            holder.cancel()
+            await asyncio.wait([holder])
+            second = _text(await _tool(server, "stub_pid").ainvoke({}))
+
+            assert pooled.stop.is_set()
+            assert pooled not in server._sessions
+            assert second != first
+
+
+class TestMCPClient:
+    @pytest.mark.asyncio
+    async def test_unreachable_server_is_left_out(self):
+        client = MCPClient(
+            {
+                "stub": STUB_SERVER,
+                "missing": {**STUB_SERVER, "command": "/nonexistent/mcp-server"},
+            },
+            pool_size=1,
+            refresh_interval=0,
+        )
+        await client.start()
+        try:
+            assert client.started_servers() == ["stub"]
+            assert len(client.get_tools()) == 4
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_hung_server_is_left_out_after_startup_timeout(self):
+        hung = {**STUB_SERVER, "args": ["-c", "import time; time.sleep(60)"]}
+        client = MCPClient(
+            {"stub": STUB_SERVER, "hung": hung},
+            pool_size=1,
+            refresh_interval=0,
+            startup_timeout=3,
+        )
+        started = time.monotonic()
+        await client.start()
+        try:
+            assert client.started_servers() == ["stub"]
+            assert client.servers["hung"]._holders == set()
+            assert time.monotonic() - started < 15
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_mounted_servers_become_tool_sets(self):
+        registry = ToolRegistry()
+        client = MCPClient({"stub": STUB_SERVER}, pool_size=1, refresh_interval=0)
+        await client.start()
+        try:
+            mount_mcp_servers(client, registry)
+
+            assert registry.list_sets() == ["mcp:stub"]
+            assert len(get_mcp_tools(registry)) == 4
+        finally:
+            await client.close()
+
+
+class TestMCPLifespan:
+    def test_configured_servers_are_mounted_for_the_app_lifetime(self, monkeypatch):
+        monkeypatch.setattr(settings, "MCP_SERVERS", {"stub": STUB_SERVER})
+        monkeypatch.setattr(settings, "MCP_SESSION_POOL_SIZE", 1)
+
+        with TestClient(app):
+            names = [t.name for t in get_mcp_tools()]
+
+        assert "stub_add" in names
+        assert get_mcp_tools() == []
+        assert "mcp:stub" not in tool_registry.list_sets()
+
+
+pytestmark = pytest.mark.unit
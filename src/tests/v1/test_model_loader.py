@@ -0,0 +1,123 @@
+"""
+Tests for the config-keyed chat model cache in LangchainModelLoader.
+"""
+
+import pytest
+
+from src.config.settings import settings
+from src.providers.ai.langchain_model_loader import LangchainModelLoader
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """A fresh loader instance, isolated from the process-wide singleton."""
+    monkeypatch.setattr(LangchainModelLoader, "_instance", None)
+    monkeypatch.setattr(settings, "OPENAI_MODEL_BASIC", "gpt-4o-mini")
+    monkeypatch.setattr(settings, "OPENAI_MODEL_REASONING", "o3-mini")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    return LangchainModelLoader()
+
+
+class TestModelCache:
+    def test_same_config_reuses_instance(self, loader):
+        first = loader.init_model_openai_basic(temperature=0)
+        second = loader.init_model_openai_basic(temperature=0.0)
+
+        assert first is second
+        assert loader.cached_model_count() == 1
+
+    def test_different_config_gets_own_instance(self, loader):
+        cold = loader.init_model_openai_basic(temperature=0.0)
+        warm = loader.init_model_openai_basic(temperature=0.7)
+
+        assert cold is not warm
+        assert warm.inner.temperature == 0.7
+        assert loader.get_model("openai_basic") is warm
+
+    def test_cache_is_bounded(self, loader):
+        loader.max_cached_models = 2
+        first = loader.init_model_openai_basic(temperature=0.1)
+        loader.init_model_openai_basic(temperature=0.2)
+        loader.init_model_openai_reasoning(temperature=0.3)
+
+        assert loader.cached_model_count() == 2
+        assert loader.init_model_openai_basic(temperature=0.1) is not first
+
+    def test_normalize_config_handles_unhashable_values(self):
+        key = LangchainModelLoader._normalize_config({"b": [1, {"x": 2}], "a": {"y"}})
+
+        assert key == (("a", frozenset({"y"})), ("b", (1, (("x", 2),))))
+
+    @pytest.mark.asyncio
+    async def test_close_releases_clients(self, loader, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_SHARED_POOL_ENABLED", False)
+        model = loader.init_model_openai_basic()
+
+        await loader.close()
+
+        assert model.inner.root_async_client.is_closed()
+        assert loader.cached_model_count() == 0
+        assert loader.list_available_models() == []
+
+    @pytest.mark.asyncio
+    async def test_shared_http_pool_is_injected_and_not_closed(self, loader):
+        from src.providers.http.http_client import get_async_http_client
+
+        model = loader.init_model_openai_basic()
+        shared = get_async_http_client("llm")
+
+        assert model.inner.http_async_client is shared
+        assert loader.init_model_openai_reasoning().inner.http_async_client is shared
+
+        await loader.close()
+
+        assert not shared.is_closed
+
+
+class TestProviderRetries:
+    def test_provider_client_does_not_retry(self, loader):
+        model = loader.init_model_openai_basic()
+
+        assert model.inner.root_async_client.max_retries == 0
+
+    @pytest.mark.asyncio
+    async def test_single_429_reaches_the_limiter(self, loader, monkeypatch):
+        import httpx
+        from langchain_core.messages import HumanMessage
+
+        from src.providers.ai.rate_limiter import AdaptiveRateLimiter
+
+        monkeypatch.setattr(settings, "OPENAI_MODEL_BASIC", "gpt-429-test")
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(settings, "AI_MAX_CONCURRENCY_BASIC", 4)
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_MAX_RETRIES", 0)
+        monkeypatch.setattr(settings, "AI_HEDGING_ENABLED", False)
+        rate_limited = []
+        original = AdaptiveRateLimiter.on_rate_limited
+
+        def on_rate_limited(self, retry_after=None):
+            rate_limited.append(retry_after)
+            return original(self, retry_after)
+
+        monkeypatch.setattr(AdaptiveRateLimiter, "on_rate_limited", on_rate_limited)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                429,
+                headers={"retry-after": "0.01"},
+                json={"error": {"message": "Rate limit", "type": "rate_limit"}},
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            model = loader.init_model_openai_basic(http_async_client=http)
+            with pytest.raises(Exception) as exc_info:
+                await model.ainvoke([HumanMessage(content="hi")])
+
+        assert exc_info.value.status_code == 429
+        assert len(requests) == 1
+        assert rate_limited == [0.01]
+
+
+pytestmark = pytest.mark.unit
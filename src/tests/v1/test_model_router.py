@@ -0,0 +1,193 @@
+"""
+Tests for basic vs reasoning model routing.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agents.routing.model_router import ModelRouter
+from src.api.endpoints.v1.dependencies import (
+    get_model_router,
+    get_response_cache,
+    get_sample_action,
+    get_sample_agent,
+)
+from src.api.main import app
+from src.execution.actions.sample_action import SampleAction
+from src.observability.metrics import ai_model_routing_total
+from src.providers.ai import model_stats
+from src.providers.ai.model_stats import (
+    ModelStats,
+    get_model_stats,
+    reset_model_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_model_stats()
+    yield
+    reset_model_stats()
+
+
+def _router(**kwargs):
+    options = dict(
+        basic_model="basic-model",
+        reasoning_model="reasoning-model",
+        length_threshold=100,
+        max_p95_seconds=5.0,
+        max_error_rate=0.2,
+        min_samples=10,
+    )
+    options.update(kwargs)
+    return ModelRouter(**options)
+
+
+class TestModelRouter:
+    def test_short_query_goes_to_basic(self):
+        decision = _router().route("hello")
+
+        assert decision.tier == "basic"
+        assert decision.model == "basic-model"
+        assert decision.reason == "default"
+
+    def test_long_query_goes_to_reasoning(self):
+        decision = _router().route("x" * 100)
+
+        assert (decision.tier, decision.reason) == ("reasoning", "length")
+
+    def test_zero_threshold_is_kept(self):
+        decision = _router(length_threshold=0).route("hello")
+
+        assert (decision.tier, decision.reason) == ("reasoning", "length")
+
+    def test_hint_wins_over_features(self):
+        router = _router(classifier=lambda q: "basic")
+
+        decision = router.route("hi", hint="reasoning")
+
+        assert (decision.tier, decision.reason) == ("reasoning", "hint")
+
+    def test_classifier_overrides_length(self):
+        router = _router(classifier=lambda q: "reasoning" if "prove" in q else None)
+
+        assert router.route("prove it").reason == "classifier"
+        assert router.route("short").reason == "default"
+
+    def test_failing_classifier_is_ignored(self):
+        def classifier(query):
+            raise RuntimeError("boom")
+
+        assert _router(classifier=classifier).route("hi").tier == "basic"
+
+    def test_slow_reasoning_model_falls_back_to_basic(self):
+        stats = get_model_stats("reasoning-model")
+        for _ in range(10):
+            stats.record(9.0)
+
+        decision = _router().route("x" * 100)
+
+        assert (decision.tier, decision.reason) == ("basic", "reasoning_degraded")
+
+    def test_failing_reasoning_model_falls_back_to_basic(self):
+        stats = get_model_stats("reasoning-model")
+        for i in range(10):
+            stats.record(0.5, success=i % 2 == 0)
+
+        assert _router().route("x" * 100).reason == "reasoning_degraded"
+
+    def test_degraded_reasoning_model_recovers_once_samples_expire(self, monkeypatch):
+        now = [1000.0]
+        stats = ModelStats(window_size=200, max_age=60.0, clock=lambda: now[0])
+        monkeypatch.setitem(model_stats._stats, "reasoning-model", stats)
+        for _ in range(10):
+            stats.record(0.5, success=False)
+        router = _router()
+
+        # Routed away, the reasoning model gets no new samples...
+        now[0] += 30
+        assert router.route("x" * 100).reason == "reasoning_degraded"
+
+        # ...until the failure burst has aged out of the window
+        now[0] += 31
+        decision = router.route("x" * 100)
+        assert (decision.tier, decision.reason) == ("reasoning", "length")
+
+    def test_too_few_samples_do_not_degrade(self):
+        get_model_stats("reasoning-model").record(9.0)
+
+        assert _router().route("x" * 100).tier == "reasoning"
+
+    def test_unconfigured_reasoning_model_always_routes_basic(self):
+        decision = _router(reasoning_model=None).route("x", hint="reasoning")
+
+        assert (decision.tier, decision.reason) == ("basic", "reasoning_unavailable")
+
+    def test_decisions_are_counted(self):
+        counter = ai_model_routing_total.labels(tier="reasoning", reason="hint")
+        before = counter._value.get()
+
+        _router().route("hi", hint="reasoning")
+
+        assert counter._value.get() == before + 1
+
+
+class _NamedAgent:
+    def __init__(self, name):
+        self.name = name
+
+    async def ainvoke(self, state, config=None):
+        return {"messages": [AIMessage(content=self.name)]}
+
+
+class TestRoutedEndpoint:
+    @pytest.fixture
+    def agents(self):
+        basic, reasoning = _NamedAgent("basic"), _NamedAgent("reasoning")
+
+        def action():
+            return SampleAction(
+                agent=basic,
+                model_name="basic-model",
+                router=_router(),
+                get_reasoning_agent=lambda: reasoning,
+            )
+
+        app.dependency_overrides[get_sample_action] = action
+        return basic, reasoning
+
+    def test_model_hint_selects_reasoning_agent(self, client, agents):
+        response = client.post(
+            "/api/v1/agent/execute",
+            json={"query": "hi", "model_hint": "reasoning"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["response"] == "reasoning"
+
+    def test_routed_by_default(self, client, agents):
+        response = client.post("/api/v1/agent/execute", json={"query": "hi"})
+
+        assert response.json()["data"]["response"] == "basic"
+
+    def test_invalid_hint_is_rejected(self, client, agents):
+        response = client.post(
+            "/api/v1/agent/execute", json={"query": "hi", "model_hint": "huge"}
+        )
+
+        assert response.status_code == 422
+
+    def test_router_disabled_uses_default_agent(self, client):
+        app.dependency_overrides[get_sample_agent] = lambda: _NamedAgent("basic")
+        app.dependency_overrides[get_response_cache] = lambda: None
+        app.dependency_overrides[get_model_router] = lambda: None
+
+        response = client.post(
+            "/api/v1/agent/execute",
+            json={"query": "hi", "model_hint": "reasoning"},
+        )
+
+        assert response.json()["data"]["response"] == "basic"
+
+
+pytestmark = pytest.mark.unit
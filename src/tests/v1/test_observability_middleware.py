@@ -9,25 +9,26 @@ from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from fastapi import Request
 
 
-class TestObservabilityMiddleware:
-    """Test suite for ObservabilityMiddleware."""
+class TestRequestContextMiddleware:
+    """Test suite for RequestContextMiddleware."""
 
     @pytest.mark.asyncio
     async def test_middleware_adds_request_id(self):
         """Test that middleware adds request ID to response."""
         # This test verifies the middleware behavior conceptually
         # Full integration testing is done in e2e tests
-        from src.api.middlewares.observability import ObservabilityMiddleware
+        from src.api.middlewares.request_context import RequestContextMiddleware
 
         # Just verify the class exists and can be instantiated
-        assert ObservabilityMiddleware is not None
+        assert RequestContextMiddleware is not None
 
     def test_middleware_class_exists(self):
-        """Test that middleware class is importable."""
-        from src.api.middlewares.observability import ObservabilityMiddleware
+        """Test that middleware class is importable and pure ASGI."""
+        from src.api.middlewares.request_context import RequestContextMiddleware
         from starlette.middleware.base import BaseHTTPMiddleware
 
-        assert issubclass(ObservabilityMiddleware, BaseHTTPMiddleware)
+        assert not issubclass(RequestContextMiddleware, BaseHTTPMiddleware)
+        assert callable(RequestContextMiddleware(app=Mock()))
 
 
 class TestDatabaseMetricsMiddleware:
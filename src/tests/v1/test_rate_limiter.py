@@ -0,0 +1,188 @@
+"""
+Tests for the adaptive per-model LLM limiter and the chat model wrapper.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config.settings import settings
+from src.observability.metrics import ai_hedges_fired_total
+from src.providers.ai.hedging import HedgeBudget, HedgePolicy
+from src.providers.ai.managed_chat_model import ManagedChatModel
+from src.providers.ai.model_stats import get_model_stats, reset_model_stats
+from src.providers.ai.rate_limiter import AdaptiveRateLimiter
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FlakyChatModel(GenericFakeChatModel):
+    """Fake model that answers 429 a given number of times before replying."""
+
+    failures: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures > 0:
+            object.__setattr__(self, "failures", self.failures - 1)
+            raise RateLimitError("Too Many Requests")
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "AI_RATE_LIMIT_BASE_BACKOFF", 0.01)
+    monkeypatch.setattr(settings, "AI_RATE_LIMIT_MAX_BACKOFF", 0.05)
+
+
+class TestAdaptiveRateLimiter:
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        limiter = AdaptiveRateLimiter("test-cap", max_concurrency=2)
+        active = peak = 0
+
+        async def call():
+            nonlocal active, peak
+            await limiter.acquire()
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            limiter.release()
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_rate_limit_shrinks_and_success_grows_back(self):
+        limiter = AdaptiveRateLimiter("test-aimd", max_concurrency=8)
+
+        limiter.on_rate_limited()
+        assert limiter.effective_concurrency == 4
+
+        for _ in range(64):
+            limiter.on_success()
+        assert limiter.effective_concurrency == 8
+
+    def test_limit_never_drops_below_minimum(self):
+        limiter = AdaptiveRateLimiter("test-floor", max_concurrency=4)
+
+        for _ in range(10):
+            limiter.on_rate_limited()
+
+        assert limiter.effective_concurrency == 1
+
+    @pytest.mark.asyncio
+    async def test_token_budget_delays_calls(self):
+        # 600 tokens per minute refills 10 tokens per second
+        limiter = AdaptiveRateLimiter(
+            "test-tpm", max_concurrency=4, tokens_per_minute=600
+        )
+        await limiter.acquire(600)
+        limiter.release(600, 600)
+
+        waited = await limiter.acquire(1)
+        limiter.release()
+
+        assert waited >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AdaptiveRateLimiter("test-cancel", max_concurrency=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+class TestManagedChatModel:
+    def _model(self, failures=0, max_retries=2):
+        inner = FlakyChatModel(
+            messages=iter([AIMessage(content="hello")]), failures=failures
+        )
+        return ManagedChatModel(
+            inner=inner,
+            model_name="fake",
+            provider="fake",
+            limiter=AdaptiveRateLimiter("test-managed", max_concurrency=4),
+            max_retries=max_retries,
+        )
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self):
+        model = self._model(failures=1)
+
+        result = await model.ainvoke([HumanMessage(content="hi")])
+
+        assert result.content == "hello"
+        assert model.limiter.effective_concurrency == 2
+        assert model.limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        model = self._model(failures=3, max_retries=1)
+
+        with pytest.raises(RateLimitError):
+            await model.ainvoke([HumanMessage(content="hi")])
+        assert model.limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_time_queued_in_limiter_does_not_trigger_hedge(self):
+        reset_model_stats()
+        for _ in range(20):
+            get_model_stats("hedged-fake").record(0.05)
+        limiter = AdaptiveRateLimiter("test-hedged", max_concurrency=1)
+        model = ManagedChatModel(
+            inner=FlakyChatModel(messages=iter([AIMessage(content="hello")])),
+            model_name="hedged-fake",
+            provider="fake",
+            limiter=limiter,
+            hedge=HedgePolicy(HedgeBudget(1.0), min_samples=10, min_delay=0.0),
+        )
+        fired = ai_hedges_fired_total.labels(model="hedged-fake")
+        fired_before = fired._value.get()
+
+        await limiter.acquire()
+        call = asyncio.create_task(model.ainvoke([HumanMessage(content="hi")]))
+        await asyncio.sleep(0.2)
+        limiter.release()
+        result = await asyncio.wait_for(call, timeout=1)
+
+        assert result.content == "hello"
+        assert fired._value.get() == fired_before
+        assert limiter.in_flight == 0
+        reset_model_stats()
+
+    def test_bind_tools_keeps_wrapper(self):
+        from langchain_core.tools import tool
+
+        @tool
+        def lookup(query: str) -> str:
+            """Look something up."""
+            return query
+
+        from langchain_openai import ChatOpenAI
+
+        model = ManagedChatModel(
+            inner=ChatOpenAI(model="gpt-4o-mini", api_key="sk-test"),
+            model_name="gpt-4o-mini",
+            provider="openai",
+        )
+        bound = model.bind_tools([lookup])
+
+        assert bound.bound is model
+        assert bound.kwargs["tools"][0]["function"]["name"] == "lookup"
+
+
+pytestmark = pytest.mark.unit
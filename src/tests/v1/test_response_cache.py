@@ -0,0 +1,118 @@
+"""
+Tests for the tiered response cache and its use by the agent endpoint.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.api.endpoints.v1.dependencies import get_response_cache, get_sample_agent
+from src.api.main import app
+from src.providers.cache.memory_cache import LRUCache
+from src.providers.cache.tiered_cache import TieredCache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+class _UnavailableRedis:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ex=None):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+
+class _CountingAgent:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, state, config=None):
+        self.calls += 1
+        return {"messages": [AIMessage(content=f"answer {self.calls}")]}
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expired_entries_are_dropped(self):
+        cache = LRUCache(max_size=2, ttl=-1)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_redis_hit_populates_l1(self):
+        redis = _FakeRedis()
+        await TieredCache(name="test", redis=redis).set("k", {"v": 1})
+
+        cache = TieredCache(name="test", redis=redis)
+        assert await cache.get("k") == {"v": 1}
+        assert cache.l1.get("k") == {"v": 1}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_redis_degrades_to_l1(self):
+        redis = _UnavailableRedis()
+        cache = TieredCache(name="test", redis=redis)
+
+        assert await cache.get("k") is None
+        await cache.set("k", "value")
+
+        assert await cache.get("k") == "value"
+        assert redis.calls == 1
+
+
+class TestAgentResponseCache:
+    @pytest.fixture
+    def agent(self):
+        agent = _CountingAgent()
+        app.dependency_overrides[get_sample_agent] = lambda: agent
+        cache = TieredCache(name="agent_response_test")
+        app.dependency_overrides[get_response_cache] = lambda: cache
+        return agent
+
+    def test_identical_queries_hit_cache(self, client, agent):
+        first = client.post("/api/v1/agent/execute", json={"query": "Hi  there"})
+        second = client.post("/api/v1/agent/execute", json={"query": " Hi there "})
+
+        assert first.json()["data"]["response"] == "answer 1"
+        assert second.json()["data"]["response"] == "answer 1"
+        assert agent.calls == 1
+
+    def test_cache_control_header_bypasses_cache(self, client, agent):
+        client.post("/api/v1/agent/execute", json={"query": "Hi"})
+        response = client.post(
+            "/api/v1/agent/execute",
+            json={"query": "Hi"},
+            headers={"Cache-Control": "no-cache"},
+        )
+
+        assert response.json()["data"]["response"] == "answer 2"
+        assert agent.calls == 2
+
+
+pytestmark = pytest.mark.unit
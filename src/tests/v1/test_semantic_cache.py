@@ -0,0 +1,302 @@
+"""
+Tests for the semantic response cache.
+"""
+
+import numpy as np
+import pytest
+
+from src.api.endpoints.v1 import dependencies
+from src.config.settings import settings
+from src.execution.actions.sample_action import SampleAction
+from src.observability.metrics import (
+    cache_hits_total,
+    cache_misses_total,
+    semantic_cache_evictions_total,
+)
+from src.providers.cache.semantic_cache import (
+    HashingEmbedder,
+    SemanticCache,
+    build_embedder,
+)
+from src.providers.http.http_client import get_async_http_client
+
+
+# Differ in one word that changes the answer
+NEAR_MISSES = [
+    (
+        "Write a Python function that sorts a list of customer records by "
+        "signup date in ascending order",
+        "Write a Python function that sorts a list of customer records by "
+        "signup date in descending order",
+    ),
+    (
+        "Draft the indemnification clauses of the purchase agreement so that "
+        "they protect the buyer",
+        "Draft the indemnification clauses of the purchase agreement so that "
+        "they protect the seller",
+    ),
+]
+
+
+def _cache(name: str, **kwargs) -> SemanticCache:
+    return SemanticCache(name=name, embedder=HashingEmbedder(64), **kwargs)
+
+
+def _cosine(a, b):
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+class _UnavailableEmbedder:
+    dimensions = 64
+
+    async def embed(self, text):
+        raise ConnectionError("embeddings API down")
+
+
+class _CountingAgent:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, payload, **kwargs):
+        self.calls += 1
+
+        class _Message:
+            content = f"answer {self.calls}"
+
+        return {"messages": [_Message()]}
+
+
+class TestHashingEmbedder:
+    @pytest.mark.asyncio
+    async def test_is_deterministic(self):
+        embedder = HashingEmbedder(64)
+
+        first = await embedder.embed("What time is it in Paris?")
+        second = await embedder.embed("What time is it in Paris?")
+
+        assert first.shape == (64,)
+        assert np.array_equal(first, second)
+
+    @pytest.mark.asyncio
+    async def test_rewording_scores_higher_than_other_topics(self):
+        embedder = HashingEmbedder(256)
+
+        base = await embedder.embed("What time is it in Paris?")
+        reworded = await embedder.embed("what time is it in paris")
+        other = await embedder.embed("Summarize the quarterly sales report")
+
+        assert _cosine(base, reworded) > 0.99
+        assert _cosine(base, other) < 0.5
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query, near_miss", NEAR_MISSES)
+    async def test_cannot_tell_near_misses_apart(self, query, near_miss):
+        # Why the hashing embedder is kept out of production
+        embedder = HashingEmbedder(settings.SEMANTIC_CACHE_DIMENSIONS)
+
+        similarity = _cosine(
+            await embedder.embed(query), await embedder.embed(near_miss)
+        )
+
+        assert similarity >= settings.SEMANTIC_CACHE_THRESHOLD
+
+
+class TestSemanticCache:
+    @pytest.mark.asyncio
+    async def test_similar_query_hits_and_records_metrics(self):
+        cache = _cache("test_semantic_hit")
+        await cache.set("What time is it in Paris?", "10:04")
+
+        assert await cache.get("what time is it in paris") == "10:04"
+        assert await cache.get("Tell me a joke about databases") is None
+        assert cache_hits_total.labels(cache_name="test_semantic_hit")._value.get() == 1
+        assert (
+            cache_misses_total.labels(cache_name="test_semantic_hit")._value.get() == 1
+        )
+        assert cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_isolated(self):
+        cache = _cache("test_semantic_scope")
+        await cache.set("What time is it?", "basic answer", scope="basic")
+
+        assert await cache.get("What time is it?", scope="reasoning") is None
+        assert await cache.get("What time is it?", scope="basic") == "basic answer"
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_replaces_entry(self):
+        cache = _cache("test_semantic_replace")
+        await cache.set("What time is it?", "old")
+        await cache.set("what time is it", "new")
+
+        assert len(cache) == 1
+        assert await cache.get("What time is it?") == "new"
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self):
+        cache = _cache("test_semantic_lru", max_size=2, eviction="lru")
+        await cache.set("alpha query about cats", "a")
+        await cache.set("bravo query about trains", "b")
+        await cache.get("alpha query about cats")
+
+        await cache.set("charlie query about rivers", "c")
+
+        assert await cache.get("alpha query about cats") == "a"
+        assert await cache.get("bravo query about trains") is None
+        assert (
+            semantic_cache_evictions_total.labels(
+                cache_name="test_semantic_lru"
+            )._value.get()
+            == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_lfu_evicts_least_frequently_used(self):
+        cache = _cache("test_semantic_lfu", max_size=2, eviction="lfu")
+        await cache.set("alpha query about cats", "a")
+        await cache.set("bravo query about trains", "b")
+        await cache.get("alpha query about cats")
+        await cache.get("alpha query about cats")
+        await cache.get("bravo query about trains")
+
+        await cache.set("charlie query about rivers", "c")
+
+        assert await cache.get("alpha query about cats") == "a"
+        assert await cache.get("bravo query about trains") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_served(self, monkeypatch):
+        cache = _cache("test_semantic_ttl", ttl=60)
+        await cache.set("What time is it?", "10:04")
+
+        real_time = __import__("time").time
+        monkeypatch.setattr(
+            "src.providers.cache.semantic_cache.time.time", lambda: real_time() + 61
+        )
+
+        assert await cache.get("What time is it?") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_persists_across_restarts(self, tmp_path):
+        path = tmp_path / "semantic.npy"
+        cache = _cache("test_semantic_persist", path=str(path))
+        await cache.set("What time is it in Paris?", "10:04", scope="basic")
+        cache.close()
+
+        reopened = _cache("test_semantic_persist", path=str(path))
+
+        assert len(reopened) == 1
+        assert await reopened.get("what time is it in paris", scope="basic") == "10:04"
+
+    @pytest.mark.asyncio
+    async def test_incompatible_file_starts_empty(self, tmp_path):
+        path = tmp_path / "semantic.npy"
+        cache = _cache("test_semantic_shape", path=str(path))
+        await cache.set("What time is it?", "10:04")
+        cache.close()
+
+        resized = _cache("test_semantic_shape", path=str(path), max_size=8)
+
+        assert len(resized) == 0
+        assert await resized.get("What time is it?") is None
+
+
+class TestBuildEmbedder:
+    def test_openai_embeddings_use_the_shared_llm_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, "SEMANTIC_CACHE_EMBEDDER", "openai")
+        monkeypatch.setattr(settings, "HTTP_SHARED_POOL_ENABLED", True)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        embedder = build_embedder()
+
+        assert embedder.embeddings.http_async_client is get_async_http_client("llm")
+
+
+class TestSemanticCacheSettings:
+    @pytest.fixture
+    def hashing(self, monkeypatch):
+        monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "SEMANTIC_CACHE_EMBEDDER", "hashing")
+
+    def test_hashing_embedder_is_not_used_in_production(self, hashing, monkeypatch):
+        monkeypatch.setattr(settings, "DEBUG", False)
+
+        assert not settings.semantic_cache_enabled
+        assert dependencies.get_semantic_cache() is None
+
+    def test_hashing_embedder_is_allowed_in_debug(self, hashing, monkeypatch):
+        monkeypatch.setattr(settings, "DEBUG", True)
+
+        assert settings.semantic_cache_enabled
+
+    def test_openai_embedder_is_used_in_production(self, monkeypatch):
+        monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "SEMANTIC_CACHE_EMBEDDER", "openai")
+        monkeypatch.setattr(settings, "DEBUG", False)
+
+        assert settings.semantic_cache_enabled
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query, near_miss", NEAR_MISSES)
+    async def test_near_miss_is_not_answered_from_cache_in_production(
+        self, hashing, monkeypatch, query, near_miss
+    ):
+        monkeypatch.setattr(settings, "DEBUG", False)
+        agent = _CountingAgent()
+        action = SampleAction(
+            agent=agent, semantic_cache=dependencies.get_semantic_cache()
+        )
+
+        first = await action.execute(query)
+        second = await action.execute(near_miss)
+
+        assert (first, second) == ("answer 1", "answer 2")
+        assert agent.calls == 2
+
+
+class TestSampleActionSemanticCache:
+    @pytest.mark.asyncio
+    async def test_paraphrase_is_answered_without_running_the_agent(self):
+        agent = _CountingAgent()
+        action = SampleAction(
+            agent=agent, semantic_cache=_cache("test_semantic_action")
+        )
+
+        first = await action.execute("What time is it in Paris?")
+        second = await action.execute("what time is it in Paris")
+
+        assert first == second == "answer 1"
+        assert agent.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_embedder_outage_falls_back_to_the_agent(self):
+        agent = _CountingAgent()
+        cache = SemanticCache(
+            name="test_semantic_outage", embedder=_UnavailableEmbedder()
+        )
+        action = SampleAction(agent=agent, semantic_cache=cache)
+        misses = cache_misses_total.labels(cache_name="test_semantic_outage")
+
+        first = await action.execute("What time is it in Paris?")
+        second = await action.execute("What time is it in Paris?")
+
+        assert (first, second) == ("answer 1", "answer 2")
+        assert misses._value.get() == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_bypass_cache_runs_the_agent(self):
+        agent = _CountingAgent()
+        action = SampleAction(
+            agent=agent, semantic_cache=_cache("test_semantic_bypass")
+        )
+
+        await action.execute("What time is it in Paris?")
+        response = await action.execute("What time is it in Paris?", bypass_cache=True)
+
+        assert response == "answer 2"
+        assert agent.calls == 2
+
+
+pytestmark = pytest.mark.unit
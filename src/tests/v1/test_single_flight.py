@@ -0,0 +1,137 @@
+"""
+Tests for single-flight coalescing of concurrent identical calls.
+"""
+
+import asyncio
+
+import pytest
+
+from src.observability.metrics import singleflight_coalesced_total
+from src.utils.single_flight import SingleFlight
+
+
+def _coalesced(name: str) -> float:
+    return singleflight_coalesced_total.labels(name=name)._value.get()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight("test_share")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert _coalesced("test_share") == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_all_waiters(self):
+        flight = SingleFlight("test_failure")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_run_independently(self):
+        flight = SingleFlight("test_keys")
+
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))
+        )
+
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight("test_cancel_one")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_all_waiters_leave(self):
+        flight = SingleFlight("test_cancel_all")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        caller.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_caller_after_cancel_starts_fresh(self):
+        flight = SingleFlight("test_cancel_rejoin")
+        started = asyncio.Event()
+        unwinding = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                return "fresh"
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                # Slow cleanup keeps the cancelled task alive for a while
+                unwinding.set()
+                await asyncio.sleep(0.05)
+                raise
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        caller.cancel()
+        await unwinding.wait()
+
+        assert await flight.do("k", work) == "fresh"
+        assert calls == 2
+
+
+pytestmark = pytest.mark.unit
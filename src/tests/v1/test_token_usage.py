@@ -0,0 +1,152 @@
+"""
+Tests for token usage accounting from LangChain callbacks.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import create_react_agent
+
+from src.api.endpoints.v1.dependencies import (
+    get_model_router,
+    get_response_cache,
+    get_sample_agent,
+)
+from src.api.main import app
+from src.observability.metrics import ai_requests_total, ai_tokens_total
+from src.providers.ai.usage_tracker import UsageTracker, track_usage
+from src.providers.cache.tiered_cache import TieredCache
+from src.utils.single_flight import SingleFlight
+
+
+class UsageChatModel(GenericFakeChatModel):
+    """Fake model reporting usage like OpenAI does, prompt cache included."""
+
+    model_name: str = "fake-usage-model"
+    # The generic fake drops usage when streaming; answer in one chunk instead
+    disable_streaming: bool = True
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = "fake"
+        return params
+
+
+def _reply(content="ok"):
+    return AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": 120,
+            "output_tokens": 30,
+            "total_tokens": 150,
+            "input_token_details": {"cache_read": 100},
+        },
+    )
+
+
+@pytest.fixture
+def agent():
+    model = UsageChatModel(messages=(_reply() for _ in range(100)))
+    agent = create_react_agent(model, tools=[], prompt="test")
+    app.dependency_overrides[get_sample_agent] = lambda: agent
+    app.dependency_overrides[get_response_cache] = lambda: None
+    app.dependency_overrides[get_model_router] = lambda: None
+    return agent
+
+
+class TestUsageTracker:
+    def test_totals_add_up_per_model(self):
+        tracker = UsageTracker()
+        tracker.add("a", prompt_tokens=10, completion_tokens=5, duration=0.5)
+        tracker.add("a", prompt_tokens=20, completion_tokens=5, cached_prompt_tokens=8)
+        tracker.add("b", prompt_tokens=1, completion_tokens=1, duration=0.25)
+
+        usage = tracker.summary()
+
+        assert usage.total_tokens == 42
+        assert usage.cached_prompt_tokens == 8
+        assert usage.llm_calls == 3
+        assert usage.llm_duration_seconds == 0.75
+        assert usage.by_model["a"].prompt_tokens == 30
+        assert usage.by_model["b"].llm_calls == 1
+
+
+class TestUsageInResponses:
+    def test_execute_reports_usage(self, client, agent):
+        tokens = ai_tokens_total.labels(model="fake-usage-model", type="cached_prompt")
+        requests = ai_requests_total.labels(model="fake-usage-model", provider="fake")
+        tokens_before, requests_before = tokens._value.get(), requests._value.get()
+
+        response = client.post("/api/v1/agent/execute", json={"query": "hi"})
+
+        usage = response.json()["usage"]
+        assert usage["prompt_tokens"] == 120
+        assert usage["completion_tokens"] == 30
+        assert usage["cached_prompt_tokens"] == 100
+        assert usage["llm_calls"] == 1
+        assert usage["llm_duration_seconds"] > 0
+        assert list(usage["by_model"]) == ["fake-usage-model"]
+        assert tokens._value.get() == tokens_before + 100
+        assert requests._value.get() == requests_before + 1
+
+    def test_batch_usage_sums_all_queries(self, client, agent):
+        response = client.post(
+            "/api/v1/agent/execute:batch", json={"queries": ["a", "b", "c"]}
+        )
+
+        usage = response.json()["usage"]
+        assert usage["llm_calls"] == 3
+        assert usage["total_tokens"] == 450
+
+    def test_stream_done_event_carries_usage(self, client, agent):
+        response = client.post("/api/v1/agent/execute/stream", json={"query": "hi"})
+
+        done = response.text.strip().split("\n\n")[-1]
+        assert done.startswith("event: done")
+        assert '"cached_prompt_tokens": 100' in done
+
+    @pytest.mark.asyncio
+    async def test_usage_outside_a_request_is_not_tracked(self, agent):
+        from src.execution.actions.sample_action import SampleAction
+
+        with track_usage() as tracker:
+            pass
+        await SampleAction(agent=agent).execute("hi")
+
+        assert tracker.summary().llm_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_run_usage_reaches_every_caller(self, agent):
+        from src.execution.actions.sample_action import SampleAction
+
+        action = SampleAction(agent=agent, single_flight=SingleFlight("test_usage"))
+
+        async def call():
+            with track_usage() as tracker:
+                await action.execute("same question")
+            return tracker.summary()
+
+        leader, follower = await asyncio.gather(call(), call())
+
+        assert leader.llm_calls == follower.llm_calls == 1
+        assert follower.total_tokens == leader.total_tokens == 150
+        assert (leader.shared_runs, follower.shared_runs) == (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_is_counted_without_tokens(self, agent):
+        from src.execution.actions.sample_action import SampleAction
+
+        action = SampleAction(agent=agent, cache=TieredCache(name="usage_test"))
+        await action.execute("hi")
+
+        with track_usage() as tracker:
+            await action.execute("hi")
+
+        usage = tracker.summary()
+        assert usage.cached_responses == 1
+        assert usage.llm_calls == 0
+
+
+pytestmark = pytest.mark.unit
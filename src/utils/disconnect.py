@@ -0,0 +1,49 @@
+"""
+Cancel request work when the client disconnects.
+
+Once a request body has been read, the only message an ASGI server still
+sends is `http.disconnect`, so waiting on `receive` detects a client that
+gave up without polling. The work runs as a task; if the client disconnects
+first the task is cancelled, which cancels any model and tool calls it is
+awaiting, and ClientDisconnectedException is raised.
+
+Usage:
+    result = await cancel_on_disconnect(
+        request.receive, usecase.execute(query=query)
+    )
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from src.core.exceptions import ClientDisconnectedException
+
+T = TypeVar("T")
+
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+async def wait_for_disconnect(receive: Receive) -> None:
+    """Return once the ASGI server reports that the client disconnected."""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(receive: Receive, work: Awaitable[T]) -> T:
+    """Await work, cancelling it if the client disconnects first."""
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(wait_for_disconnect(receive))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            # The client disconnected, or the caller itself was cancelled
+            task.cancel()
+        await asyncio.gather(task, watcher, return_exceptions=True)
+
+    if task.cancelled():
+        raise ClientDisconnectedException()
+    return task.result()
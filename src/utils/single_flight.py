@@ -0,0 +1,67 @@
+"""
+Single-flight coalescing of concurrent identical async calls.
+
+The first caller for a key starts the work; concurrent callers with the same
+key await the same result (or exception) instead of repeating it. The entry
+is dropped as soon as the call completes, so later callers start fresh.
+
+Usage:
+    flight = SingleFlight("agent_execute")
+
+    result = await flight.do(key, lambda: agent.ainvoke(payload))
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from src.observability.metrics import singleflight_coalesced_total
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once per key among concurrent callers and share its outcome.
+
+        A caller that is cancelled stops waiting without affecting the others;
+        the shared work is cancelled only once every waiter has gone away.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            singleflight_coalesced_total.labels(name=self.name).inc()
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget it now: a caller arriving while the task unwinds
+                # must start fresh, not join a call being cancelled
+                self._forget(key, call)
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being executed."""
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]